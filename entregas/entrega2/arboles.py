@@ -24,7 +24,7 @@ Los lugares se organizan en un árbol donde:
 - A la derecha los más lejanos
 """
 
-from typing import Optional, List, Tuple
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
 
 
 # Clase Nodo: representa cada lugar en el árbol
@@ -38,8 +38,14 @@ class Nodo:
     - tiempo: cuánto tarda llegar (ejemplo: "10 min caminando")
     - tipo: qué tipo de lugar es (ejemplo: "Hotel")
     - izq, der: conexión a otros lugares (más cercanos a la izquierda, más lejanos a la derecha)
+    - altura: altura del subárbol (solo se usa en el árbol balanceado)
+
+    Usa `__slots__` (sin `__dict__` por nodo) para ocupar menos memoria con
+    millones de lugares.
     """
 
+    __slots__ = ("nombre", "distancia", "tiempo", "tipo", "izq", "der", "altura")
+
     def __init__(self, nombre: str, distancia: float, tiempo: str, tipo: str):
         self.nombre: str = nombre
         self.distancia: float = distancia
@@ -47,6 +53,7 @@ class Nodo:
         self.tipo: str = tipo
         self.izq: Optional["Nodo"] = None
         self.der: Optional["Nodo"] = None
+        self.altura: int = 1
 
     def __repr__(self) -> str:
         # Representación útil para debugging
@@ -64,10 +71,62 @@ class ArbolLugares:
     - Encontrar rápido el lugar más cercano
     - Ver todos los lugares ordenados del más cercano al más lejano
     - Buscar un lugar por su nombre
+
+    Con `balanceado=True` el árbol se mantiene balanceado (árbol AVL): después
+    de cada inserción se aplican rotaciones para que la altura sea siempre
+    O(log n), aunque los lugares lleguen ya ordenados por distancia. El
+    orden de `inorden` es el mismo que sin balancear.
+
+    Como el árbol está ordenado por distancia y no por nombre, se guarda
+    además un índice nombre (en minúsculas) -> lugares para que `buscar`
+    no tenga que recorrer todo el árbol.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, balanceado: bool = False) -> None:
         self.raiz: Optional[Nodo] = None
+        self.balanceado: bool = balanceado
+        self._por_nombre: Dict[str, List[Nodo]] = {}
+
+    @classmethod
+    def desde_ordenados(cls, lugares: Iterable[Tuple[str, float, str, str]],
+                        balanceado: bool = True) -> "ArbolLugares":
+        """Arma un árbol perfectamente balanceado a partir de lugares ya ordenados.
+
+        `lugares` son tuplas (nombre, distancia, tiempo, tipo) ordenadas de
+        menor a mayor distancia. Se toma el lugar del medio como raíz y se
+        repite con cada mitad, en O(n) en lugar de O(n log n) insertando uno
+        a uno. El orden de `inorden` es el mismo de la entrada.
+
+        Con `balanceado=True` (por defecto) las inserciones posteriores
+        también mantienen el árbol balanceado.
+        """
+
+        arbol = cls(balanceado=balanceado)
+        nodos: List[Nodo] = []
+        for nombre, distancia, tiempo, tipo in lugares:
+            try:
+                distancia_val = float(distancia)
+            except (TypeError, ValueError):
+                raise ValueError("distancia debe ser un número (float o int)")
+            if nodos and distancia_val < nodos[-1].distancia:
+                raise ValueError("los lugares deben estar ordenados por distancia")
+            nodo = Nodo(nombre, distancia_val, tiempo, tipo)
+            nodos.append(nodo)
+            arbol._indexar(nodo)
+
+        def construir(inicio: int, fin: int) -> Optional[Nodo]:
+            # La profundidad de la recursión es solo log2(n)
+            if inicio >= fin:
+                return None
+            medio = (inicio + fin) // 2
+            nodo = nodos[medio]
+            nodo.izq = construir(inicio, medio)
+            nodo.der = construir(medio + 1, fin)
+            arbol._actualizar_altura(nodo)
+            return nodo
+
+        arbol.raiz = construir(0, len(nodos))
+        return arbol
 
     def insertar(self, nombre: str, distancia: float, tiempo: str, tipo: str) -> None:
         """Inserta un nuevo lugar en el árbol.
@@ -90,28 +149,138 @@ class ArbolLugares:
             raise ValueError("distancia debe ser un número (float o int)")
 
         nuevo = Nodo(nombre, distancia_val, tiempo, tipo)
+        self._insertar(nuevo)
+        self._indexar(nuevo)
+
+    def _indexar(self, nodo: Nodo) -> None:
+        """Agrega el lugar al índice por nombre."""
+        self._por_nombre.setdefault(nodo.nombre.lower(), []).append(nodo)
+
+    def _insertar(self, nuevo: Nodo) -> None:
+        """Inserta `nuevo` bajando desde la raíz sin recursión.
+
+        Si la distancia de `nuevo` es menor que la del nodo actual se va a
+        la rama izquierda, en caso contrario se va a la derecha. En el árbol
+        balanceado luego se recorre el camino de vuelta rebalanceando.
+        """
+
         if not self.raiz:
             self.raiz = nuevo
-        else:
-            self._insertar(self.raiz, nuevo)
+            return
+
+        camino: List[Nodo] = []
+        actual: Optional[Nodo] = self.raiz
+        while actual:
+            camino.append(actual)
+            actual = actual.izq if nuevo.distancia < actual.distancia else actual.der
 
-    def _insertar(self, actual: Nodo, nuevo: Nodo) -> None:
-        """Inserta recursivamente `nuevo` a partir del nodo `actual`.
+        padre = camino[-1]
+        if nuevo.distancia < padre.distancia:
+            padre.izq = nuevo
+        else:
+            padre.der = nuevo
+
+        if self.balanceado:
+            self._rebalancear_camino(camino)
+
+    # Balanceo AVL
+
+    @staticmethod
+    def _altura(nodo: Optional[Nodo]) -> int:
+        return nodo.altura if nodo else 0
+
+    def _actualizar_altura(self, nodo: Nodo) -> None:
+        nodo.altura = 1 + max(self._altura(nodo.izq), self._altura(nodo.der))
+
+    def _rotar_derecha(self, nodo: Nodo) -> Nodo:
+        """Sube el hijo izquierdo de `nodo` y retorna la nueva raíz del subárbol."""
+        nueva = nodo.izq
+        nodo.izq = nueva.der
+        nueva.der = nodo
+        self._actualizar_altura(nodo)
+        self._actualizar_altura(nueva)
+        return nueva
+
+    def _rotar_izquierda(self, nodo: Nodo) -> Nodo:
+        """Sube el hijo derecho de `nodo` y retorna la nueva raíz del subárbol."""
+        nueva = nodo.der
+        nodo.der = nueva.izq
+        nueva.izq = nodo
+        self._actualizar_altura(nodo)
+        self._actualizar_altura(nueva)
+        return nueva
+
+    def _balancear(self, nodo: Nodo) -> Nodo:
+        """Corrige `nodo` si sus subárboles difieren en más de 1 de altura."""
+        self._actualizar_altura(nodo)
+        factor = self._altura(nodo.izq) - self._altura(nodo.der)
+        if factor > 1:
+            if self._altura(nodo.izq.izq) < self._altura(nodo.izq.der):
+                nodo.izq = self._rotar_izquierda(nodo.izq)
+            return self._rotar_derecha(nodo)
+        if factor < -1:
+            if self._altura(nodo.der.der) < self._altura(nodo.der.izq):
+                nodo.der = self._rotar_derecha(nodo.der)
+            return self._rotar_izquierda(nodo)
+        return nodo
+
+    def _rebalancear_camino(self, camino: List[Nodo]) -> None:
+        """Recorre el camino de inserción de abajo hacia arriba rebalanceando.
+
+        Se detiene apenas una altura no cambia, porque de ahí hacia arriba
+        el árbol ya está balanceado.
+        """
 
-        Si la distancia de `nuevo` es menor que la de `actual` se va a
-        la rama izquierda, en caso contrario se va a la derecha.
+        for i in range(len(camino) - 1, -1, -1):
+            nodo = camino[i]
+            altura_antes = nodo.altura
+            nueva = self._balancear(nodo)
+            if nueva is not nodo:
+                if i == 0:
+                    self.raiz = nueva
+                elif camino[i - 1].izq is nodo:
+                    camino[i - 1].izq = nueva
+                else:
+                    camino[i - 1].der = nueva
+            if nueva.altura == altura_antes:
+                break
+
+    def _iter_inorden(self) -> Iterator[Nodo]:
+        """Recorre los nodos de menor a mayor distancia sin recursión."""
+
+        pila: List[Nodo] = []
+        actual = self.raiz
+        while pila or actual:
+            while actual:
+                pila.append(actual)
+                actual = actual.izq
+            actual = pila.pop()
+            yield actual
+            actual = actual.der
+
+    def _camino(self, nodo: Nodo) -> Tuple[int, ...]:
+        """Camino desde la raíz hasta `nodo` (0 = izquierda, 1 = derecha).
+
+        Baja por distancia: a la izquierda solo hay distancias menores o
+        iguales y a la derecha mayores o iguales, así que solo con empates
+        hay que mirar las dos ramas. Ordenar por este camino es ordenar en
+        preorden (un ancestro va antes que sus descendientes).
         """
 
-        if nuevo.distancia < actual.distancia:
-            if actual.izq:
-                self._insertar(actual.izq, nuevo)
-            else:
-                actual.izq = nuevo
-        else:
-            if actual.der:
-                self._insertar(actual.der, nuevo)
-            else:
-                actual.der = nuevo
+        pila: List[Tuple[Nodo, Optional[tuple]]] = [(self.raiz, None)] if self.raiz else []
+        while pila:
+            actual, enlace = pila.pop()
+            if actual is nodo:
+                pasos: List[int] = []
+                while enlace:
+                    paso, enlace = enlace
+                    pasos.append(paso)
+                return tuple(reversed(pasos))
+            if actual.der and nodo.distancia >= actual.distancia:
+                pila.append((actual.der, (1, enlace)))
+            if actual.izq and nodo.distancia <= actual.distancia:
+                pila.append((actual.izq, (0, enlace)))
+        raise ValueError(f"{nodo!r} no está en el árbol")
 
     def inorden(self) -> List[Tuple[str, float, str, str]]:
         """Muestra todos los lugares ordenados por distancia.
@@ -122,44 +291,90 @@ class ArbolLugares:
 
         resultados: List[Tuple[str, float, str, str]] = []
 
-        def recorrer(nodo: Optional[Nodo]) -> None:
-            if nodo:
-                recorrer(nodo.izq)
-                # Imprimimos para mantener el comportamiento original
-                print(f"{nodo.tipo}: {nodo.nombre} – {nodo.distancia} km ({nodo.tiempo})")
-                resultados.append((nodo.tipo, nodo.nombre, nodo.distancia, nodo.tiempo))
-                recorrer(nodo.der)
-
         if not self.raiz:
             print("No hay lugares registrados.")
         else:
-            recorrer(self.raiz)
+            for nodo in self._iter_inorden():
+                # Imprimimos para mantener el comportamiento original
+                print(f"{nodo.tipo}: {nodo.nombre} – {nodo.distancia} km ({nodo.tiempo})")
+                resultados.append((nodo.tipo, nodo.nombre, nodo.distancia, nodo.tiempo))
 
         return resultados
 
-    def buscar(self, nombre: str) -> Optional[Nodo]:
+    def rango(self, min_km: float, max_km: float) -> List[Nodo]:
+        """Lista los lugares con distancia entre `min_km` y `max_km` (incluidos).
+
+        Solo visita las ramas que pueden tener lugares dentro del rango, así
+        que cuesta O(log n + k) en el árbol balanceado (k = resultados).
+        No imprime nada; los lugares salen del más cercano al más lejano.
+        """
+
+        return list(self.rango_iter(min_km, max_km))
+
+    def rango_iter(self, min_km: float, max_km: float) -> Iterator[Nodo]:
+        """Versión perezosa de `rango`: entrega los lugares de a uno."""
+
+        pila: List[Nodo] = []
+        actual = self.raiz
+        while pila or actual:
+            while actual:
+                if actual.distancia < min_km:
+                    # Todo el subárbol izquierdo está aún más cerca: se salta
+                    actual = actual.der
+                else:
+                    pila.append(actual)
+                    actual = actual.izq
+            if not pila:
+                return
+            actual = pila.pop()
+            if actual.distancia > max_km:
+                return  # De aquí en adelante todos están más lejos
+            yield actual
+            actual = actual.der
+
+    def k_mas_cercanos(self, k: int) -> List[Nodo]:
+        """Lista los `k` lugares más cercanos, del más cercano al más lejano.
+
+        Cuesta O(log n + k) en el árbol balanceado y no imprime nada.
+        """
+
+        return list(self.k_mas_cercanos_iter(k))
+
+    def k_mas_cercanos_iter(self, k: int) -> Iterator[Nodo]:
+        """Versión perezosa de `k_mas_cercanos`: entrega los lugares de a uno."""
+
+        if k <= 0:
+            return
+        for i, nodo in enumerate(self._iter_inorden(), 1):
+            yield nodo
+            if i == k:
+                return
+
+    def buscar(self, nombre: str, imprimir: bool = True) -> Optional[Nodo]:
         """Busca un lugar por su nombre.
         
         Escribe el nombre del lugar y te dice:
         - Si lo encontró o no
         - Si existe, muestra su distancia y tiempo
+
+        La búsqueda usa el índice por nombre (no distingue mayúsculas), así
+        que no recorre el árbol. Si hay varios lugares con el mismo nombre
+        retorna, como antes, el primero en preorden (raíz, izquierda,
+        derecha): se comparan los caminos desde la raíz de cada uno, que
+        cuestan O(altura) (más los lugares a la misma distancia).
+        Con `imprimir=False` no muestra ningún mensaje.
         """
 
-        def _buscar(nodo: Optional[Nodo]) -> Optional[Nodo]:
-            if not nodo:
-                return None
-            if nodo.nombre.lower() == nombre.lower():
-                return nodo
-            izq = _buscar(nodo.izq)
-            if izq:
-                return izq
-            return _buscar(nodo.der)
-
-        resultado = _buscar(self.raiz)
-        if resultado:
-            print(f"Encontrado: {resultado.nombre} – {resultado.distancia} km ({resultado.tiempo})")
+        coincidencias = self._por_nombre.get(nombre.lower(), [])
+        if len(coincidencias) > 1:
+            resultado = min(coincidencias, key=self._camino)
         else:
-            print("No encontrado.")
+            resultado = coincidencias[0] if coincidencias else None
+        if imprimir:
+            if resultado:
+                print(f"Encontrado: {resultado.nombre} – {resultado.distancia} km ({resultado.tiempo})")
+            else:
+                print("No encontrado.")
 
         return resultado
 
@@ -203,3 +418,11 @@ if __name__ == "__main__":
 
     print("\nBuscando lugar más cercano...")
     arbol.buscar_mas_cercano()
+
+    print("\nLugares entre 1.0 y 2.0 km...")
+    for lugar in arbol.rango(1.0, 2.0):
+        print(f"{lugar.tipo}: {lugar.nombre} – {lugar.distancia} km ({lugar.tiempo})")
+
+    print("\nLos 2 lugares más cercanos...")
+    for lugar in arbol.k_mas_cercanos(2):
+        print(f"{lugar.tipo}: {lugar.nombre} – {lugar.distancia} km ({lugar.tiempo})")
@@ -0,0 +1,182 @@
+# Proyecto: SmartRoute Event (Versión 2 - Árboles)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Mediciones de rendimiento del árbol de lugares.
+
+Cada función `bench_*` arma lugares sintéticos, mide una operación y
+muestra los resultados. Se ejecutan desde la línea de comandos:
+
+    python benchmarks.py balanceo --lugares 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from arboles import ArbolLugares  # type: ignore
+
+
+# Funciones auxiliares
+
+def lugares_sinteticos(cantidad: int, ordenados: bool, semilla: int = 0):
+    """Genera tuplas (nombre, distancia, tiempo, tipo) al azar o ya ordenadas."""
+    rnd = random.Random(semilla)
+    lugares = [(f"Lugar {i}", round(rnd.uniform(0, 50), 3), f"{rnd.randint(1, 90)} min",
+                rnd.choice(["Hotel", "Restaurante", "Snack", "Emergencia"]))
+               for i in range(cantidad)]
+    if ordenados:
+        lugares.sort(key=lambda lugar: lugar[1])
+    return lugares
+
+
+def llenar(arbol: ArbolLugares, lugares) -> float:
+    """Inserta todos los lugares y retorna los segundos que tardó."""
+    inicio = time.perf_counter()
+    for lugar in lugares:
+        arbol.insertar(*lugar)
+    return time.perf_counter() - inicio
+
+
+def altura(arbol: ArbolLugares) -> int:
+    """Altura del árbol calculada sin recursión."""
+    maxima = 0
+    pila = [(arbol.raiz, 1)] if arbol.raiz else []
+    while pila:
+        nodo, nivel = pila.pop()
+        maxima = max(maxima, nivel)
+        for hijo in (nodo.izq, nodo.der):
+            if hijo:
+                pila.append((hijo, nivel + 1))
+    return maxima
+
+
+def medir_cercano(arbol: ArbolLugares) -> float:
+    """Segundos que tarda `buscar_mas_cercano` (sin mostrar su mensaje)."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        arbol.buscar_mas_cercano()
+        return time.perf_counter() - inicio
+
+
+# Benchmarks
+
+def bench_balanceo(cantidad: int, cantidad_simple_ordenada: int):
+    """Compara el árbol simple con el balanceado (AVL) en entradas al azar y ordenadas.
+
+    El árbol simple con entrada ordenada es O(n²), por eso se mide con
+    menos lugares (`cantidad_simple_ordenada`).
+    """
+    for ordenados in (False, True):
+        etiqueta = "ordenados" if ordenados else "al azar"
+        lugares = lugares_sinteticos(cantidad, ordenados)
+
+        avl = ArbolLugares(balanceado=True)
+        t_avl = llenar(avl, lugares)
+        print(f"[{etiqueta}] AVL    {cantidad:8d} lugares: {t_avl:7.2f} s, altura {altura(avl)}, "
+              f"buscar_mas_cercano {medir_cercano(avl) * 1e6:.1f} µs")
+
+        n_simple = cantidad_simple_ordenada if ordenados else cantidad
+        simple = ArbolLugares()
+        t_simple = llenar(simple, lugares[:n_simple])
+        print(f"[{etiqueta}] simple {n_simple:8d} lugares: {t_simple:7.2f} s, altura {altura(simple)}, "
+              f"buscar_mas_cercano {medir_cercano(simple) * 1e6:.1f} µs")
+
+        if n_simple == cantidad:
+            iguales = ([n.nombre for n in avl._iter_inorden()] ==
+                       [n.nombre for n in simple._iter_inorden()])
+            print(f"[{etiqueta}] mismo orden inorden: {iguales}")
+
+
+def bench_buscar(cantidad: int, consultas: int):
+    """Compara `buscar` con índice contra recorrer todo el árbol comparando nombres."""
+    arbol = ArbolLugares(balanceado=True)
+    llenar(arbol, lugares_sinteticos(cantidad, ordenados=False))
+    rnd = random.Random(5)
+    nombres = [f"LUGAR {rnd.randrange(cantidad)}" for _ in range(consultas)]
+
+    def recorrido(nombre):
+        for nodo in arbol._iter_inorden():
+            if nodo.nombre.lower() == nombre.lower():
+                return nodo
+        return None
+
+    inicio = time.perf_counter()
+    esperados = [recorrido(n) for n in nombres]
+    t_recorrido = (time.perf_counter() - inicio) / consultas
+    inicio = time.perf_counter()
+    encontrados = [arbol.buscar(n, imprimir=False) for n in nombres]
+    t_indice = (time.perf_counter() - inicio) / consultas
+    assert encontrados == esperados
+    print(f"{cantidad} lugares: recorrido {t_recorrido * 1000:8.2f} ms | "
+          f"índice {t_indice * 1e6:6.2f} µs por búsqueda")
+
+
+def bench_rango(cantidad: int, consultas: int):
+    """Compara `rango`/`k_mas_cercanos` con filtrar el recorrido completo."""
+    arbol = ArbolLugares(balanceado=True)
+    llenar(arbol, lugares_sinteticos(cantidad, ordenados=False))
+    rnd = random.Random(6)
+    intervalos = [(x, x + 0.5) for x in (rnd.uniform(0, 49) for _ in range(consultas))]
+
+    inicio = time.perf_counter()
+    esperados = [[n for n in arbol._iter_inorden() if a <= n.distancia <= b] for a, b in intervalos]
+    t_completo = (time.perf_counter() - inicio) / consultas
+    inicio = time.perf_counter()
+    obtenidos = [arbol.rango(a, b) for a, b in intervalos]
+    t_rango = (time.perf_counter() - inicio) / consultas
+    assert obtenidos == esperados
+    promedio = sum(len(r) for r in obtenidos) / consultas
+    print(f"{cantidad} lugares, rangos de 0.5 km (~{promedio:.0f} resultados): "
+          f"recorrido {t_completo * 1000:8.2f} ms | rango {t_rango * 1000:6.3f} ms")
+
+    inicio = time.perf_counter()
+    for _ in range(consultas):
+        arbol.k_mas_cercanos(5)
+    print(f"k_mas_cercanos(5): {(time.perf_counter() - inicio) / consultas * 1e6:.1f} µs")
+
+
+def bench_carga(cantidad: int):
+    """Compara insertar uno a uno (AVL) contra `desde_ordenados` con entrada ordenada."""
+    lugares = lugares_sinteticos(cantidad, ordenados=True)
+    t_incremental = llenar(ArbolLugares(balanceado=True), lugares)
+    inicio = time.perf_counter()
+    arbol = ArbolLugares.desde_ordenados(lugares)
+    t_masivo = time.perf_counter() - inicio
+    print(f"{cantidad} lugares: insertar uno a uno {t_incremental:7.2f} s | "
+          f"desde_ordenados {t_masivo:7.2f} s (altura {altura(arbol)})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks del árbol de lugares")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("balanceo", help="Árbol simple vs balanceado (AVL)")
+    p.add_argument("--lugares", type=int, default=1_000_000)
+    p.add_argument("--simple-ordenados", type=int, default=5_000)
+
+    p = sub.add_parser("buscar", help="Búsqueda por nombre con índice")
+    p.add_argument("--lugares", type=int, default=1_000_000)
+    p.add_argument("--consultas", type=int, default=20)
+
+    p = sub.add_parser("rango", help="Consultas por rango y k más cercanos")
+    p.add_argument("--lugares", type=int, default=1_000_000)
+    p.add_argument("--consultas", type=int, default=20)
+
+    p = sub.add_parser("carga", help="Carga masiva desde lugares ordenados")
+    p.add_argument("--lugares", type=int, default=1_000_000)
+
+    args = parser.parse_args()
+    if args.bench == "balanceo":
+        bench_balanceo(args.lugares, args.simple_ordenados)
+    elif args.bench == "buscar":
+        bench_buscar(args.lugares, args.consultas)
+    elif args.bench == "rango":
+        bench_rango(args.lugares, args.consultas)
+    elif args.bench == "carga":
+        bench_carga(args.lugares)
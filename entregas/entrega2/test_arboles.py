@@ -0,0 +1,101 @@
+# Proyecto: SmartRoute Event (Versión 2 - Árboles)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Pruebas de `ArbolLugares` (python -m pytest entregas)."""
+
+import random
+
+import pytest
+
+from arboles import ArbolLugares  # type: ignore
+
+
+def _lugares(cantidad: int, semilla: int=0):
+    rnd = random.Random(semilla)
+    return [(f"Lugar {i}", rnd.randrange(100) / 10, f"{i} min", "Hotel") for i in range(cantidad)]
+
+
+def _altura(raiz) -> int:
+    altura, nivel = 0, [raiz] if raiz else []
+    while nivel:
+        altura += 1
+        nivel = [h for n in nivel for h in (n.izq, n.der) if h]
+    return altura
+
+
+def test_balanceado_mismo_orden_y_altura_logaritmica(capsys):
+    ordenados = [(f"Lugar {i}", float(i), "", "Hotel") for i in range(1023)]
+    simple, avl = ArbolLugares(), ArbolLugares(balanceado=True)
+    for lugar in ordenados:
+        simple.insertar(*lugar)
+        avl.insertar(*lugar)
+    assert avl.inorden() == simple.inorden()
+    assert _altura(avl.raiz) <= 11 and _altura(simple.raiz) == 1023
+    capsys.readouterr()
+
+
+def test_desde_ordenados_equivale_a_insertar(capsys):
+    lugares = sorted(_lugares(200), key=lambda x: x[1])
+    masivo = ArbolLugares.desde_ordenados(lugares)
+    uno_a_uno = ArbolLugares(balanceado=True)
+    for lugar in lugares:
+        uno_a_uno.insertar(*lugar)
+    assert masivo.inorden() == uno_a_uno.inorden()
+    assert _altura(masivo.raiz) == 8
+    masivo.insertar("Nuevo", 5.05, "", "Snack")  # Sigue balanceado después
+    assert masivo.buscar("nuevo", imprimir=False).distancia == 5.05
+    with pytest.raises(ValueError):
+        ArbolLugares.desde_ordenados([("A", 2, "", ""), ("B", 1, "", "")])
+    capsys.readouterr()
+
+
+@pytest.mark.parametrize("balanceado", [False, True])
+def test_rango_y_k_mas_cercanos(balanceado):
+    arbol = ArbolLugares(balanceado=balanceado)
+    lugares = _lugares(300)
+    for lugar in lugares:
+        arbol.insertar(*lugar)
+    distancias = sorted(d for _n, d, _t, _tipo in lugares)
+
+    assert [n.distancia for n in arbol.rango(2.0, 4.5)] == [d for d in distancias if 2.0 <= d <= 4.5]
+    assert arbol.rango(20, 30) == []
+    assert [n.distancia for n in arbol.k_mas_cercanos(7)] == distancias[:7]
+    assert arbol.k_mas_cercanos(0) == []
+    assert len(list(arbol.k_mas_cercanos_iter(1000))) == 300
+
+
+def test_buscar_por_nombre_con_indice(capsys):
+    arbol = ArbolLugares(balanceado=True)
+    for nombre, distancia in (("Centro", 3.0), ("Parque", 1.0), ("centro", 0.5), ("Museo", 4.0)):
+        arbol.insertar(nombre, distancia, "", "Lugar")
+
+    assert arbol.buscar("PARQUE", imprimir=False).distancia == 1.0
+    assert arbol.buscar("Estadio", imprimir=False) is None
+    assert capsys.readouterr().out == ""
+    # Con nombres repetidos gana el primero en preorden (la raíz primero)
+    assert arbol.raiz.nombre == "Parque"
+    assert arbol.buscar("centro", imprimir=False).distancia == 0.5
+    arbol.buscar("Museo")
+    assert "Encontrado: Museo" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("balanceado", [False, True])
+def test_buscar_repetidos_da_el_primero_en_preorden(balanceado):
+    def preorden(raiz):
+        pila = [raiz]
+        while pila:
+            nodo = pila.pop()
+            yield nodo
+            pila.extend(h for h in (nodo.der, nodo.izq) if h)
+
+    rnd = random.Random(9)
+    arbol = ArbolLugares(balanceado=balanceado)
+    for i in range(400):  # Muchos nombres y distancias repetidos
+        arbol.insertar(rnd.choice(("Centro", "Parque", "Museo")), rnd.randrange(20), "", "Lugar")
+    for nombre in ("centro", "parque", "museo"):
+        esperado = next(n for n in preorden(arbol.raiz) if n.nombre.lower() == nombre)
+        assert arbol.buscar(nombre, imprimir=False) is esperado
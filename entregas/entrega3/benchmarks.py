@@ -0,0 +1,888 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Mediciones de rendimiento del grafo.
+
+Cada función `bench_*` arma un grafo sintético, mide una operación y
+muestra los resultados por pantalla. Se ejecutan desde la línea de comandos:
+
+    python benchmarks.py csr --nodos 200000
+"""
+
+import argparse
+import gc
+import os
+import random
+import time
+
+from grafo import Grafo, Nodo, distancia_haversine  # type: ignore
+
+
+# FUNCIONES AUXILIARES
+
+def grafo_malla(lado: int, dirigido: bool=False, semilla: int=0,
+                categorias=("Calle",)) -> Grafo:
+    """
+    Crea una malla lado x lado parecida a una red vial.
+
+    Los nodos están separados ~0.1 km y guardan `lat`/`lon` en `meta`.
+    Cada nodo se conecta con su vecino de la derecha y el de abajo con un
+    peso entre 1 y 2 veces la distancia en línea recta (calles no rectas).
+    La categoría de cada nodo se elige al azar entre `categorias`.
+    """
+    rnd = random.Random(semilla)
+    rnd_cat = random.Random(semilla + 1)
+    g = Grafo(dirigido=dirigido)
+    paso = 0.0009  # ~0.1 km en grados
+    for f in range(lado):
+        for c in range(lado):
+            meta = {"lat": 4.6 + f * paso, "lon": -74.1 + c * paso}
+            categoria = rnd_cat.choice(categorias)
+            g.insertar_nodo(Nodo(f"N{f}_{c}", f"Lugar {f}-{c}", 0.0, categoria, meta))
+
+    def conectar(u, v):
+        mu, mv = g.nodos[u].meta, g.nodos[v].meta
+        recta = distancia_haversine(mu["lat"], mu["lon"], mv["lat"], mv["lon"])
+        g.insertar_arista(u, v, peso=recta * rnd.uniform(1.0, 2.0))
+
+    for f in range(lado):
+        for c in range(lado):
+            if c + 1 < lado:
+                conectar(f"N{f}_{c}", f"N{f}_{c + 1}")
+            if f + 1 < lado:
+                conectar(f"N{f}_{c}", f"N{f + 1}_{c}")
+    return g
+
+
+def medir(funcion, *args, repeticiones: int=1):
+    """Ejecuta `funcion(*args)` y retorna (resultado, segundos promedio)."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion(*args)
+    return resultado, (time.perf_counter() - inicio) / repeticiones
+
+
+# BENCHMARKS
+
+def bench_csr(nodos: int):
+    """Compara memoria y tiempo de Dijkstra/BFS/DFS entre dict y CSR."""
+    from csr import memoria_adyacencia  # type: ignore
+
+    lado = max(2, int(nodos ** 0.5))
+    g = grafo_malla(lado)
+    csr = g.congelar()
+    print(f"Malla {lado}x{lado}: {len(g.nodos)} nodos, {csr.num_aristas()} aristas dirigidas")
+
+    antes = memoria_adyacencia(g)
+    despues = csr.memoria()
+    print(f"Memoria adyacencia dict: {antes / 2**20:10.1f} MiB")
+    print(f"Memoria adyacencia CSR:  {despues / 2**20:10.1f} MiB ({antes / despues:.1f}x menos)")
+
+    origen = "N0_0"
+    for nombre in ("dijkstra", "bfs", "dfs"):
+        r_dict, t_dict = medir(getattr(g, nombre), origen)
+        r_csr, t_csr = medir(getattr(csr, nombre), origen)
+        assert r_dict == r_csr, f"{nombre}: resultados distintos"
+        print(f"{nombre:9s} dict {t_dict:8.3f} s | CSR {t_csr:8.3f} s")
+
+
+def bench_ruta(nodos: int, consultas: int):
+    """Compara nodos asentados y tiempo de Dijkstra, bidireccional y A*."""
+    lado = max(2, int(nodos ** 0.5))
+    g = grafo_malla(lado)
+    rnd = random.Random(1)
+    ids = list(g.nodos)
+    pares = [(rnd.choice(ids), rnd.choice(ids)) for _ in range(consultas)]
+    print(f"Malla {lado}x{lado}, {consultas} consultas origen -> destino")
+
+    referencia = None
+    for algoritmo in ("dijkstra", "bidireccional", "astar"):
+        inicio = time.perf_counter()
+        resultados = [g.ruta(s, t, algoritmo) for s, t in pares]
+        segundos = time.perf_counter() - inicio
+        costos = [r["costo"] for r in resultados]
+        if referencia is None:
+            referencia = costos
+        assert costos == referencia, f"{algoritmo}: costos distintos"
+        asentados = sum(r["asentados"] for r in resultados) / consultas
+        print(f"{algoritmo:13s} {segundos / consultas * 1000:8.2f} ms/consulta | "
+              f"{asentados:10.0f} nodos asentados en promedio")
+
+
+def bench_contraccion(nodos: int, consultas: int):
+    """Preprocesa una jerarquía de contracción y la compara con Dijkstra."""
+    import tempfile
+    from contraccion import JerarquiaContraccion  # type: ignore
+
+    lado = max(2, int(nodos ** 0.5))
+    g = grafo_malla(lado)
+    ch, t_pre = medir(JerarquiaContraccion.desde_grafo, g)
+    atajos = sum(1 for a in ch.subida for _p, m in a.values() if m >= 0)
+    print(f"Malla {lado}x{lado}: preprocesamiento {t_pre:.1f} s, {atajos} atajos")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, "red.ch.json")
+        ch.guardar(archivo)
+        ch, t_carga = medir(JerarquiaContraccion.cargar, archivo)
+        print(f"Carga desde disco: {t_carga:.2f} s ({os.path.getsize(archivo) / 2**20:.1f} MiB)")
+
+    rnd = random.Random(1)
+    ids = list(g.nodos)
+    pares = [(rnd.choice(ids), rnd.choice(ids)) for _ in range(consultas)]
+    inicio = time.perf_counter()
+    esperados = [g.dijkstra(s, t)[0][t] for s, t in pares]
+    t_dijkstra = (time.perf_counter() - inicio) / consultas
+    inicio = time.perf_counter()
+    resultados = [ch.ruta(s, t) for s, t in pares]
+    t_ch = (time.perf_counter() - inicio) / consultas
+    assert [r["costo"] for r in resultados] == esperados, "costos distintos"
+    asentados = sum(r["asentados"] for r in resultados) / consultas
+    print(f"dijkstra {t_dijkstra * 1000:8.2f} ms/consulta | CH {t_ch * 1000:8.3f} ms/consulta "
+          f"({asentados:.0f} nodos asentados)")
+
+
+def bench_eliminar(nodos: int, eliminaciones: int):
+    """Mide eliminar_nodo/eliminar_arista en mallas de tamaño creciente.
+
+    Con el índice de aristas entrantes el costo por eliminación depende
+    del grado de los vecinos y no del tamaño del grafo.
+    """
+    lado_max = max(2, int(nodos ** 0.5))
+    for lado in (lado_max // 4, lado_max // 2, lado_max):
+        g = grafo_malla(max(2, lado))
+        ids = random.Random(2).sample(list(g.nodos), min(eliminaciones, len(g.nodos)))
+        aristas = [(u, g.ady[u][0][0]) for u in ids if g.ady[u]]
+        _r, t_aristas = medir(lambda: [g.eliminar_arista(u, v) for u, v in aristas])
+        _r, t_nodos = medir(lambda: [g.eliminar_nodo(u) for u in ids])
+        print(f"{lado * lado:9d} nodos | eliminar_arista {t_aristas / len(aristas) * 1e6:7.1f} µs | "
+              f"eliminar_nodo {t_nodos / len(ids) * 1e6:7.1f} µs")
+
+
+def bench_indices(nodos: int, consultas: int):
+    """Compara las búsquedas por nombre/categoría indexadas contra un recorrido lineal."""
+    categorias = ["Hotel", "Restaurante", "Snack", "Emergencia", "Museo", "Parque"]
+    g = Grafo()
+    for i in range(nodos):
+        g.insertar_nodo(Nodo(f"N{i}", f"Lugar {i}", 0.0, categorias[i % len(categorias)]))
+    print(f"{nodos} nodos, {consultas} consultas")
+
+    def lineal_nombre(nombre):
+        return [n for n in g.nodos.values() if n.nombre.lower() == nombre.lower()]
+
+    def lineal_categoria(categoria):
+        return [n for n in g.nodos.values() if n.categoria.lower() == categoria.lower()]
+
+    rnd = random.Random(3)
+    nombres = [f"lugar {rnd.randrange(nodos)}" for _ in range(consultas)]
+    cats = [rnd.choice(categorias).upper() for _ in range(consultas)]
+    for etiqueta, lineal, indexada, claves in (
+            ("nombre", lineal_nombre, g.buscar_nodo_por_nombre, nombres),
+            ("categoria", lineal_categoria, g.buscar_por_categoria, cats)):
+        r_lineal, t_lineal = medir(lambda: [lineal(c) for c in claves])
+        r_indice, t_indice = medir(lambda: [indexada(c) for c in claves])
+        assert r_lineal == r_indice, f"{etiqueta}: resultados distintos"
+        print(f"{etiqueta:9s} lineal {t_lineal / consultas * 1000:9.3f} ms | "
+              f"índice {t_indice / consultas * 1000:9.3f} ms ({t_lineal / t_indice:.0f}x)")
+
+
+def bench_k_cercanos(nodos: int, consultas: int, k: int):
+    """Compara k_mas_cercanos contra Dijkstra completo + filtro por categoría."""
+    lado = max(2, int(nodos ** 0.5))
+    g = grafo_malla(lado, categorias=["Calle"] * 199 + ["Emergencia"])
+    rnd = random.Random(4)
+    origenes = [rnd.choice(list(g.nodos)) for _ in range(consultas)]
+    print(f"Malla {lado}x{lado}, {len(g.buscar_por_categoria('Emergencia'))} nodos Emergencia, k={k}")
+
+    def completo(origen):
+        dist, _prev = g.dijkstra(origen)
+        candidatos = [(dist[n.id], n.id) for n in g.buscar_por_categoria("Emergencia")]
+        return sorted(c for c in candidatos if c[0] < float('inf'))[:k]
+
+    r_completo, t_completo = medir(lambda: [completo(o) for o in origenes])
+    r_acotado, t_acotado = medir(lambda: [g.k_mas_cercanos(o, "Emergencia", k) for o in origenes])
+    assert r_completo == [[(r["distancia"], r["id"]) for r in rs] for rs in r_acotado]
+    print(f"dijkstra + filtro {t_completo / consultas * 1000:8.2f} ms | "
+          f"k_mas_cercanos {t_acotado / consultas * 1000:8.2f} ms ({t_completo / t_acotado:.0f}x)")
+
+
+def bench_recorridos(nodos: int):
+    """BFS/DFS sobre un corredor largo (camino simple) y corte temprano con *_iter."""
+    g = Grafo()
+    for i in range(nodos):
+        g.insertar_nodo(Nodo(f"N{i}", f"Tramo {i}", float(i), "Calle"))
+    for i in range(nodos - 1):
+        g.insertar_arista(f"N{i}", f"N{i + 1}", peso=0.1)
+    print(f"Corredor de {nodos} nodos")
+
+    for nombre in ("bfs", "dfs"):
+        orden, t = medir(getattr(g, nombre), "N0")
+        assert len(orden) == nodos
+        primeros, t_iter = medir(lambda: [u for u, _ in zip(getattr(g, nombre + "_iter")("N0"), range(10))])
+        print(f"{nombre} completo {t:8.3f} s | primeros 10 con {nombre}_iter {t_iter * 1e6:8.1f} µs")
+
+
+def bench_carga(nodos: int):
+    """Compara insertar_* uno a uno contra desde_aristas y cargar_csv."""
+    import csv
+    import tempfile
+
+    lado = max(2, int(nodos ** 0.5))
+    base = grafo_malla(lado)
+    lista_nodos = list(base.nodos.values())
+    aristas = [(u, v, peso) for u, lst in base.ady.items() for v, peso, _m in lst if u < v]
+    print(f"{len(lista_nodos)} nodos, {len(aristas)} aristas")
+
+    def incremental():
+        g = Grafo()
+        for nodo in lista_nodos:
+            g.insertar_nodo(nodo)
+        for u, v, peso in aristas:
+            g.insertar_arista(u, v, peso=peso)
+        return g
+
+    _g, t_incremental = medir(incremental)
+    _g, t_masivo = medir(Grafo.desde_aristas, aristas, lista_nodos)
+    print(f"insertar uno a uno {t_incremental:7.2f} s | desde_aristas {t_masivo:7.2f} s")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "aristas.csv")
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(["origen", "destino", "peso"])
+            escritor.writerows(aristas)
+        _g, t_csv = medir(Grafo.cargar_csv, ruta)
+        print(f"cargar_csv (sin archivo de nodos) {t_csv:7.2f} s")
+
+
+def bench_snapshot(nodos: int, consultas: int):
+    """Compara construir el grafo con abrir su instantánea binaria (con y sin mmap)."""
+    import tempfile
+
+    lado = max(2, int(nodos ** 0.5))
+    base = grafo_malla(lado)
+    lista_nodos = list(base.nodos.values())
+    aristas = [(u, v, peso) for u, lst in base.ady.items() for v, peso, _m in lst if u < v]
+    _g, t_construir = medir(Grafo.desde_aristas, aristas, lista_nodos)
+    print(f"{len(lista_nodos)} nodos: desde_aristas {t_construir:7.2f} s")
+
+    rnd = random.Random(12)
+    ids = list(base.nodos)
+    pares = [(rnd.choice(ids), rnd.choice(ids)) for _ in range(consultas)]
+    csr = base.congelar()
+    esperados = [csr.dijkstra(s)[0][t] for s, t in pares]
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "red.srg")
+        _r, t_guardar = medir(base.guardar, ruta)
+        print(f"guardar {t_guardar:7.2f} s ({os.path.getsize(ruta) / 2**20:.1f} MiB)")
+        for usar_mmap in (True, False):
+            abierto, t_abrir = medir(Grafo.abrir, ruta, usar_mmap)
+            inicio = time.perf_counter()
+            obtenidos = [abierto.dijkstra(s)[0][t] for s, t in pares]
+            t_consultas = (time.perf_counter() - inicio) / consultas
+            assert obtenidos == esperados
+            print(f"abrir (mmap={usar_mmap}) {t_abrir * 1000:8.2f} ms | "
+                  f"dijkstra {t_consultas * 1000:8.2f} ms por consulta")
+            del abierto
+
+
+def bench_cache(nodos: int, consultas: int, pares: int):
+    """Consultas repetidas de pares populares con y sin la caché de rutas."""
+    g = grafo_malla(max(2, int(nodos ** 0.5)))
+    rnd = random.Random(13)
+    ids = list(g.nodos)
+    populares = [(rnd.choice(ids), rnd.choice(ids)) for _ in range(pares)]
+    secuencia = [rnd.choice(populares) for _ in range(consultas)]
+
+    def correr():
+        return [g.ruta(s, t)["costo"] for s, t in secuencia]
+
+    esperados, t_sin = medir(correr)
+    g.activar_cache(capacidad=pares)
+    obtenidos, t_con = medir(correr)
+    assert obtenidos == esperados
+    print(f"{len(ids)} nodos, {consultas} consultas sobre {pares} pares: "
+          f"sin caché {t_sin / consultas * 1000:8.2f} ms | "
+          f"con caché {t_con / consultas * 1000:8.3f} ms por consulta")
+    print(f"estadísticas: {g.estadisticas_cache()}")
+
+
+def bench_matriz(nodos: int, origenes: int, destinos: int, workers: int):
+    """Matriz de distancias: bucle de Dijkstra en serie contra procesos en paralelo."""
+    g = grafo_malla(max(2, int(nodos ** 0.5)))
+    rnd = random.Random(14)
+    ids = list(g.nodos)
+    filas = [rnd.choice(ids) for _ in range(origenes)]
+    columnas = [rnd.choice(ids) for _ in range(destinos)]
+
+    def serie():
+        resultado = []
+        for o in filas:
+            dist, _prev = g.dijkstra(o)
+            resultado.append([dist[d] for d in columnas])
+        return resultado
+
+    esperada, t_serie = medir(serie)
+    for w in sorted({1, workers}):
+        matriz, t = medir(g.matriz_distancias, filas, columnas, w)
+        assert [list(fila) for fila in matriz] == esperada
+        print(f"{len(ids)} nodos, {origenes}x{destinos}: bucle dijkstra {t_serie:7.2f} s | "
+              f"matriz_distancias(workers={w}) {t:7.2f} s")
+    if workers > 1:
+        # Sin cambios en el grafo se reutilizan la copia congelada y su archivo;
+        # con un pool propio tampoco se arrancan procesos en cada llamada
+        import multiprocessing
+        _matriz, t_repetida = medir(g.matriz_distancias, filas, columnas, workers)
+        with multiprocessing.Pool(workers) as pool:
+            g.matriz_distancias(filas, columnas, workers, pool)  # Cada proceso abre el archivo
+            _matriz, t_pool = medir(g.matriz_distancias, filas, columnas, workers, pool)
+        print(f"  llamada repetida {t_repetida:7.2f} s | con pool reutilizado {t_pool:7.2f} s")
+
+
+def bench_servicio(nodos: int, consultas: int, origenes: int):
+    """Ráfaga de consultas asyncio: una búsqueda por consulta contra `ServicioRutas`."""
+    import asyncio
+    from servicio import ServicioRutas  # type: ignore
+
+    g = grafo_malla(max(2, int(nodos ** 0.5)))
+    rnd = random.Random(15)
+    ids = list(g.nodos)
+    populares = [rnd.choice(ids) for _ in range(origenes)]
+    pares = [(rnd.choice(populares), rnd.choice(ids)) for _ in range(consultas)]
+    csr = g.congelar()
+
+    async def cronometrar(corrutina):
+        inicio = time.perf_counter()
+        await corrutina
+        return time.perf_counter() - inicio
+
+    async def directo():
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*(cronometrar(loop.run_in_executor(
+            None, csr.dijkstra_indices, csr.indice(s), csr.indice(t))) for s, t in pares))
+
+    async def servicio():
+        async with ServicioRutas(g, timeout=None) as srv:
+            latencias = await asyncio.gather(*(cronometrar(srv.ruta(s, t)) for s, t in pares))
+            print(f"  {srv.estadisticas()}")
+            return latencias
+
+    for nombre, funcion in (("una búsqueda por consulta", directo), ("ServicioRutas", servicio)):
+        inicio = time.perf_counter()
+        latencias = sorted(asyncio.run(funcion()))
+        total = time.perf_counter() - inicio
+        p99 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))]
+        print(f"{nombre:26s}: {consultas / total:8.1f} consultas/s | "
+              f"p50 {latencias[len(latencias) // 2] * 1000:8.1f} ms | p99 {p99 * 1000:8.1f} ms")
+
+
+def bench_dinamico(nodos: int, origenes: int, cambios: int):
+    """Cierres y reaperturas de calles: reparar caminos contra recalcular Dijkstra."""
+    from dinamico import CaminosDinamicos  # type: ignore
+
+    g = grafo_malla(max(2, int(nodos ** 0.5)))
+    rnd = random.Random(16)
+    ids = list(g.nodos)
+    caminos = [CaminosDinamicos(g, rnd.choice(ids)) for _ in range(origenes)]
+    aristas = [(u, v, peso) for u, lst in g.ady.items() for v, peso, _m in lst if u < v]
+    cerradas = []
+    t_reparar = t_recalcular = 0.0
+    for i in range(cambios):
+        if cerradas and i % 2:
+            u, v, peso = cerradas.pop(rnd.randrange(len(cerradas)))
+            g.insertar_arista(u, v, peso=peso)
+        else:
+            u, v, peso = aristas[rnd.randrange(len(aristas))]
+            if not g._posiciones.get((u, v)):
+                continue
+            g.eliminar_arista(u, v)
+            cerradas.append((u, v, peso))
+
+        inicio = time.perf_counter()
+        for c in caminos:
+            c.arista_cambiada(u, v)
+        t_reparar += time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        recalculados = [g.dijkstra(c.origen)[0] for c in caminos]
+        t_recalcular += time.perf_counter() - inicio
+        assert all(d == c.dist for d, c in zip(recalculados, caminos))
+
+    print(f"{len(ids)} nodos, {origenes} orígenes, {cambios} cambios: "
+          f"recalcular {t_recalcular / cambios * 1000:8.2f} ms | "
+          f"reparar {t_reparar / cambios * 1000:8.3f} ms por cambio")
+
+
+def bench_horario(nodos: int, franjas: int):
+    """Pesos por hora: reconstruir el grafo por franja contra `dijkstra(salida=...)`."""
+    from grafo import tiempo_viaje  # type: ignore
+
+    base = grafo_malla(max(2, int(nodos ** 0.5)))
+    rnd = random.Random(17)
+    aristas = []
+    for u, lst in base.ady.items():
+        for v, peso, _m in lst:
+            if u < v:
+                # Hora pico entre las 7 y las 9 (minutos desde medianoche) en un tercio de las calles
+                meta = {"perfil": [(420, peso), (480, peso * 3), (540, peso)]} if rnd.random() < 0.3 else None
+                aristas.append((u, v, peso, meta))
+    g = Grafo.desde_aristas(aristas, list(base.nodos.values()))
+    origen = next(iter(g.nodos))
+    horas = [420 + i * 120 / franjas for i in range(franjas)]
+
+    def por_franja():
+        resultado = []
+        for hora in horas:
+            # Aproximación actual: un grafo completo por franja con el peso de esa hora
+            copia = Grafo.desde_aristas(
+                [(u, v, tiempo_viaje(m["perfil"], hora) if m else peso) for u, v, peso, m in aristas],
+                list(base.nodos.values()))
+            resultado.append(copia.dijkstra(origen)[0])
+        return resultado
+
+    def dependiente():
+        return [g.dijkstra(origen, salida=hora)[0] for hora in horas]
+
+    _r, t_franjas = medir(por_franja)
+    _r, t_horario = medir(dependiente)
+    print(f"{len(g.nodos)} nodos, {franjas} franjas: grafo por franja {t_franjas:7.2f} s | "
+          f"dijkstra(salida=...) {t_horario:7.2f} s")
+
+
+def bench_pareto(nodos: int, consultas: int):
+    """Rutas más corta y más rápida: dos Dijkstra en grafos distintos contra `rutas_pareto`."""
+    base = grafo_malla(max(2, int(nodos ** 0.5)))
+    rnd = random.Random(18)
+    aristas = []
+    for u, lst in base.ady.items():
+        for v, peso, _m in lst:
+            if u < v:
+                # Minutos según una velocidad entre 20 y 80 km/h
+                aristas.append((u, v, peso, {"tiempo": peso * 60 / rnd.uniform(20, 80)}))
+    nodos_base = list(base.nodos.values())
+    g = Grafo.desde_aristas(aristas, nodos_base)
+    g_tiempo = Grafo.desde_aristas([(u, v, m["tiempo"]) for u, v, _p, m in aristas], nodos_base)
+    ids = list(g.nodos)
+    pares = [(rnd.choice(ids), rnd.choice(ids)) for _ in range(consultas)]
+
+    def dos_dijkstra():
+        return [(g.dijkstra(s, t)[0][t], g_tiempo.dijkstra(s, t)[0][t]) for s, t in pares]
+
+    def pareto(tolerancia):
+        return [g.rutas_pareto(s, t, tolerancia=tolerancia) for s, t in pares]
+
+    extremos, t_dos = medir(dos_dijkstra)
+    print(f"{len(ids)} nodos: dos dijkstra {t_dos / consultas * 1000:8.1f} ms por consulta")
+    for tolerancia in (0.0, 0.05):
+        frentes, t_pareto = medir(pareto, tolerancia)
+        if not tolerancia:
+            for (corta, rapida), frente in zip(extremos, frentes):
+                assert frente[0]["costos"]["peso"] == corta
+                assert abs(min(r["costos"]["tiempo"] for r in frente) - rapida) < 1e-9
+        promedio = sum(len(f) for f in frentes) / consultas
+        print(f"rutas_pareto(tolerancia={tolerancia}) {t_pareto / consultas * 1000:8.1f} ms "
+              f"por consulta ({promedio:.1f} rutas no dominadas en promedio)")
+
+
+def bench_espacial(nodos: int, consultas: int):
+    """Pegar coordenadas GPS a la red: recorrer todos los nodos contra el índice espacial."""
+    g = grafo_malla(max(2, int(nodos ** 0.5)))
+    rnd = random.Random(19)
+    coordenadas = [n.coordenadas() for n in g.nodos.values()]
+    lat_min, lat_max = min(c[0] for c in coordenadas), max(c[0] for c in coordenadas)
+    lon_min, lon_max = min(c[1] for c in coordenadas), max(c[1] for c in coordenadas)
+    puntos = [(rnd.uniform(lat_min, lat_max), rnd.uniform(lon_min, lon_max)) for _ in range(consultas)]
+
+    def recorrido(lat, lon):
+        return min((distancia_haversine(n.meta["lat"], n.meta["lon"], lat, lon), n.id)
+                   for n in g.nodos.values())[1]
+
+    esperados, t_recorrido = medir(lambda: [recorrido(*p) for p in puntos])
+    _indice, t_armar = medir(g._indice_espacial)
+    obtenidos, t_indice = medir(lambda: [g.nodo_mas_cercano(*p)[0] for p in puntos])
+    assert obtenidos == esperados
+    _r, t_radio = medir(lambda: [g.nodos_en_radio(lat, lon, 1.0) for lat, lon in puntos])
+    print(f"{len(g.nodos)} nodos: recorrido {t_recorrido / consultas * 1000:8.2f} ms | "
+          f"nodo_mas_cercano {t_indice / consultas * 1e6:6.1f} µs | "
+          f"nodos_en_radio(1 km) {t_radio / consultas * 1e6:6.1f} µs "
+          f"(armar el índice {t_armar:.2f} s)")
+
+
+def bench_componentes(nodos: int, consultas: int):
+    """Consultas entre lugares desconectados: búsqueda completa contra el índice de componentes."""
+    lado = max(3, int(nodos ** 0.5))
+    g = grafo_malla(lado)
+    # Cerrar una columna entera parte la malla en dos
+    for f in range(lado):
+        g.eliminar_nodo(f"N{f}_{lado // 2}")
+    rnd = random.Random(20)
+    pares = [(f"N{rnd.randrange(lado)}_{rnd.randrange(lado // 2)}",
+              f"N{rnd.randrange(lado)}_{rnd.randrange(lado // 2 + 1, lado)}") for _ in range(consultas)]
+
+    def buscar():
+        return [g._ruta(s, t, "bidireccional", None)["costo"] for s, t in pares]
+
+    esperados, t_busqueda = medir(buscar)
+    _r, t_armar = medir(g.componentes)
+    obtenidos, t_indice = medir(lambda: [g.ruta(s, t)["costo"] for s, t in pares])
+    assert obtenidos == esperados
+    print(f"{len(g.nodos)} nodos, componentes {g.componentes()[:3]}: "
+          f"búsqueda {t_busqueda / consultas * 1000:8.2f} ms | "
+          f"con índice {t_indice / consultas * 1e6:6.2f} µs por consulta (armar {t_armar:.2f} s)")
+
+
+def bench_memoria(nodos: int):
+    """
+    Bytes por nodo y por arista medidos con tracemalloc: nodos con `__slots__`
+    y metadatos vacíos compartidos contra nodos con `__dict__` y un dict
+    vacío propio por nodo y por arista (la representación anterior).
+    """
+    import tracemalloc
+    from grafo import META_VACIA  # type: ignore
+
+    class NodoConDict(Nodo):
+        """Nodo con __dict__ y su propio dict de metadatos."""
+
+        def __init__(self, *args):
+            super().__init__(*args)
+            self.meta = {}
+
+    lado = max(2, int(nodos ** 0.5))
+    ids = [f"N{i}" for i in range(lado * lado)]
+    datos = [(node_id, f"Lugar {node_id}", 0.5, "Calle") for node_id in ids]
+    aristas = [(ids[i], ids[i + 1], 1.0) for i in range(len(ids) - 1)]
+    aristas += [(ids[i], ids[i + lado], 1.0) for i in range(len(ids) - lado)]
+
+    def medir_bytes(clase, meta_arista):
+        gc_activo = gc.isenabled()
+        gc.disable()
+        tracemalloc.start()
+        g = Grafo()
+        inicio = tracemalloc.get_traced_memory()[0]
+        for dato in datos:
+            g.insertar_nodo(clase(*dato))
+        en_nodos = tracemalloc.get_traced_memory()[0]
+        for u, v, peso in aristas:
+            # Aristas no dirigidas: una entrada en cada sentido
+            g._agregar_arista(u, v, peso, meta_arista())
+            g._agregar_arista(v, u, peso, meta_arista())
+        en_aristas = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        if gc_activo:
+            gc.enable()
+        return (en_nodos - inicio) / len(datos), (en_aristas - en_nodos) / len(aristas)
+
+    def medir_objetos(clase, meta_arista):
+        tracemalloc.start()
+        nodos_creados = [clase(*dato) for dato in datos]
+        en_nodos = tracemalloc.get_traced_memory()[0]
+        registros = [(v, peso, meta_arista()) for _u, v, peso in aristas]
+        en_aristas = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del nodos_creados, registros
+        return en_nodos / len(datos), (en_aristas - en_nodos) / len(aristas)
+
+    print(f"{len(datos)} nodos, {len(aristas)} aristas")
+    for etiqueta, medicion in (("solo los objetos", medir_objetos),
+                               ("dentro del grafo (con índices)", medir_bytes)):
+        antes = medicion(NodoConDict, dict)
+        despues = medicion(Nodo, lambda: META_VACIA)
+        print(f"[{etiqueta}]")
+        print(f"  con __dict__ y dicts vacíos: {antes[0]:7.1f} B/nodo | {antes[1]:7.1f} B/arista")
+        print(f"  con __slots__ y META_VACIA : {despues[0]:7.1f} B/nodo | {despues[1]:7.1f} B/arista")
+
+
+def bench_pesos(nodos: int, lote: int):
+    """Lote de pesos de tráfico: eliminar + insertar contra `actualizar_pesos`."""
+    from csr import np  # type: ignore
+
+    g = grafo_malla(max(2, int(nodos ** 0.5)))
+    csr = g.congelar()
+    rnd = random.Random(22)
+    aristas = [(u, v) for u, lst in g.ady.items() for v, _peso, _m in lst if u < v]
+    cambios = [(u, v, rnd.uniform(0.1, 1.0)) for u, v in rnd.sample(aristas, min(lote, len(aristas)))]
+
+    inicio = time.perf_counter()
+    for u, v, peso in cambios[:max(1, len(cambios) // 10)]:
+        g.eliminar_arista(u, v)
+        g.insertar_arista(u, v, peso=peso)
+    t_antes = (time.perf_counter() - inicio) / max(1, len(cambios) // 10) * len(cambios)
+    _, t_grafo = medir(g.actualizar_pesos, cambios)
+    _, t_csr = medir(csr.actualizar_pesos, cambios)
+    origenes = [csr.indice(u) for u, _v, _p in cambios]
+    destinos = [csr.indice(v) for _u, v, _p in cambios]
+    pesos = [peso for _u, _v, peso in cambios]
+    _, t_indices = medir(csr.actualizar_pesos_indices, origenes, destinos, pesos)
+
+    print(f"{len(g.nodos)} nodos, lote de {len(cambios)} aristas")
+    print(f"  eliminar + insertar (estimado): {t_antes * 1000:9.2f} ms")
+    print(f"  Grafo.actualizar_pesos        : {t_grafo * 1000:9.2f} ms")
+    print(f"  GrafoCSR.actualizar_pesos     : {t_csr * 1000:9.2f} ms "
+          f"({'NumPy' if np is not None else 'sin NumPy'})")
+    print(f"  GrafoCSR con índices          : {t_indices * 1000:9.2f} ms")
+
+
+def bench_concurrencia(nodos: int, segundos: float, lectores: int):
+    """
+    Lectores en hilos mientras otro hilo cambia pesos (feed de tráfico): un
+    candado global alrededor de todo contra instantáneas (`GrafoConcurrente`).
+    """
+    import threading
+    from concurrencia import GrafoConcurrente  # type: ignore
+
+    def correr(modo: str, n_lectores: int):
+        g = grafo_malla(max(2, int(nodos ** 0.5)))
+        ids = list(g.nodos)
+        aristas = [(u, v, peso) for u, lst in g.ady.items() for v, peso, _m in lst if u < v]
+        candado = threading.Lock()
+        cg = GrafoConcurrente(g) if modo == "instantaneas" else None
+        fin = time.perf_counter() + segundos
+        lecturas = [0] * n_lectores
+        escrituras = [0]
+
+        def lector(k: int):
+            rnd = random.Random(k)
+            while time.perf_counter() < fin:
+                o, d = rnd.choice(ids), rnd.choice(ids)
+                if cg is not None:
+                    cg.instantanea().ruta(o, d)
+                else:
+                    with candado:
+                        g.ruta(o, d)
+                lecturas[k] += 1
+
+        def escritor():
+            rnd = random.Random(-1)
+            while time.perf_counter() < fin:
+                u, v, peso = aristas[rnd.randrange(len(aristas))]
+                lote = [(u, v, peso * rnd.uniform(1.0, 2.0))]
+                if cg is not None:
+                    cg.actualizar_pesos(lote)
+                else:
+                    with candado:
+                        g.actualizar_pesos(lote)
+                escrituras[0] += 1
+                time.sleep(0.001)  # Ritmo de un feed de cambios
+
+        hilos = [threading.Thread(target=lector, args=(k,)) for k in range(n_lectores)]
+        hilos.append(threading.Thread(target=escritor))
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        return sum(lecturas) / segundos, escrituras[0] / segundos
+
+    print(f"~{nodos} nodos, {segundos:.0f} s por medición, {os.cpu_count()} CPU")
+    n = 1
+    while n <= lectores:
+        for modo in ("candado", "instantaneas"):
+            lecturas, escrituras = correr(modo, n)
+            print(f"  {n:2d} lectores | {modo:12s}: {lecturas:8.1f} rutas/s | "
+                  f"{escrituras:7.1f} cambios/s")
+        n *= 2
+
+
+def bench_particion(nodos: int, celdas: int, consultas: int):
+    """Rutas repartidas en procesos por celda contra `Grafo.ruta` en un solo proceso."""
+    from particion import RuteadorParticionado  # type: ignore
+
+    g = grafo_malla(max(2, int(nodos ** 0.5)))
+    particion, t_particion = medir(g.particionar, celdas)
+    rp, t_preparar = medir(RuteadorParticionado, g, particion)
+    rnd = random.Random(24)
+    ids = list(g.nodos)
+    pares = [(rnd.choice(ids), rnd.choice(ids)) for _ in range(consultas)]
+    with rp:
+        resultados, t_celdas = medir(lambda: [rp.ruta(o, d) for o, d in pares])
+        esperados, t_grafo = medir(lambda: [g.ruta(o, d) for o, d in pares])
+        assert all(abs(r["costo"] - e["costo"]) <= 1e-9 * max(1.0, e["costo"])
+                   for r, e in zip(resultados, esperados))
+        nodos_overlay, aristas_overlay = rp.tamano_overlay()
+
+    fronteras = sum(len(f) for f in particion.frontera)
+    print(f"{len(ids)} nodos en {celdas} celdas {particion.tamanos()[:8]}"
+          f"{'...' if celdas > 8 else ''}")
+    print(f"  partición  : {t_particion * 1000:8.1f} ms | {particion.aristas_cortadas} aristas "
+          f"cortadas | {fronteras} nodos frontera")
+    print(f"  overlay    : {nodos_overlay} nodos, {aristas_overlay} aristas "
+          f"(preparación {t_preparar:.2f} s)")
+    print(f"  rutas      : Grafo.ruta {t_grafo / consultas * 1000:8.2f} ms | "
+          f"celdas {t_celdas / consultas * 1000:8.2f} ms por consulta "
+          f"({os.cpu_count()} CPU)")
+
+
+def bench_landmarks(nodos: int, cantidad: int, consultas: int):
+    """Preprocesamiento ALT y A* con cotas de landmarks frente a Dijkstra y A* por coordenadas."""
+    g = grafo_malla(max(2, int(nodos ** 0.5)))
+    lejanos, t_lejanos = medir(g.preparar_landmarks, cantidad, "lejanos")
+    evitar, t_evitar = medir(g.preparar_landmarks, cantidad, "evitar")
+    rnd = random.Random(25)
+    ids = list(g.nodos)
+    pares = [(rnd.choice(ids), rnd.choice(ids)) for _ in range(consultas)]
+
+    print(f"{len(ids)} nodos, {cantidad} landmarks ({os.cpu_count()} CPU)")
+    print(f"  preparación: lejanos {t_lejanos:6.2f} s | evitar {t_evitar:6.2f} s")
+    variantes = [
+        ("dijkstra", lambda o, d: g.ruta(o, d, "dijkstra")),
+        ("bidireccional", lambda o, d: g.ruta(o, d, "bidireccional")),
+        ("astar coords", lambda o, d: g.ruta(o, d, "astar")),
+        ("alt lejanos", lambda o, d: g.ruta(o, d, "astar", heuristica=lejanos.heuristica(d))),
+        ("alt evitar", lambda o, d: g.ruta(o, d, "astar", heuristica=evitar.heuristica(d))),
+    ]
+    for nombre, f in variantes:
+        resultados, t = medir(lambda: [f(o, d) for o, d in pares])
+        asentados = sum(r["asentados"] for r in resultados) / consultas
+        print(f"  {nombre:14}: {t / consultas * 1000:8.2f} ms | {asentados:9.0f} asentados por consulta")
+
+    _, t_estimar = medir(lambda: [evitar.estimar(o, d) for o, d in pares])
+    _, t_clasificar = medir(evitar.clasificar, ids[0], ids[:1000])
+    print(f"  estimar    : {t_estimar / consultas * 1e6:8.2f} µs por par | "
+          f"clasificar 1000 candidatos {t_clasificar * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de SmartRoute Event")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("csr", help="Memoria y tiempos del backend CSR")
+    p.add_argument("--nodos", type=int, default=250_000)
+
+    p = sub.add_parser("ruta", help="Consultas punto a punto (bidireccional, A*)")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--consultas", type=int, default=20)
+
+    p = sub.add_parser("contraccion", help="Jerarquías de contracción vs Dijkstra")
+    p.add_argument("--nodos", type=int, default=40_000)
+    p.add_argument("--consultas", type=int, default=50)
+
+    p = sub.add_parser("eliminar", help="Costo de eliminar nodos y aristas")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--eliminaciones", type=int, default=5_000)
+
+    p = sub.add_parser("indices", help="Búsquedas por nombre y categoría")
+    p.add_argument("--nodos", type=int, default=1_000_000)
+    p.add_argument("--consultas", type=int, default=20)
+
+    p = sub.add_parser("k_cercanos", help="Los k más cercanos de una categoría")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--consultas", type=int, default=20)
+    p.add_argument("--k", type=int, default=5)
+
+    p = sub.add_parser("recorridos", help="BFS/DFS en un corredor largo")
+    p.add_argument("--nodos", type=int, default=1_000_000)
+
+    p = sub.add_parser("carga", help="Carga masiva de nodos y aristas")
+    p.add_argument("--nodos", type=int, default=1_000_000)
+
+    p = sub.add_parser("snapshot", help="Guardar y abrir la instantánea binaria")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--consultas", type=int, default=5)
+
+    p = sub.add_parser("cache", help="Caché LRU de rutas con pares repetidos")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--consultas", type=int, default=200)
+    p.add_argument("--pares", type=int, default=10)
+
+    p = sub.add_parser("matriz", help="Matriz de distancias en paralelo")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--origenes", type=int, default=200)
+    p.add_argument("--destinos", type=int, default=30)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    p = sub.add_parser("servicio", help="Servicio asyncio con consultas agrupadas")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--consultas", type=int, default=200)
+    p.add_argument("--origenes", type=int, default=10)
+
+    p = sub.add_parser("dinamico", help="Reparar caminos tras cierres de calles")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--origenes", type=int, default=5)
+    p.add_argument("--cambios", type=int, default=50)
+
+    p = sub.add_parser("horario", help="Pesos dependientes de la hora")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--franjas", type=int, default=8)
+
+    p = sub.add_parser("pareto", help="Rutas no dominadas por distancia y tiempo")
+    p.add_argument("--nodos", type=int, default=10_000)
+    p.add_argument("--consultas", type=int, default=10)
+
+    p = sub.add_parser("espacial", help="Nodo más cercano a coordenadas GPS")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--consultas", type=int, default=20)
+
+    p = sub.add_parser("componentes", help="Consultas entre componentes distintas")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--consultas", type=int, default=10)
+
+    p = sub.add_parser("memoria", help="Bytes por nodo y por arista (tracemalloc)")
+    p.add_argument("--nodos", type=int, default=250_000)
+
+    p = sub.add_parser("pesos", help="Actualizar pesos por lotes (feed de tráfico)")
+    p.add_argument("--nodos", type=int, default=250_000)
+    p.add_argument("--lote", type=int, default=20_000)
+
+    p = sub.add_parser("concurrencia", help="Lectores en hilos con un escritor concurrente")
+    p.add_argument("--nodos", type=int, default=10_000)
+    p.add_argument("--segundos", type=float, default=3.0)
+    p.add_argument("--lectores", type=int, default=4)
+
+    p = sub.add_parser("particion", help="Rutas repartidas en procesos por celda")
+    p.add_argument("--nodos", type=int, default=40_000)
+    p.add_argument("--celdas", type=int, default=8)
+    p.add_argument("--consultas", type=int, default=20)
+
+    p = sub.add_parser("landmarks", help="Cotas ALT por landmarks para A*")
+    p.add_argument("--nodos", type=int, default=40_000)
+    p.add_argument("--landmarks", type=int, default=8)
+    p.add_argument("--consultas", type=int, default=50)
+
+    args = parser.parse_args()
+    if args.bench == "csr":
+        bench_csr(args.nodos)
+    elif args.bench == "ruta":
+        bench_ruta(args.nodos, args.consultas)
+    elif args.bench == "contraccion":
+        bench_contraccion(args.nodos, args.consultas)
+    elif args.bench == "eliminar":
+        bench_eliminar(args.nodos, args.eliminaciones)
+    elif args.bench == "indices":
+        bench_indices(args.nodos, args.consultas)
+    elif args.bench == "k_cercanos":
+        bench_k_cercanos(args.nodos, args.consultas, args.k)
+    elif args.bench == "recorridos":
+        bench_recorridos(args.nodos)
+    elif args.bench == "carga":
+        bench_carga(args.nodos)
+    elif args.bench == "snapshot":
+        bench_snapshot(args.nodos, args.consultas)
+    elif args.bench == "cache":
+        bench_cache(args.nodos, args.consultas, args.pares)
+    elif args.bench == "matriz":
+        bench_matriz(args.nodos, args.origenes, args.destinos, args.workers)
+    elif args.bench == "servicio":
+        bench_servicio(args.nodos, args.consultas, args.origenes)
+    elif args.bench == "dinamico":
+        bench_dinamico(args.nodos, args.origenes, args.cambios)
+    elif args.bench == "horario":
+        bench_horario(args.nodos, args.franjas)
+    elif args.bench == "pareto":
+        bench_pareto(args.nodos, args.consultas)
+    elif args.bench == "espacial":
+        bench_espacial(args.nodos, args.consultas)
+    elif args.bench == "componentes":
+        bench_componentes(args.nodos, args.consultas)
+    elif args.bench == "memoria":
+        bench_memoria(args.nodos)
+    elif args.bench == "pesos":
+        bench_pesos(args.nodos, args.lote)
+    elif args.bench == "concurrencia":
+        bench_concurrencia(args.nodos, args.segundos, args.lectores)
+    elif args.bench == "particion":
+        bench_particion(args.nodos, args.celdas, args.consultas)
+    elif args.bench == "landmarks":
+        bench_landmarks(args.nodos, args.landmarks, args.consultas)
@@ -0,0 +1,132 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Componentes conexas de un `Grafo` para descartar al instante las consultas
+entre lugares que no están conectados.
+
+- `IndiceComponentes`: union-find (conjuntos disjuntos) sobre las aristas
+  sin importar su dirección. Insertar nodos y aristas lo actualiza en tiempo
+  casi constante; eliminar puede partir una componente, así que el `Grafo`
+  lo descarta y lo vuelve a armar en la siguiente consulta.
+- `componentes_fuertes`: componentes fuertemente conexas (Tarjan) para
+  grafos dirigidos.
+"""
+
+from typing import Dict, List
+
+
+# CLASE: INDICECOMPONENTES
+
+class IndiceComponentes:
+    """
+    Union-find con compresión de caminos y unión por tamaño.
+
+    Dos nodos en conjuntos distintos no tienen ningún camino entre ellos
+    (en ninguna dirección).
+    """
+
+    def __init__(self):
+        self._padre: Dict[str, str] = {}
+        self._tamano: Dict[str, int] = {}  # Solo para las raíces
+
+    @classmethod
+    def desde_grafo(cls, grafo) -> "IndiceComponentes":
+        """Arma el índice con todos los nodos y aristas del grafo."""
+        indice = cls()
+        for node_id in grafo.nodos:
+            indice.agregar(node_id)
+        for u, lst in grafo.ady.items():
+            for v, _peso, _meta in lst:
+                indice.unir(u, v)
+        return indice
+
+    def agregar(self, node_id: str):
+        """Agrega un nodo aislado."""
+        if node_id not in self._padre:
+            self._padre[node_id] = node_id
+            self._tamano[node_id] = 1
+
+    def raiz(self, node_id: str) -> str:
+        """Representante de la componente del nodo."""
+        padre = self._padre
+        while padre[node_id] != node_id:
+            padre[node_id] = padre[padre[node_id]]  # Compresión a la mitad
+            node_id = padre[node_id]
+        return node_id
+
+    def unir(self, u: str, v: str):
+        """Une las componentes de u y v (por una arista nueva)."""
+        a, b = self.raiz(u), self.raiz(v)
+        if a == b:
+            return
+        if self._tamano[a] < self._tamano[b]:
+            a, b = b, a
+        self._padre[b] = a
+        self._tamano[a] += self._tamano.pop(b)
+
+    def conectados(self, u: str, v: str) -> bool:
+        """True si u y v están en la misma componente."""
+        return self.raiz(u) == self.raiz(v)
+
+    def tamanos(self) -> List[int]:
+        """Tamaño de cada componente, de mayor a menor."""
+        return sorted(self._tamano.values(), reverse=True)
+
+
+def componentes_fuertes(grafo) -> List[List[str]]:
+    """
+    Componentes fuertemente conexas de un grafo (algoritmo de Tarjan sin
+    recursión): dentro de cada una, todos los nodos se alcanzan entre sí.
+
+    Retorna:
+        list: Listas de ids, una por componente, de la más grande a la más chica
+    """
+    indice: Dict[str, int] = {}
+    bajo: Dict[str, int] = {}
+    en_pila = set()
+    pila: List[str] = []
+    resultado: List[List[str]] = []
+
+    for inicio in grafo.nodos:
+        if inicio in indice:
+            continue
+        indice[inicio] = bajo[inicio] = len(indice)
+        pila.append(inicio)
+        en_pila.add(inicio)
+        llamadas = [(inicio, iter(grafo.ady.get(inicio, ())))]
+        while llamadas:
+            u, vecinos = llamadas[-1]
+            avanzo = False
+            for v, _peso, _meta in vecinos:
+                if v not in indice:
+                    indice[v] = bajo[v] = len(indice)
+                    pila.append(v)
+                    en_pila.add(v)
+                    llamadas.append((v, iter(grafo.ady.get(v, ()))))
+                    avanzo = True
+                    break
+                if v in en_pila:
+                    bajo[u] = min(bajo[u], indice[v])
+            if avanzo:
+                continue
+            llamadas.pop()
+            if llamadas:
+                padre = llamadas[-1][0]
+                bajo[padre] = min(bajo[padre], bajo[u])
+            if bajo[u] == indice[u]:
+                componente = []
+                while True:
+                    w = pila.pop()
+                    en_pila.discard(w)
+                    componente.append(w)
+                    if w == u:
+                        break
+                resultado.append(componente)
+
+    resultado.sort(key=len, reverse=True)
+    return resultado
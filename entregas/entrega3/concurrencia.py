@@ -0,0 +1,322 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Consultas desde varios hilos sobre un `Grafo` que se sigue modificando.
+
+Un `Grafo` no se puede leer mientras otro hilo lo cambia: `eliminar_nodo` y
+`eliminar_arista` rearman listas de adyacencia que un `dijkstra` puede estar
+recorriendo. `GrafoConcurrente` da aislamiento por instantáneas:
+- Los lectores toman una `Instantanea` (O(1) y sin candados) y consultan
+  sobre ella: esa versión del grafo nunca cambia.
+- Los escritores modifican el grafo original de a uno y al terminar
+  publican una versión nueva que comparte estructura con la anterior: los
+  nodos están repartidos en cubetas y solo se copian las cubetas de los
+  nodos que cambiaron.
+- Las versiones viejas se liberan solas cuando ningún lector las usa
+  (conteo de referencias de Python).
+
+Ejemplo de uso:
+    cg = GrafoConcurrente(g)
+    # En los hilos lectores
+    r = cg.instantanea().ruta("H1", "C3")
+    # En el hilo que actualiza
+    with cg.escritura() as grafo:
+        grafo.eliminar_arista("A", "B")
+        grafo.insertar_arista("A", "C", 2.0)
+"""
+
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from collections.abc import Mapping
+from contextlib import contextmanager
+from itertools import chain
+import math
+import threading
+import weakref
+
+from grafo import Grafo, Nodo  # type: ignore
+
+_BORRADO = object()  # Marca de clave eliminada en `_Cubetas.con_cambios`
+
+
+# CLASE AUXILIAR: _CUBETAS
+
+class _Cubetas(Mapping):
+    """
+    Diccionario de solo lectura repartido en cubetas por hash de la clave.
+
+    Dos versiones seguidas comparten todas las cubetas que no cambiaron, así
+    publicar k cambios cuesta O(cubetas + k * tamaño de cubeta) en lugar de
+    copiar todo el diccionario.
+    """
+
+    __slots__ = ("_cubetas", "_largo")
+
+    def __init__(self, cubetas: Tuple[dict, ...], largo: int):
+        self._cubetas = cubetas
+        self._largo = largo
+
+    @classmethod
+    def desde(cls, datos: Dict[Any, Any], numero: int) -> "_Cubetas":
+        """Reparte un diccionario en `numero` cubetas."""
+        cubetas = tuple({} for _ in range(numero))
+        for clave, valor in datos.items():
+            cubetas[hash(clave) % numero][clave] = valor
+        return cls(cubetas, len(datos))
+
+    def con_cambios(self, cambios: Dict[Any, Any]) -> "_Cubetas":
+        """
+        Versión nueva con los cambios aplicados (`_BORRADO` elimina la
+        clave). Solo se copian las cubetas tocadas; esta versión no cambia.
+        """
+        numero = len(self._cubetas)
+        cubetas = list(self._cubetas)
+        copiadas = set()
+        largo = self._largo
+        for clave, valor in cambios.items():
+            i = hash(clave) % numero
+            if i not in copiadas:
+                cubetas[i] = dict(cubetas[i])
+                copiadas.add(i)
+            cubeta = cubetas[i]
+            if valor is _BORRADO:
+                if cubeta.pop(clave, _BORRADO) is not _BORRADO:
+                    largo -= 1
+            else:
+                if clave not in cubeta:
+                    largo += 1
+                cubeta[clave] = valor
+        return _Cubetas(tuple(cubetas), largo)
+
+    def __getitem__(self, clave):
+        return self._cubetas[hash(clave) % len(self._cubetas)][clave]
+
+    def get(self, clave, defecto=None):
+        return self._cubetas[hash(clave) % len(self._cubetas)].get(clave, defecto)
+
+    def __contains__(self, clave):
+        return clave in self._cubetas[hash(clave) % len(self._cubetas)]
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._cubetas)
+
+    def __len__(self):
+        return self._largo
+
+    def values(self):
+        return chain.from_iterable(c.values() for c in self._cubetas)
+
+    def items(self):
+        return chain.from_iterable(c.items() for c in self._cubetas)
+
+
+# CLASE: INSTANTANEA
+
+class Instantanea(Grafo):
+    """
+    Versión inmutable de un `Grafo` publicada por `GrafoConcurrente`.
+
+    Ofrece todas las consultas de `Grafo` (`dijkstra`, `ruta`, `bfs`,
+    `k_mas_cercanos`, `rutas_pareto`, `nodo_mas_cercano`, ...) y se puede
+    usar desde cualquier cantidad de hilos a la vez. Los métodos que
+    modifican el grafo lanzan TypeError.
+
+    Cada instantánea arma su propio índice de componentes la primera vez
+    que se llama a `conectados` o `componentes` sobre ella, o tras unas
+    pocas consultas punto a punto (ver `Grafo._desconectados`).
+    """
+
+    def __init__(self, dirigido: bool, version: int, nodos: _Cubetas, ady: _Cubetas,
+                 inversa: Optional[_Cubetas], por_nombre: _Cubetas, por_categoria: _Cubetas):
+        super().__init__(dirigido)
+        self.version = version
+        self.nodos = nodos
+        self.ady = ady
+        # Aristas que llegan a cada nodo como tríos (u, peso, meta); en grafos
+        # no dirigidos son las mismas de `ady`
+        self._inversa = inversa if dirigido else ady
+        self._entrantes = self._posiciones = None  # Reemplazados por `_inversa`
+        self._por_nombre = por_nombre
+        self._por_categoria = por_categoria
+        self._armando = threading.Lock()  # Para armar índices perezosos una sola vez
+
+    def _aristas_entrantes(self, v: str):
+        return iter(self._inversa.get(v, ()))
+
+    # Índices perezosos (varios lectores pueden pedirlos a la vez)
+
+    def _indice_componentes(self):
+        if self._componentes is None:
+            with self._armando:
+                return super()._indice_componentes()
+        return self._componentes
+
+    def _indice_espacial(self):
+        if self._espacial is None:
+            with self._armando:
+                return super()._indice_espacial()
+        return self._espacial
+
+    def _copia_congelada(self):
+        with self._armando:
+            return super()._copia_congelada()
+
+    # Solo lectura
+
+    def _solo_lectura(self, *args, **kwargs):
+        raise TypeError("La instantánea es de solo lectura; usar GrafoConcurrente.escritura()")
+
+    insertar_nodo = eliminar_nodo = _solo_lectura
+    insertar_arista = eliminar_arista = actualizar_pesos = _solo_lectura
+
+
+# CLASE: GRAFOCONCURRENTE
+
+class GrafoConcurrente:
+    """
+    Envuelve un `Grafo` para leerlo desde varios hilos mientras se modifica.
+
+    Después de envolverlo, el grafo original solo se debe modificar dentro
+    de `escritura()` (o con los atajos `insertar_*`, `eliminar_*` y
+    `actualizar_pesos` de esta clase).
+    """
+
+    def __init__(self, grafo: Grafo, cubetas: Optional[int]=None):
+        """
+        Parámetros:
+            grafo (Grafo): Grafo a compartir
+            cubetas (int, opcional): Cubetas de cada versión; por defecto
+                                     ~raíz cuadrada del número de nodos, así
+                                     publicar un cambio copia O(√n) entradas
+
+        Lanza:
+            ValueError: Si el grafo ya está envuelto por otro GrafoConcurrente
+        """
+        if grafo._tocados is not None:
+            raise ValueError("El grafo ya está envuelto por otro GrafoConcurrente")
+        self._grafo = grafo
+        self._numero = cubetas or max(16, math.isqrt(len(grafo.nodos)))
+        self._escritor = threading.Lock()
+        self._vivas: "weakref.WeakSet[Instantanea]" = weakref.WeakSet()
+
+        numero = self._numero
+        inversa = None
+        if grafo.dirigido:
+            inversa = _Cubetas.desde({v: tuple(grafo._aristas_entrantes(v)) for v in grafo.nodos},
+                                     numero)
+        self._actual = self._registrar(Instantanea(
+            grafo.dirigido, grafo.version,
+            _Cubetas.desde(grafo.nodos, numero),
+            _Cubetas.desde({u: tuple(lst) for u, lst in grafo.ady.items()}, numero),
+            inversa,
+            _Cubetas.desde({k: dict(g) for k, g in grafo._por_nombre.items()}, numero),
+            _Cubetas.desde({k: dict(g) for k, g in grafo._por_categoria.items()}, numero)))
+        grafo._tocados = set()
+
+    # Lectores
+
+    def instantanea(self) -> Instantanea:
+        """
+        Última versión publicada del grafo. No bloquea: quien la tiene puede
+        consultarla todo lo que quiera mientras otros escriben.
+        """
+        return self._actual
+
+    @property
+    def version(self) -> int:
+        """Versión del grafo en la última publicación."""
+        return self._actual.version
+
+    def versiones_vivas(self) -> List[int]:
+        """Versiones que todavía tiene algún lector (o la actual)."""
+        return sorted(i.version for i in list(self._vivas))
+
+    # Escritores
+
+    @contextmanager
+    def escritura(self):
+        """
+        Bloque de cambios: entrega el `Grafo` original para modificarlo y al
+        salir publica una sola versión nueva con todos los cambios. Solo
+        un escritor a la vez; los lectores no esperan.
+
+        Si el bloque lanza una excepción, se publica lo que alcanzó a
+        cambiar (la instantánea siempre coincide con el grafo original).
+        """
+        with self._escritor:
+            try:
+                yield self._grafo
+            finally:
+                self._publicar()
+
+    def insertar_nodo(self, nodo: Nodo):
+        """`Grafo.insertar_nodo` y publica."""
+        with self.escritura() as g:
+            g.insertar_nodo(nodo)
+
+    def eliminar_nodo(self, node_id: str):
+        """`Grafo.eliminar_nodo` y publica."""
+        with self.escritura() as g:
+            g.eliminar_nodo(node_id)
+
+    def insertar_arista(self, u: str, v: str, peso: float=1.0, meta=None):
+        """`Grafo.insertar_arista` y publica."""
+        with self.escritura() as g:
+            g.insertar_arista(u, v, peso=peso, meta=meta)
+
+    def eliminar_arista(self, u: str, v: str, eliminar_todas: bool=False):
+        """`Grafo.eliminar_arista` y publica."""
+        with self.escritura() as g:
+            g.eliminar_arista(u, v, eliminar_todas=eliminar_todas)
+
+    def actualizar_pesos(self, lote, todas: bool=False) -> int:
+        """`Grafo.actualizar_pesos` y publica."""
+        with self.escritura() as g:
+            return g.actualizar_pesos(lote, todas=todas)
+
+    def _publicar(self):
+        """Arma la versión nueva copiando solo lo que tocaron los cambios."""
+        g = self._grafo
+        tocados = g._tocados
+        if not tocados and g.version == self._actual.version:
+            return
+        g._tocados = set()
+        anterior = self._actual
+
+        nodos: Dict[str, Any] = {}
+        ady: Dict[str, Any] = {}
+        inversa: Dict[str, Any] = {}
+        claves_nombre, claves_categoria = set(), set()
+        for x in tocados:
+            nodo, viejo = g.nodos.get(x), anterior.nodos.get(x)
+            if nodo is not viejo:
+                for n in (viejo, nodo):
+                    if n is not None:
+                        claves_nombre.add(n.nombre.lower())
+                        claves_categoria.add(n.categoria.lower())
+            if nodo is None:
+                nodos[x] = ady[x] = inversa[x] = _BORRADO
+            else:
+                nodos[x] = nodo
+                ady[x] = tuple(g.ady[x])
+                if g.dirigido:
+                    inversa[x] = tuple(g._aristas_entrantes(x))
+
+        def grupos(indice, claves):
+            return {k: dict(indice[k]) if k in indice else _BORRADO for k in claves}
+
+        self._actual = self._registrar(Instantanea(
+            g.dirigido, g.version,
+            anterior.nodos.con_cambios(nodos),
+            anterior.ady.con_cambios(ady),
+            anterior._inversa.con_cambios(inversa) if g.dirigido else None,
+            anterior._por_nombre.con_cambios(grupos(g._por_nombre, claves_nombre)),
+            anterior._por_categoria.con_cambios(grupos(g._por_categoria, claves_categoria))))
+
+    def _registrar(self, instantanea: Instantanea) -> Instantanea:
+        self._vivas.add(instantanea)
+        return instantanea
@@ -0,0 +1,40 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Datos compartidos por las pruebas de la entrega 3."""
+
+import random
+
+import pytest
+
+from grafo import Grafo, Nodo  # type: ignore
+
+
+@pytest.fixture
+def malla():
+    """
+    Fábrica de mallas lado x lado con coordenadas en `meta` y pesos al azar
+    (siempre mayores o iguales a la distancia en línea recta).
+    """
+    def crear(lado: int=8, dirigido: bool=False, semilla: int=0,
+              categorias=("Calle", "Hotel", "Clinica")) -> Grafo:
+        rnd = random.Random(semilla)
+        g = Grafo(dirigido=dirigido)
+        for f in range(lado):
+            for c in range(lado):
+                g.insertar_nodo(Nodo(f"N{f}_{c}", f"Lugar {f}-{c}", 0.0, rnd.choice(categorias),
+                                     {"lat": 4.6 + f * 0.0009, "lon": -74.1 + c * 0.0009}))
+        for f in range(lado):
+            for c in range(lado):
+                if c + 1 < lado:
+                    g.insertar_arista(f"N{f}_{c}", f"N{f}_{c + 1}", rnd.uniform(0.11, 0.2))
+                if f + 1 < lado:
+                    g.insertar_arista(f"N{f}_{c}", f"N{f + 1}_{c}", rnd.uniform(0.11, 0.2))
+                    if dirigido:
+                        g.insertar_arista(f"N{f + 1}_{c}", f"N{f}_{c}", rnd.uniform(0.11, 0.2))
+        return g
+    return crear
@@ -0,0 +1,377 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Jerarquías de contracción (Contraction Hierarchies) para consultas de rutas.
+
+Idea general:
+1. Preprocesamiento: los nodos se "contraen" uno a uno en un orden de
+   importancia. Al contraer v, si el único camino más corto entre dos
+   vecinos u y w pasa por v, se agrega un atajo u -> w con el peso de
+   u -> v -> w. Cada nodo recibe un rango (su posición en el orden).
+2. Consulta: Dijkstra bidireccional que solo sube de rango (hacia adelante
+   desde el origen y hacia atrás desde el destino). Explora muy pocos nodos.
+3. Desempaque: cada atajo recuerda el nodo contraído que reemplaza, así
+   que el camino se expande recursivamente hasta las aristas originales.
+
+La jerarquía se puede guardar en disco (JSON) y cargarse sin reconstruirla.
+"""
+
+from typing import Dict, List, Tuple
+import heapq
+import json
+
+FORMATO = "smartroute-ch"
+VERSION_FORMATO = 1
+
+# Arista de la jerarquía: destino -> (peso, nodo intermedio o -1 si es original)
+Aristas = Dict[int, Tuple[float, int]]
+
+
+# CLASE: JERARQUIACONTRACCION
+
+class JerarquiaContraccion:
+    """
+    Jerarquía de contracción lista para responder consultas origen -> destino.
+
+    Ejemplo de uso:
+        ch = JerarquiaContraccion.desde_grafo(g)
+        ch.guardar("red.ch.json")
+        ch = JerarquiaContraccion.cargar("red.ch.json")
+        ch.ruta("X", "C1")   # {"camino": [...], "costo": ..., "asentados": ...}
+    """
+
+    def __init__(self, ids: List[str], rango: List[int], subida: List[Aristas],
+                 bajada: List[Aristas], dirigido: bool=False):
+        """
+        Parámetros:
+            ids (list): Ids de los nodos (índice -> id)
+            rango (list): Posición de cada nodo en el orden de contracción
+            subida (list): subida[u] = aristas u -> w con rango[w] > rango[u]
+            bajada (list): bajada[u] = aristas w -> u con rango[w] > rango[u]
+            dirigido (bool): Si el grafo original era dirigido
+        """
+        self.ids = ids
+        self.rango = rango
+        self.subida = subida
+        self.bajada = bajada
+        self.dirigido = dirigido
+        self._indices = {node_id: i for i, node_id in enumerate(ids)}
+
+    # Preprocesamiento
+
+    @classmethod
+    def desde_grafo(cls, grafo, limite_testigo: int=500) -> "JerarquiaContraccion":
+        """
+        Construye la jerarquía contrayendo todos los nodos de un `Grafo`.
+
+        El orden se elige con la "diferencia de aristas" (atajos agregados
+        menos aristas eliminadas), la cantidad de vecinos ya contraídos y el
+        nivel en la jerarquía. La prioridad se estima con búsquedas de testigos
+        cortas y se reevalúa de forma perezosa al sacar cada nodo de la cola.
+
+        Parámetros:
+            grafo (Grafo): Grafo a preprocesar
+            limite_testigo (int): Máximo de nodos asentados en cada búsqueda
+                                  de testigos; limitarla solo puede agregar
+                                  atajos de más, nunca da resultados erróneos
+
+        Retorna:
+            JerarquiaContraccion: Jerarquía lista para consultas
+        """
+        ids = sorted(grafo.nodos)
+        indices = {node_id: i for i, node_id in enumerate(ids)}
+        n = len(ids)
+
+        # Grafo restante: solo la arista más liviana entre cada par
+        salida: List[Aristas] = [{} for _ in range(n)]
+        entrada: List[Aristas] = [{} for _ in range(n)]
+        for u, lst in grafo.ady.items():
+            iu = indices[u]
+            for v, peso, _meta in lst:
+                iv = indices[v]
+                if iu != iv and peso < salida[iu].get(iv, (float('inf'),))[0]:
+                    salida[iu][iv] = (peso, -1)
+                    entrada[iv][iu] = (peso, -1)
+
+        contractor = _Contractor(salida, entrada, limite_testigo)
+        estimador = _Contractor(salida, entrada, min(limite_testigo, 30))
+        rango = [0] * n
+        subida: List[Aristas] = [{} for _ in range(n)]
+        bajada: List[Aristas] = [{} for _ in range(n)]
+        vecinos_contraidos = [0] * n
+        nivel = [0] * n
+
+        def prioridad(v: int, atajos) -> int:
+            return (2 * (len(atajos) - len(salida[v]) - len(entrada[v]))
+                    + vecinos_contraidos[v] + nivel[v])
+
+        heap = [(prioridad(v, estimador.atajos(v)), v) for v in range(n)]
+        heapq.heapify(heap)
+        siguiente = 0
+
+        while heap:
+            _p, v = heapq.heappop(heap)
+            p = prioridad(v, estimador.atajos(v))
+            # Reevaluación perezosa: si empeoró, devolverlo a la cola
+            if heap and p > heap[0][0]:
+                heapq.heappush(heap, (p, v))
+                continue
+            atajos = contractor.atajos(v)
+
+            rango[v] = siguiente
+            siguiente += 1
+            subida[v] = salida[v]
+            bajada[v] = entrada[v]
+
+            for u, w, peso in atajos:
+                if peso < salida[u].get(w, (float('inf'),))[0]:
+                    salida[u][w] = (peso, v)
+                    entrada[w][u] = (peso, v)
+
+            # Sacar v del grafo restante
+            for w in subida[v]:
+                del entrada[w][v]
+                vecinos_contraidos[w] += 1
+                nivel[w] = max(nivel[w], nivel[v] + 1)
+            for u in bajada[v]:
+                del salida[u][v]
+                vecinos_contraidos[u] += 1
+                nivel[u] = max(nivel[u], nivel[v] + 1)
+            salida[v] = {}
+            entrada[v] = {}
+
+        return cls(ids, rango, subida, bajada, grafo.dirigido)
+
+    # Consultas
+
+    def _indice(self, node_id: str, mensaje: str) -> int:
+        try:
+            return self._indices[node_id]
+        except KeyError:
+            raise KeyError(mensaje)
+
+    def _buscar(self, s: int, t: int):
+        """
+        Búsqueda bidireccional ascendente.
+
+        Retorna:
+            tuple: (distancia, nodo de encuentro o -1, prev adelante,
+                    prev atrás, nodos asentados)
+        """
+        dist = ({s: 0.0}, {t: 0.0})
+        prev: Tuple[Dict[int, int], Dict[int, int]] = ({s: -1}, {t: -1})
+        heaps = ([(0.0, s)], [(0.0, t)])
+        aristas = (self.subida, self.bajada)
+        mejor = 0.0 if s == t else float('inf')
+        encuentro = s if s == t else -1
+        asentados = 0
+
+        while True:
+            # Cada lado termina cuando su mínimo ya no puede mejorar el resultado
+            activos = [lado for lado in (0, 1) if heaps[lado] and heaps[lado][0][0] < mejor]
+            if not activos:
+                break
+            lado = min(activos, key=lambda x: heaps[x][0][0])
+            d, u = heapq.heappop(heaps[lado])
+            dist_lado, dist_otro = dist[lado], dist[1 - lado]
+            if d > dist_lado[u]:
+                continue
+            asentados += 1
+            if u in dist_otro and d + dist_otro[u] < mejor:
+                mejor = d + dist_otro[u]
+                encuentro = u
+
+            for w, (peso, _medio) in aristas[lado][u].items():
+                nd = d + peso
+                if nd < dist_lado.get(w, float('inf')):
+                    dist_lado[w] = nd
+                    prev[lado][w] = u
+                    heapq.heappush(heaps[lado], (nd, w))
+                    if w in dist_otro and nd + dist_otro[w] < mejor:
+                        mejor = nd + dist_otro[w]
+                        encuentro = w
+
+        return mejor, encuentro, prev[0], prev[1], asentados
+
+    def _arista(self, a: int, b: int) -> Tuple[float, int]:
+        """(peso, intermedio) de la arista a -> b de la jerarquía."""
+        if self.rango[a] < self.rango[b]:
+            return self.subida[a][b]
+        return self.bajada[b][a]
+
+    def _desempacar(self, a: int, b: int, camino: List[int], pesos: List[float]):
+        """Agrega a `camino` las aristas originales que forman a -> b."""
+        pila = [(a, b)]
+        while pila:
+            x, y = pila.pop()
+            peso, medio = self._arista(x, y)
+            if medio < 0:
+                camino.append(y)
+                pesos.append(peso)
+            else:
+                pila.append((medio, y))
+                pila.append((x, medio))
+
+    def distancia(self, origen: str, destino: str) -> float:
+        """
+        Distancia más corta entre dos nodos (inf si no hay camino).
+
+        Lanza:
+            KeyError: Si el origen o el destino no existen
+        """
+        return self.ruta(origen, destino)["costo"]
+
+    def ruta(self, origen: str, destino: str):
+        """
+        Camino más corto con el mismo formato de salida que `Grafo.ruta`.
+
+        El costo se suma arista por arista en el orden del camino, igual que
+        lo hace `Grafo.dijkstra`, así que coincide con el de `dijkstra`
+        (salvo el último decimal por redondeo cuando varios caminos empatan).
+        Con empates, el camino puede ser otro de los igual de cortos y no el
+        que da `dijkstra` + `reconstruir_camino`: la jerarquía elige entre
+        atajos, no entre los predecesores que asienta Dijkstra.
+
+        Retorna:
+            dict: {"camino": lista de ids (vacía si no hay ruta),
+                   "costo": distancia total (inf si no hay ruta),
+                   "asentados": nodos asentados durante la consulta}
+
+        Lanza:
+            KeyError: Si el origen o el destino no existen
+        """
+        s = self._indice(origen, "Nodo inicio no existe")
+        t = self._indice(destino, "Nodo destino no existe")
+        _dist, encuentro, prev_adelante, prev_atras, asentados = self._buscar(s, t)
+        if encuentro < 0:
+            return {"camino": [], "costo": float('inf'), "asentados": asentados}
+
+        # Secuencia de aristas de la jerarquía: s ... encuentro ... t
+        subiendo = []
+        u = encuentro
+        while u != -1:
+            subiendo.append(u)
+            u = prev_adelante[u]
+        subiendo.reverse()
+        u = prev_atras[encuentro]
+        while u != -1:
+            subiendo.append(u)
+            u = prev_atras[u]
+
+        camino, pesos = [s], []
+        for a, b in zip(subiendo, subiendo[1:]):
+            self._desempacar(a, b, camino, pesos)
+
+        costo = 0.0
+        for peso in pesos:
+            costo = costo + peso
+        return {"camino": [self.ids[i] for i in camino], "costo": costo,
+                "asentados": asentados}
+
+    # Persistencia
+
+    def guardar(self, ruta_archivo: str):
+        """
+        Guarda la jerarquía en un archivo JSON versionado.
+
+        Las aristas de cada nodo se guardan aplanadas como
+        [destino, peso, intermedio, destino, peso, intermedio, ...].
+        """
+        def aplanar(aristas: List[Aristas]):
+            return [[x for w, (peso, medio) in a.items() for x in (w, peso, medio)]
+                    for a in aristas]
+
+        datos = {
+            "formato": FORMATO,
+            "version": VERSION_FORMATO,
+            "dirigido": self.dirigido,
+            "ids": self.ids,
+            "rango": self.rango,
+            "subida": aplanar(self.subida),
+            "bajada": aplanar(self.bajada),
+        }
+        with open(ruta_archivo, "w", encoding="utf-8") as f:
+            json.dump(datos, f, separators=(",", ":"))
+
+    @classmethod
+    def cargar(cls, ruta_archivo: str) -> "JerarquiaContraccion":
+        """
+        Carga una jerarquía guardada con `guardar`.
+
+        Lanza:
+            ValueError: Si el archivo no es una jerarquía o su versión no es compatible
+        """
+        with open(ruta_archivo, encoding="utf-8") as f:
+            datos = json.load(f)
+        if datos.get("formato") != FORMATO or datos.get("version") != VERSION_FORMATO:
+            raise ValueError(f"{ruta_archivo} no es una jerarquía de contracción compatible")
+
+        def expandir(listas) -> List[Aristas]:
+            return [{plano[i]: (plano[i + 1], plano[i + 2]) for i in range(0, len(plano), 3)}
+                    for plano in listas]
+
+        return cls(datos["ids"], datos["rango"], expandir(datos["subida"]),
+                   expandir(datos["bajada"]), datos["dirigido"])
+
+
+# CLASE AUXILIAR: _CONTRACTOR
+
+class _Contractor:
+    """Calcula los atajos necesarios al contraer un nodo (búsqueda de testigos)."""
+
+    def __init__(self, salida: List[Aristas], entrada: List[Aristas], limite: int):
+        self.salida = salida
+        self.entrada = entrada
+        self.limite = limite
+
+    def atajos(self, v: int) -> List[Tuple[int, int, float]]:
+        """
+        Lista de atajos (u, w, peso) que requiere contraer v.
+
+        Para cada vecino entrante u se buscan caminos u -> w que no pasen
+        por v ("testigos"); si ninguno es tan corto como u -> v -> w hace
+        falta el atajo.
+        """
+        resultado = []
+        for u, (peso_uv, _m) in self.entrada[v].items():
+            objetivos = {w: peso_uv + peso_vw
+                         for w, (peso_vw, _m2) in self.salida[v].items() if w != u}
+            if not objetivos:
+                continue
+            dist = self._testigos(u, v, objetivos, max(objetivos.values()))
+            for w, peso in objetivos.items():
+                if dist.get(w, float('inf')) > peso:
+                    resultado.append((u, w, peso))
+        return resultado
+
+    def _testigos(self, u: int, excluido: int, objetivos: Dict[int, float],
+                  maximo: float) -> Dict[int, float]:
+        """Dijkstra limitado desde u que ignora el nodo `excluido`."""
+        dist = {u: 0.0}
+        heap = [(0.0, u)]
+        pendientes = len(objetivos)
+        asentados = 0
+        salida = self.salida
+        infinito = float('inf')
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        while heap and pendientes and asentados < self.limite:
+            d, x = heappop(heap)
+            if d > dist[x]:
+                continue
+            if d > maximo:
+                break
+            asentados += 1
+            if x in objetivos:
+                pendientes -= 1
+            for y, (peso, _m) in salida[x].items():
+                nd = d + peso
+                if nd <= maximo and nd < dist.get(y, infinito) and y != excluido:
+                    dist[y] = nd
+                    heappush(heap, (nd, y))
+        return dist
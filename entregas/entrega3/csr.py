@@ -0,0 +1,876 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Representación compacta (CSR) de un grafo para consultas de solo lectura.
+
+CSR (Compressed Sparse Row) guarda todas las aristas en arreglos contiguos:
+- offsets[i] .. offsets[i+1] delimita las aristas que salen del nodo i
+- destinos[e] es el índice del nodo destino de la arista e
+- pesos[e] es el peso de la arista e
+
+Los ids de texto se internan una sola vez en enteros (tabla id <-> índice),
+así los algoritmos trabajan sobre enteros y arreglos de `array` en lugar de
+diccionarios de listas de tuplas. Los metadatos de las aristas se guardan
+aparte y solo para las aristas que los tienen.
+
+Los índices se asignan en orden alfabético de id para que el desempate del
+heap en Dijkstra sea el mismo que en `Grafo` y los resultados coincidan.
+
+El grafo se puede guardar en un archivo binario versionado (`guardar`) y
+abrirse con `mmap` (`abrir`): los arreglos se leen directamente del archivo
+mapeado sin copiarlos, así varios procesos comparten una sola copia física
+de la red y pueden empezar a responder consultas en milisegundos.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from array import array
+from collections import deque
+import heapq
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import tempfile
+import threading
+
+try:
+    import numpy as np  # Opcional: vistas vectorizadas y actualización de pesos por lotes
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+
+# Formato binario (little-endian). Encabezado de 128 bytes:
+#   magic (8s) | versión (I) | banderas (I) | n nodos (Q) | m aristas (Q) |
+#   6 pares (inicio, largo) (12Q) de las secciones, cada una alineada a 8 bytes:
+#   posiciones de ids ('q', n+1) | bytes utf-8 de los ids | offsets ('q', n+1) |
+#   destinos ('i', m) | pesos ('d', m) | metadatos (JSON, opcional)
+MAGIC = b"SRGRAFO\0"
+VERSION_BINARIO = 1
+_ENCABEZADO = struct.Struct("<8sIIQQ12Q")
+_TAMANO_ENCABEZADO = 128
+_DIRIGIDO = 1
+
+
+# CLASE: GRAFOCSR
+
+class GrafoCSR:
+    """
+    Versión congelada de un `Grafo` almacenada en formato CSR.
+
+    Ofrece `bfs`, `dfs`, `dijkstra` y `reconstruir_camino` con la misma
+    interfaz y los mismos resultados que `Grafo`, pero usando mucha menos
+    memoria y accesos contiguos a memoria. Los nodos y las aristas no
+    cambian; solo los pesos se pueden actualizar (`actualizar_pesos`).
+
+    Ejemplo de uso:
+        csr = GrafoCSR.desde_grafo(g)   # o g.congelar()
+        dist, prev = csr.dijkstra("X")
+    """
+
+    def __init__(self, ids, offsets, destinos, pesos,
+                 meta_aristas: Optional[Dict[int, Dict[str, Any]]]=None,
+                 nodos: Optional[List[Any]]=None, dirigido: bool=False):
+        """
+        Construye el grafo a partir de arreglos ya preparados.
+
+        Parámetros:
+            ids (list): Ids de los nodos ordenados alfabéticamente (índice -> id)
+            offsets (array 'q'): n+1 posiciones de inicio de cada nodo en `destinos`
+            destinos (array 'i'): Índice del nodo destino de cada arista
+            pesos (array 'd'): Peso de cada arista
+            meta_aristas (dict, opcional): {índice_arista: metadatos} solo para
+                                           aristas con metadatos no vacíos
+            nodos (list, opcional): Objetos Nodo alineados con `ids`
+            dirigido (bool): Si el grafo original era dirigido
+        """
+        self.ids = ids
+        self.offsets = offsets
+        self.destinos = destinos
+        self.pesos = pesos
+        self._meta_aristas = meta_aristas or {}
+        self._nodos = nodos
+        self.dirigido = dirigido
+        self._indices: Optional[Dict[str, int]] = None  # id -> índice (perezoso)
+        self._metadatos_pendientes = None  # Sección JSON sin leer (archivos abiertos)
+        self._buffer = None  # mmap o bytes del archivo del que se abrió
+        self._claves = None  # (claves origen*n+destino ordenadas, orden) para ubicar aristas
+        self.version = 0  # Sube con cada lote de `actualizar_pesos`
+        # Archivo temporal que abren los procesos de `matriz_distancias`:
+        # (versión de los pesos, ruta), en la carpeta `_carpeta`
+        self._compartido: Optional[Tuple[int, str]] = None
+        self._carpeta: Optional[tempfile.TemporaryDirectory] = None
+
+    @classmethod
+    def desde_grafo(cls, grafo) -> "GrafoCSR":
+        """
+        Construye la representación CSR a partir de un `Grafo`.
+
+        Parámetros:
+            grafo (Grafo): Grafo con diccionarios de adyacencia
+
+        Retorna:
+            GrafoCSR: Copia compacta e inmutable del grafo
+        """
+        ids = sorted(grafo.nodos)
+        if len(ids) >= 2 ** 31:
+            raise ValueError("Demasiados nodos para índices de 32 bits")
+        indices = {node_id: i for i, node_id in enumerate(ids)}
+
+        offsets = array('q', [0]) * (len(ids) + 1)
+        destinos = array('i')
+        pesos = array('d')
+        meta_aristas: Dict[int, Dict[str, Any]] = {}
+
+        for i, node_id in enumerate(ids):
+            for v, peso, meta in grafo.ady.get(node_id, []):
+                if meta:
+                    meta_aristas[len(destinos)] = meta
+                destinos.append(indices[v])
+                pesos.append(peso)
+            offsets[i + 1] = len(destinos)
+
+        csr = cls(ids, offsets, destinos, pesos, meta_aristas,
+                  [grafo.nodos[node_id] for node_id in ids], grafo.dirigido)
+        csr._indices = indices
+        return csr
+
+    # Metadatos
+
+    @property
+    def meta_aristas(self) -> Dict[int, Dict[str, Any]]:
+        """{índice_arista: metadatos} de las aristas que tienen metadatos."""
+        if self._metadatos_pendientes is not None:
+            self._cargar_metadatos()
+        return self._meta_aristas
+
+    @property
+    def nodos(self) -> Optional[List[Any]]:
+        """Objetos Nodo alineados con `ids` (None si no se guardaron)."""
+        if self._metadatos_pendientes is not None:
+            self._cargar_metadatos()
+        return self._nodos
+
+    def _cargar_metadatos(self):
+        """Lee la sección JSON de un archivo abierto solo cuando se necesita."""
+        from grafo import Nodo  # type: ignore
+
+        datos = json.loads(bytes(self._metadatos_pendientes).decode("utf-8"))
+        self._metadatos_pendientes = None
+        self._meta_aristas = {int(e): meta for e, meta in datos["aristas"].items()}
+        if datos["nodos"] is not None:
+            self._nodos = [Nodo(node_id, nombre, distancia, categoria, meta)
+                           for node_id, (nombre, distancia, categoria, meta)
+                           in zip(self.ids, datos["nodos"])]
+
+    # Tabla de ids
+
+    def __len__(self):
+        """Número de nodos del grafo."""
+        return len(self.ids)
+
+    def num_aristas(self) -> int:
+        """Número de aristas dirigidas almacenadas."""
+        return len(self.destinos)
+
+    def indice(self, node_id: str) -> int:
+        """
+        Convierte un id de nodo en su índice entero.
+
+        Lanza:
+            KeyError: Si el nodo no existe
+        """
+        if self._indices is None:
+            if isinstance(self.ids, _TablaIds):
+                return self.ids.indice(node_id)  # Búsqueda binaria sin decodificar todo
+            self._indices = {node_id: i for i, node_id in enumerate(self.ids)}
+        return self._indices[node_id]
+
+    def vecinos(self, i: int):
+        """
+        Retorna los pares (destino, peso) de las aristas que salen del índice i.
+        """
+        inicio, fin = self.offsets[i], self.offsets[i + 1]
+        return zip(self.destinos[inicio:fin], self.pesos[inicio:fin])
+
+    def meta_arista(self, e: int) -> Dict[str, Any]:
+        """Metadatos de la arista con índice e (dict vacío si no tiene)."""
+        return self.meta_aristas.get(e, {})
+
+    def invertido(self) -> "GrafoCSR":
+        """
+        Copia con todas las aristas invertidas (u -> v pasa a ser v -> u),
+        para búsquedas hacia atrás. Se arma en O(n + m) contando grados.
+
+        Retorna:
+            GrafoCSR: Grafo dirigido con los mismos ids y sin metadatos
+        """
+        n, m = len(self.ids), len(self.destinos)
+        offsets = array('q', [0]) * (n + 1)
+        for v in self.destinos:
+            offsets[v + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        cursor = offsets[:-1]
+        destinos = array('i', [0]) * m
+        pesos = array('d', [0.0]) * m
+        for u in range(n):
+            for e in range(self.offsets[u], self.offsets[u + 1]):
+                v = self.destinos[e]
+                p = cursor[v]
+                cursor[v] = p + 1
+                destinos[p] = u
+                pesos[p] = self.pesos[e]
+        inverso = GrafoCSR(self.ids, offsets, destinos, pesos, dirigido=True)
+        inverso._indices = self._indices
+        return inverso
+
+    def como_numpy(self):
+        """
+        Expone offsets, destinos y pesos como arreglos de NumPy sin copiar.
+
+        Retorna:
+            tuple: (offsets, destinos, pesos) como numpy.ndarray
+
+        Lanza:
+            ImportError: Si NumPy no está instalado
+        """
+        if np is None:
+            raise ImportError("NumPy no está instalado")
+        return (np.frombuffer(self.offsets, dtype=np.int64),
+                np.frombuffer(self.destinos, dtype=np.int32),
+                np.frombuffer(self.pesos, dtype=np.float64))
+
+    # Actualización de pesos
+
+    def actualizar_pesos(self, lote, todas: bool=False) -> int:
+        """
+        Cambia en el lugar el peso de varias aristas existentes.
+
+        Parámetros:
+            lote (iterable): Tríos (u, v, nuevo_peso) con ids de nodos
+            todas (bool): Si True, cambia todas las aristas paralelas u->v
+                          Si False, solo la primera
+
+        Retorna:
+            int: Número de aristas dirigidas actualizadas
+
+        Lanza:
+            KeyError: Si algún nodo o alguna arista u->v no existe
+        """
+        origenes, destinos, pesos = [], [], []
+        for u, v, peso in lote:
+            origenes.append(self.indice(u))
+            destinos.append(self.indice(v))
+            pesos.append(peso)
+        return self.actualizar_pesos_indices(origenes, destinos, pesos, todas)
+
+    def actualizar_pesos_indices(self, origenes, destinos, pesos, todas: bool=False) -> int:
+        """
+        Igual que `actualizar_pesos`, pero con índices de nodos en arreglos
+        paralelos (listas o arreglos de NumPy).
+
+        Con NumPy todo el lote se resuelve con operaciones vectorizadas: las
+        aristas se ubican con búsqueda binaria sobre las claves
+        origen*n+destino (ordenadas una sola vez y reutilizadas) y los pesos
+        se escriben con una sola asignación. Sin NumPy se recorre la fila de
+        cada arista. El lote es atómico: si alguna arista no existe no se
+        cambia nada. Si un par se repite, queda el último peso; en grafos no
+        dirigidos también se actualiza v -> u.
+
+        En un grafo abierto desde archivo los pesos son de solo lectura: la
+        primera actualización los copia a memoria propia (offsets y destinos
+        se siguen leyendo del archivo).
+
+        Lanza:
+            KeyError: Si algún índice o alguna arista no existe
+            ValueError: Si los arreglos no tienen el mismo largo
+        """
+        if not len(origenes) == len(destinos) == len(pesos):
+            raise ValueError("origenes, destinos y pesos deben tener el mismo largo")
+        if not len(origenes):
+            return 0
+        if np is not None:
+            posiciones, valores = self._ubicar_numpy(origenes, destinos, pesos, todas)
+        else:
+            posiciones, valores = self._ubicar(origenes, destinos, pesos, todas)
+
+        if isinstance(self.pesos, memoryview) and self.pesos.readonly:
+            self.pesos = array('d', self.pesos)
+        if np is not None:
+            np.frombuffer(self.pesos, dtype=np.float64)[posiciones] = valores
+        else:
+            for e, peso in zip(posiciones, valores):
+                self.pesos[e] = peso
+        self.version += 1
+        return len(posiciones)
+
+    def _ubicar_numpy(self, origenes, destinos, pesos, todas: bool):
+        """Posiciones de las aristas del lote y el peso nuevo de cada una (NumPy)."""
+        n = len(self.ids)
+        s = np.asarray(origenes, dtype=np.int64)
+        t = np.asarray(destinos, dtype=np.int64)
+        w = np.asarray(pesos, dtype=np.float64)
+        if s.min() < 0 or t.min() < 0 or s.max() >= n or t.max() >= n:
+            raise KeyError("Índice de nodo fuera de rango")
+        if not self.dirigido:
+            # Intercalar (u, v), (v, u) para respetar el orden del lote
+            s, t = np.stack([s, t], axis=1).ravel(), np.stack([t, s], axis=1).ravel()
+            w = np.repeat(w, 2)
+
+        # Quedarse con la última actualización de cada par
+        consulta = s * n + t
+        _, ultimo = np.unique(consulta[::-1], return_index=True)
+        elegidos = len(consulta) - 1 - ultimo
+        consulta, w = consulta[elegidos], w[elegidos]
+
+        if self._claves is None:
+            offsets, destinos_np, _ = self.como_numpy()
+            filas = np.repeat(np.arange(n, dtype=np.int64), np.diff(offsets))
+            claves = filas * n + destinos_np
+            orden = np.argsort(claves, kind="stable")  # Estable: la primera paralela va primero
+            self._claves = (claves[orden], orden)
+        claves, orden = self._claves
+
+        izq = np.searchsorted(claves, consulta, side="left")
+        if not todas:
+            encontradas = izq < len(claves)
+            encontradas[encontradas] = claves[izq[encontradas]] == consulta[encontradas]
+            if not encontradas.all():
+                self._arista_faltante(int(consulta[~encontradas][0]))
+            return orden[izq], w
+        der = np.searchsorted(claves, consulta, side="right")
+        cuantas = der - izq
+        if not cuantas.all():
+            self._arista_faltante(int(consulta[cuantas == 0][0]))
+        # Todas las posiciones izq..der-1 de cada consulta, una detrás de otra
+        saltos = np.repeat(np.cumsum(cuantas) - cuantas - izq, cuantas)
+        return orden[np.arange(int(cuantas.sum())) - saltos], np.repeat(w, cuantas)
+
+    def _ubicar(self, origenes, destinos, pesos, todas: bool):
+        """Posiciones de las aristas del lote y el peso nuevo de cada una."""
+        n = len(self.ids)
+        cambios: Dict[Tuple[int, int], float] = {}
+        for a, b, peso in zip(origenes, destinos, pesos):
+            if not (0 <= a < n and 0 <= b < n):
+                raise KeyError("Índice de nodo fuera de rango")
+            cambios[(a, b)] = peso
+            if not self.dirigido:
+                cambios[(b, a)] = peso
+
+        posiciones, valores = [], []
+        offsets, destinos_csr = self.offsets, self.destinos
+        for (a, b), peso in cambios.items():
+            aristas = [e for e in range(offsets[a], offsets[a + 1]) if destinos_csr[e] == b]
+            if not aristas:
+                self._arista_faltante(a * n + b)
+            for e in (aristas if todas else aristas[:1]):
+                posiciones.append(e)
+                valores.append(peso)
+        return posiciones, valores
+
+    def _arista_faltante(self, clave: int):
+        """Lanza KeyError para la arista con clave origen*n+destino."""
+        a, b = divmod(clave, len(self.ids))
+        raise KeyError(f"No existe la arista {self.ids[a]} -> {self.ids[b]}")
+
+    def _indice_inicio(self, inicio_id: str) -> int:
+        """Índice de un nodo de inicio; KeyError con el mensaje de `Grafo`."""
+        try:
+            return self.indice(inicio_id)
+        except KeyError:
+            raise KeyError("Nodo inicio no existe")
+
+    # Recorridos
+
+    def bfs(self, inicio_id: str):
+        """
+        Búsqueda por Amplitud; mismo orden de visita que `Grafo.bfs`.
+
+        Retorna:
+            list: Ids de los nodos en el orden visitado
+        """
+        s = self._indice_inicio(inicio_id)
+        offsets, destinos = self.offsets, self.destinos
+        visitados = bytearray(len(self.ids))
+        visitados[s] = 1
+        cola = deque([s])
+        orden = []
+
+        while cola:
+            u = cola.popleft()
+            orden.append(u)
+            for e in range(offsets[u], offsets[u + 1]):
+                v = destinos[e]
+                if not visitados[v]:
+                    visitados[v] = 1
+                    cola.append(v)
+
+        return [self.ids[i] for i in orden]
+
+    def dfs(self, inicio_id: str):
+        """
+        Búsqueda por Profundidad iterativa; mismo orden que `Grafo.dfs`.
+
+        Usa una pila explícita de (nodo, próxima arista) para no depender
+        del límite de recursión de Python.
+
+        Retorna:
+            list: Ids de los nodos en el orden visitado
+        """
+        s = self._indice_inicio(inicio_id)
+        offsets, destinos = self.offsets, self.destinos
+        visitados = bytearray(len(self.ids))
+        visitados[s] = 1
+        orden = [s]
+        pila = [(s, offsets[s])]
+
+        while pila:
+            u, e = pila[-1]
+            fin = offsets[u + 1]
+            # Avanzar hasta el próximo vecino no visitado
+            while e < fin and visitados[destinos[e]]:
+                e += 1
+            if e == fin:
+                pila.pop()
+                continue
+            pila[-1] = (u, e + 1)
+            v = destinos[e]
+            visitados[v] = 1
+            orden.append(v)
+            pila.append((v, offsets[v]))
+
+        return [self.ids[i] for i in orden]
+
+    # Caminos más cortos
+
+    def dijkstra_indices(self, s: int, t: int=-1) -> Tuple[List[float], List[int]]:
+        """
+        Dijkstra sobre índices enteros (sin convertir a ids).
+
+        Parámetros:
+            s (int): Índice del nodo inicial
+            t (int): Índice del objetivo; -1 para calcular todo el grafo
+
+        Retorna:
+            tuple: (dist, prev) como listas indexadas por nodo; prev usa -1
+                   para "sin predecesor"
+        """
+        offsets, destinos, pesos = self.offsets, self.destinos, self.pesos
+        dist = [float('inf')] * len(self.ids)
+        prev = [-1] * len(self.ids)
+        dist[s] = 0.0
+        heap = [(0.0, s)]
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if u == t:
+                break
+            for e in range(offsets[u], offsets[u + 1]):
+                v = destinos[e]
+                nd = d + pesos[e]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        return dist, prev
+
+    def dijkstra(self, inicio_id: str, objetivo_id=None):
+        """
+        Algoritmo de Dijkstra con la misma interfaz que `Grafo.dijkstra`.
+
+        Retorna:
+            tuple: (distancias, predecesores) como diccionarios por id
+        """
+        s = self._indice_inicio(inicio_id)
+        t = self.indice(objetivo_id) if objetivo_id is not None else -1
+        dist, prev = self.dijkstra_indices(s, t)
+        ids = self.ids
+        return (dict(zip(ids, dist)),
+                {ids[i]: (ids[p] if p >= 0 else None) for i, p in enumerate(prev)})
+
+    def _dijkstra_objetivos(self, s: int, objetivos: List[int]) -> Tuple[List[float], List[int]]:
+        """
+        Dijkstra desde s que se detiene apenas asienta todos los `objetivos`.
+
+        Retorna:
+            tuple: (dist, prev) como en `dijkstra_indices`; solo las
+                   entradas de los objetivos quedan garantizadas
+        """
+        offsets, destinos, pesos = self.offsets, self.destinos, self.pesos
+        dist = [float('inf')] * len(self.ids)
+        prev = [-1] * len(self.ids)
+        dist[s] = 0.0
+        pendientes = set(objetivos)
+        heap = [(0.0, s)]
+
+        while heap and pendientes:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            pendientes.discard(u)
+            for e in range(offsets[u], offsets[u + 1]):
+                v = destinos[e]
+                nd = d + pesos[e]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        return dist, prev
+
+    def _fila(self, s: int, objetivos: List[int]) -> array:
+        """Distancias desde s a cada índice de `objetivos` (array 'd')."""
+        dist, _prev = self._dijkstra_objetivos(s, objetivos)
+        return array('d', [dist[t] for t in objetivos])
+
+    def caminos_desde(self, s: int, objetivos: List[int]) -> Dict[int, Tuple[List[str], float]]:
+        """
+        Caminos más cortos desde el índice s hasta varios objetivos con una
+        sola búsqueda, que se detiene al asentarlos todos.
+
+        Parámetros:
+            s (int): Índice del nodo inicial
+            objetivos (list): Índices de los nodos de llegada
+
+        Retorna:
+            dict: {índice objetivo: (camino como lista de ids, costo)}; camino
+                  vacío y costo inf si no hay ruta
+        """
+        dist, prev = self._dijkstra_objetivos(s, objetivos)
+        resultados = {}
+        for t in objetivos:
+            camino = []
+            if dist[t] < float('inf'):
+                u = t
+                while u >= 0:
+                    camino.append(self.ids[u])
+                    u = prev[u]
+                camino.reverse()
+            resultados[t] = (camino, dist[t])
+        return resultados
+
+    def matriz_distancias(self, origenes, destinos, workers: Optional[int]=None,
+                          pool=None) -> List[array]:
+        """
+        Matriz de distancias mínimas origen x destino.
+
+        Con más de un proceso, el grafo se guarda en un archivo binario
+        temporal que cada proceso abre con mmap: todos comparten la misma
+        copia de solo lectura y a cada tarea solo se le envían índices.
+        Cada proceso responde un bloque de orígenes. El archivo se guarda
+        una sola vez y se reutiliza en las llamadas siguientes mientras los
+        pesos no cambien (`version`).
+
+        Parámetros:
+            origenes (iterable): Ids de los nodos de origen (filas)
+            destinos (iterable): Ids de los nodos de destino (columnas)
+            workers (int, opcional): Procesos a usar; por defecto uno por
+                                     núcleo, 1 para calcular sin procesos
+            pool (multiprocessing.Pool, opcional): Procesos ya arrancados
+                para reutilizar entre llamadas (los cierra quien los creó);
+                sin él, cada llamada arranca y cierra los suyos
+
+        Retorna:
+            list: Una fila `array('d')` por origen, con la distancia a cada
+                  destino en el mismo orden (inf si no hay camino)
+
+        Lanza:
+            KeyError: Si algún origen o destino no existe
+        """
+        filas = [self._indice_inicio(o) for o in origenes]
+        try:
+            columnas = [self.indice(d) for d in destinos]
+        except KeyError:
+            raise KeyError("Nodo destino no existe")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(filas))
+        if workers <= 1 and pool is None:
+            return [self._fila(s, columnas) for s in filas]
+
+        # Bloques de orígenes: varios por proceso para repartir bien la carga
+        tamano = max(1, -(-len(filas) // (max(workers, 1) * 4)))
+        ruta = self._archivo_compartido()
+        tareas = [(ruta, columnas, filas[i:i + tamano]) for i in range(0, len(filas), tamano)]
+        if pool is not None:
+            resultados = pool.map(_filas_trabajador, tareas)
+        else:
+            with multiprocessing.Pool(workers) as propio:
+                resultados = propio.map(_filas_trabajador, tareas)
+        return [fila for bloque in resultados for fila in bloque]
+
+    def _archivo_compartido(self) -> str:
+        """Guarda el archivo para los procesos si no existe para esta `version`."""
+        with _guardando:
+            if self._compartido is None or self._compartido[0] != self.version:
+                if self._carpeta is None:
+                    self._carpeta = tempfile.TemporaryDirectory()
+                ruta = os.path.join(self._carpeta.name, f"grafo-{self.version}.srg")
+                self.guardar(ruta, metadatos=False)
+                if self._compartido is not None:
+                    os.remove(self._compartido[1])  # Los procesos que lo abrieron siguen con su mmap
+                self._compartido = (self.version, ruta)
+            return self._compartido[1]
+
+    def reconstruir_camino(self, prev, objetivo_id):
+        """
+        Reconstruye el camino óptimo usando los predecesores de Dijkstra.
+
+        Retorna:
+            list: Secuencia de nodos desde el origen hasta el objetivo
+        """
+        camino = []
+        u = objetivo_id
+        while u is not None:
+            camino.append(u)
+            u = prev[u]
+        camino.reverse()
+        return camino
+
+    # Persistencia
+
+    def guardar(self, ruta: str, metadatos: bool=True):
+        """
+        Guarda el grafo en el formato binario versionado (ver `MAGIC`).
+
+        Parámetros:
+            ruta (str): Archivo de destino
+            metadatos (bool): Si se incluyen los datos de los nodos y los
+                              metadatos de las aristas (deben ser serializables
+                              en JSON)
+        """
+        codificados = [node_id.encode("utf-8") for node_id in self.ids]
+        posiciones_ids = array('q', [0])
+        acumulado = 0
+        for b in codificados:
+            acumulado += len(b)
+            posiciones_ids.append(acumulado)
+
+        seccion_meta = b""
+        if metadatos:
+            nodos = self.nodos
+            seccion_meta = json.dumps({
+                "nodos": None if nodos is None else
+                         [[n.nombre, n.distancia_km, n.categoria, dict(n.metadatos())] for n in nodos],
+                "aristas": {str(e): dict(meta) for e, meta in self.meta_aristas.items()},
+            }, separators=(",", ":")).encode("utf-8")
+
+        secciones = [_bytes_le(posiciones_ids), b"".join(codificados), _bytes_le(self.offsets),
+                     _bytes_le(self.destinos), _bytes_le(self.pesos), seccion_meta]
+        ubicaciones = []
+        inicio = _TAMANO_ENCABEZADO
+        for datos in secciones:
+            ubicaciones += [inicio, len(datos)]
+            inicio = _alinear(inicio + len(datos))
+
+        with open(ruta, "wb") as f:
+            encabezado = _ENCABEZADO.pack(MAGIC, VERSION_BINARIO, _DIRIGIDO if self.dirigido else 0,
+                                          len(self.ids), len(self.destinos), *ubicaciones)
+            f.write(encabezado.ljust(_TAMANO_ENCABEZADO, b"\0"))
+            for datos in secciones:
+                f.write(datos)
+                f.write(b"\0" * (_alinear(f.tell()) - f.tell()))
+
+    @classmethod
+    def abrir(cls, ruta: str, usar_mmap: bool=True) -> "GrafoCSR":
+        """
+        Abre un grafo guardado con `guardar`.
+
+        Con `usar_mmap=True` el archivo se mapea en memoria en modo solo
+        lectura y los arreglos son vistas sobre el mapa (sin copiar): el
+        sistema operativo comparte las mismas páginas entre todos los procesos
+        que abren el archivo. Los ids y metadatos se decodifican a demanda.
+
+        Parámetros:
+            ruta (str): Archivo a abrir
+            usar_mmap (bool): Si False, el archivo se lee completo a memoria
+
+        Retorna:
+            GrafoCSR: Grafo de solo lectura
+
+        Lanza:
+            ValueError: Si el archivo no tiene el formato o la versión esperada
+        """
+        with open(ruta, "rb") as f:
+            if usar_mmap:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = f.read()
+
+        vista = memoryview(buffer)
+        if len(vista) < _TAMANO_ENCABEZADO:
+            raise ValueError(f"{ruta} no es un grafo binario de SmartRoute")
+        magic, version, banderas, n, m, *ubicaciones = _ENCABEZADO.unpack_from(vista)
+        if magic != MAGIC:
+            raise ValueError(f"{ruta} no es un grafo binario de SmartRoute")
+        if version != VERSION_BINARIO:
+            raise ValueError(f"{ruta}: versión de formato {version} no soportada")
+
+        def seccion(k: int, tipo: Optional[str]=None):
+            inicio, largo = ubicaciones[2 * k], ubicaciones[2 * k + 1]
+            if inicio + largo > len(vista):
+                raise ValueError(f"{ruta} está truncado")
+            parte = vista[inicio:inicio + largo]
+            if tipo is None:
+                return parte
+            if sys.byteorder != "little":
+                # En máquinas big-endian hay que copiar e invertir los bytes
+                arreglo = array(tipo, parte.tobytes())
+                arreglo.byteswap()
+                return arreglo
+            return parte.cast(tipo)
+
+        ids = _TablaIds(seccion(0, 'q'), seccion(1))
+        csr = cls(ids, seccion(2, 'q'), seccion(3, 'i'), seccion(4, 'd'),
+                  dirigido=bool(banderas & _DIRIGIDO))
+        if len(csr.destinos) != m or len(ids) != n:
+            raise ValueError(f"{ruta} está dañado")
+        if ubicaciones[11]:
+            csr._metadatos_pendientes = seccion(5)
+        csr._buffer = buffer
+        return csr
+
+    # Memoria
+
+    def memoria(self) -> int:
+        """
+        Estima los bytes usados por la estructura de adyacencia CSR.
+
+        Incluye la tabla de ids, los arreglos y los metadatos de aristas
+        (no incluye los objetos Nodo, que se comparten con el grafo original).
+        En un archivo abierto con mmap cuenta el tamaño mapeado, que el
+        sistema operativo comparte entre procesos.
+        """
+        total = sum(_tamano(x) for x in (self.offsets, self.destinos, self.pesos))
+        if isinstance(self.ids, _TablaIds):
+            total += _tamano(self.ids.posiciones) + _tamano(self.ids.datos)
+        else:
+            total += sys.getsizeof(self.ids) + sum(sys.getsizeof(i) for i in self.ids)
+        if self._indices is not None:
+            total += sys.getsizeof(self._indices)
+        if self._metadatos_pendientes is not None:
+            total += self._metadatos_pendientes.nbytes
+        else:
+            total += sys.getsizeof(self._meta_aristas)
+            total += sum(sys.getsizeof(m) for m in self._meta_aristas.values())
+        return total
+
+
+# CLASE AUXILIAR: _TABLAIDS
+
+class _TablaIds:
+    """
+    Tabla de ids leída de un archivo binario, sin decodificar todos los ids.
+
+    Se comporta como una lista de solo lectura (índice -> id). Como los ids
+    están ordenados y UTF-8 conserva el orden de los caracteres, `indice`
+    hace una búsqueda binaria directamente sobre los bytes.
+    """
+
+    def __init__(self, posiciones, datos):
+        self.posiciones = posiciones  # n+1 posiciones de inicio dentro de `datos`
+        self.datos = datos  # Bytes UTF-8 de todos los ids seguidos
+
+    def __len__(self):
+        return len(self.posiciones) - 1
+
+    def _bytes(self, i: int) -> bytes:
+        return self.datos[self.posiciones[i]:self.posiciones[i + 1]].tobytes()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice de nodo fuera de rango")
+        return self._bytes(i).decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._bytes(i).decode("utf-8")
+
+    def indice(self, node_id: str) -> int:
+        """Índice del id por búsqueda binaria; KeyError si no existe."""
+        buscado = node_id.encode("utf-8")
+        bajo, alto = 0, len(self)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._bytes(medio) < buscado:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo < len(self) and self._bytes(bajo) == buscado:
+            return bajo
+        raise KeyError(node_id)
+
+
+# Procesos de `matriz_distancias`: cada uno abre cada archivo una sola vez
+
+_guardando = threading.Lock()  # Un solo hilo guarda el archivo compartido de una copia
+_grafo_trabajador: Optional[GrafoCSR] = None
+_ruta_trabajador: Optional[str] = None
+
+
+def _filas_trabajador(tarea: Tuple[str, List[int], List[int]]) -> List[array]:
+    """Calcula las filas de un bloque de orígenes: (ruta, columnas, bloque)."""
+    global _grafo_trabajador, _ruta_trabajador
+    ruta, columnas, bloque = tarea
+    if ruta != _ruta_trabajador:
+        _grafo_trabajador = GrafoCSR.abrir(ruta)
+        _ruta_trabajador = ruta
+    return [_grafo_trabajador._fila(s, columnas) for s in bloque]
+
+
+def _alinear(posicion: int) -> int:
+    """Redondea hacia arriba al siguiente múltiplo de 8."""
+    return (posicion + 7) & ~7
+
+
+def _bytes_le(arreglo) -> bytes:
+    """Bytes little-endian de un array o memoryview numérico."""
+    if isinstance(arreglo, memoryview):
+        arreglo = array(arreglo.format, arreglo.tobytes())
+    if sys.byteorder != "little":
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+
+def _tamano(x) -> int:
+    """Bytes de un arreglo: datos de una vista o tamaño de un array."""
+    return x.nbytes if isinstance(x, memoryview) else sys.getsizeof(x)
+
+
+def memoria_adyacencia(grafo) -> int:
+    """
+    Estima los bytes usados por la adyacencia de un `Grafo` (dict de listas).
+
+    Cuenta el diccionario, las listas, las tuplas, los pesos, los dicts de
+    metadatos y los ids, sin contar dos veces los objetos compartidos.
+    Sirve para comparar contra `GrafoCSR.memoria()`.
+    """
+    vistos = set()
+
+    def tam(obj) -> int:
+        if id(obj) in vistos:
+            return 0
+        vistos.add(id(obj))
+        return sys.getsizeof(obj)
+
+    total = tam(grafo.ady)
+    for u, lst in grafo.ady.items():
+        total += tam(u) + tam(lst)
+        for t in lst:
+            total += tam(t) + tam(t[0]) + tam(t[1]) + tam(t[2])
+    return total
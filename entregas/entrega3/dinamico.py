@@ -0,0 +1,179 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Caminos más cortos dinámicos: reparar el resultado de Dijkstra después de
+cerrar o reabrir calles, sin recalcular desde cero.
+
+Se parte de (dist, prev) de `Grafo.dijkstra(origen)` (el árbol completo) y,
+cada vez que cambia una arista u -> v, se repara solo lo afectado
+(al estilo de Ramalingam–Reps):
+- Si la arista mejoró (nueva o con menor peso) y ahora da un camino más
+  corto a v, se propaga la mejora desde v con un Dijkstra que solo visita
+  los nodos que mejoran.
+- Si la arista empeoró (eliminada o con mayor peso) y era la que usaba el
+  árbol para llegar a v, solo el subárbol de v puede empeorar: esos nodos
+  se recalculan a partir de sus vecinos de fuera del subárbol.
+En cualquier otro caso no hay nada que hacer.
+"""
+
+from typing import Dict, Optional, Set
+import heapq
+
+from grafo import Grafo  # type: ignore
+
+
+# CLASE: CAMINOSDINAMICOS
+
+class CaminosDinamicos:
+    """
+    Árbol de caminos más cortos desde un origen que se mantiene al día.
+
+    Las distancias siempre coinciden con las de un Dijkstra nuevo; cuando
+    hay varios caminos igual de cortos el predecesor elegido puede ser otro.
+
+    Ejemplo de uso:
+        caminos = CaminosDinamicos(g, "H1")
+        caminos.eliminar_arista("A", "B")   # Cierre de la calle A-B
+        g.reconstruir_camino(caminos.prev, "C3")
+    """
+
+    def __init__(self, grafo: Grafo, origen: str, dist: Optional[Dict[str, float]]=None,
+                 prev: Optional[Dict[str, Optional[str]]]=None):
+        """
+        Parámetros:
+            grafo (Grafo): Grafo sobre el que se calculan los caminos
+            origen (str): ID del nodo de origen
+            dist, prev (dict, opcional): Resultado de `grafo.dijkstra(origen)`
+                                         (sin objetivo); si no se pasan, se calcula
+
+        Lanza:
+            KeyError: Si el origen no existe
+        """
+        if dist is None or prev is None:
+            dist, prev = grafo.dijkstra(origen)
+        self.grafo = grafo
+        self.origen = origen
+        self.dist: Dict[str, float] = dict(dist)
+        self.prev: Dict[str, Optional[str]] = dict(prev)
+        self.version = grafo.version  # Versión del grafo con la que coincide
+        # Hijos de cada nodo en el árbol (para encontrar subárboles rápido)
+        self._hijos: Dict[str, Set[str]] = {}
+        for v, u in self.prev.items():
+            if u is not None:
+                self._hijos.setdefault(u, set()).add(v)
+
+    def vigente(self) -> bool:
+        """True si el grafo no cambió desde la última reparación."""
+        return self.version == self.grafo.version
+
+    # Cambios en el grafo (aplican el cambio y reparan)
+
+    def insertar_arista(self, u: str, v: str, peso: float=1.0, meta=None):
+        """Llama `grafo.insertar_arista` y repara los caminos."""
+        self.grafo.insertar_arista(u, v, peso=peso, meta=meta)
+        self.arista_cambiada(u, v)
+
+    def eliminar_arista(self, u: str, v: str, eliminar_todas: bool=False):
+        """Llama `grafo.eliminar_arista` y repara los caminos."""
+        self.grafo.eliminar_arista(u, v, eliminar_todas=eliminar_todas)
+        self.arista_cambiada(u, v)
+
+    def arista_cambiada(self, u: str, v: str):
+        """
+        Repara los caminos después de que cambiaron las aristas entre u y v
+        (insertadas, eliminadas o con otro peso). En grafos no dirigidos
+        revisa ambas direcciones.
+
+        Parámetros:
+            u (str): ID del nodo origen de la arista
+            v (str): ID del nodo destino de la arista
+        """
+        for x in (u, v):
+            if x in self.grafo.nodos and x not in self.dist:
+                # Nodo insertado después de calcular los caminos
+                self.dist[x] = float('inf')
+                self.prev[x] = None
+        self._reparar(u, v)
+        if not self.grafo.dirigido:
+            self._reparar(v, u)
+        self.version = self.grafo.version
+
+    def _reparar(self, u: str, v: str):
+        """Repara la arista dirigida u -> v."""
+        if v == self.origen or v not in self.dist:
+            return
+        candidato = self.dist.get(u, float('inf')) + self._peso_minimo(u, v)
+        if candidato < self.dist[v]:
+            self._mover(v, u, candidato)
+            self._propagar([(candidato, v)])
+        elif self.prev[v] == u and candidato > self.dist[v]:
+            self._recalcular_subarbol(v)
+
+    # Reparaciones
+
+    def _peso_minimo(self, u: str, v: str) -> float:
+        """Menor peso de las aristas u -> v (inf si no hay)."""
+        posiciones = self.grafo._posiciones.get((u, v))
+        if not posiciones:
+            return float('inf')
+        lst = self.grafo.ady[u]
+        return min(lst[p][1] for p in posiciones)
+
+    def _mover(self, v: str, u: Optional[str], d: float):
+        """Cambia la distancia de v y lo cuelga de u en el árbol."""
+        anterior = self.prev[v]
+        if anterior is not None:
+            self._hijos[anterior].discard(v)
+        if u is not None:
+            self._hijos.setdefault(u, set()).add(v)
+        self.prev[v] = u
+        self.dist[v] = d
+
+    def _propagar(self, heap):
+        """Dijkstra desde los nodos del heap que solo sigue donde hay mejora."""
+        dist, ady = self.dist, self.grafo.ady
+        heapq.heapify(heap)
+        while heap:
+            d, x = heapq.heappop(heap)
+            if d > dist[x]:
+                continue
+            for y, peso, _meta in ady.get(x, []):
+                nd = d + peso
+                if nd < dist[y]:
+                    self._mover(y, x, nd)
+                    heapq.heappush(heap, (nd, y))
+
+    def _recalcular_subarbol(self, v: str):
+        """
+        Recalcula el subárbol de v: solo esos nodos pueden haber empeorado,
+        las distancias del resto siguen siendo correctas.
+        """
+        afectados = []
+        pila = [v]
+        while pila:
+            x = pila.pop()
+            afectados.append(x)
+            pila.extend(self._hijos.get(x, ()))
+        conjunto = set(afectados)
+
+        for x in afectados:
+            self._mover(x, None, float('inf'))
+
+        # Mejor entrada de cada afectado desde un nodo no afectado
+        heap = []
+        for x in afectados:
+            mejor, padre = float('inf'), None
+            for w, peso, _meta in self.grafo._aristas_entrantes(x):
+                if w not in conjunto:
+                    d = self.dist[w] + peso
+                    if d < mejor:
+                        mejor, padre = d, w
+            if padre is not None:
+                self._mover(x, padre, mejor)
+                heap.append((mejor, x))
+        self._propagar(heap)
@@ -0,0 +1,199 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Índice espacial para encontrar nodos a partir de coordenadas GPS.
+
+Cada punto (lat, lon) se convierte a coordenadas 3D sobre la esfera
+terrestre (en km) y se guarda en una grilla de cubos de `celda_km` de lado.
+En 3D la distancia en línea recta (cuerda) crece igual que la distancia
+sobre la superficie, así que las cotas de la grilla son exactas en
+cualquier lugar del planeta (sin problemas con los polos ni el meridiano
+180). Con densidad razonable cada consulta revisa unas pocas celdas.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import math
+
+from grafo import RADIO_TIERRA_KM  # type: ignore
+
+Celda = Tuple[int, int, int]
+Punto = Tuple[float, float, float]
+
+
+# CLASE: INDICEESPACIAL
+
+class IndiceEspacial:
+    """
+    Grilla de puntos con consultas de vecino más cercano y por radio.
+
+    Ejemplo de uso:
+        indice = IndiceEspacial()
+        indice.insertar("H1", 4.6097, -74.0817)
+        indice.mas_cercano(4.61, -74.08)   # ("H1", 0.05)
+    """
+
+    def __init__(self, celda_km: float=0.25):
+        """
+        Parámetros:
+            celda_km (float): Lado de cada celda de la grilla en km (el valor por
+                              defecto sirve para redes urbanas con nodos
+                              cada 50 a 200 m)
+        """
+        if celda_km <= 0:
+            raise ValueError("El tamaño de celda debe ser positivo")
+        self.celda_km = celda_km
+        self._celdas: Dict[Celda, Dict[str, Punto]] = {}  # celda -> {id: punto 3D}
+        self._ubicacion: Dict[str, Celda] = {}  # id -> celda
+
+    def __len__(self):
+        return len(self._ubicacion)
+
+    def __contains__(self, node_id: str):
+        return node_id in self._ubicacion
+
+    # Actualización
+
+    def insertar(self, node_id: str, lat: float, lon: float):
+        """Agrega un punto (o lo mueve si el id ya estaba)."""
+        self.eliminar(node_id)
+        p = _a_3d(lat, lon)
+        celda = self._celda(p)
+        self._celdas.setdefault(celda, {})[node_id] = p
+        self._ubicacion[node_id] = celda
+
+    def eliminar(self, node_id: str):
+        """Quita un punto; no hace nada si el id no está."""
+        celda = self._ubicacion.pop(node_id, None)
+        if celda is None:
+            return
+        puntos = self._celdas[celda]
+        del puntos[node_id]
+        if not puntos:
+            del self._celdas[celda]
+
+    # Consultas
+
+    def mas_cercano(self, lat: float, lon: float) -> Optional[Tuple[str, float]]:
+        """
+        Punto más cercano a (lat, lon).
+
+        Revisa cubos de celdas cada vez más grandes alrededor de la consulta
+        y se detiene cuando ningún punto fuera de lo revisado puede estar más
+        cerca que el mejor encontrado.
+
+        Retorna:
+            tuple: (id, distancia en km sobre la superficie), o None si el
+                   índice está vacío
+        """
+        if not self._ubicacion:
+            return None
+        p = _a_3d(lat, lon)
+        centro = self._celda(p)
+        mejor_id, mejor = None, float('inf')  # `mejor` es la cuerda al cuadrado
+        r = 0
+        while True:
+            if (2 * r + 1) ** 3 >= len(self._celdas):
+                # El cubo ya es más grande que las celdas ocupadas: revisarlas todas
+                for puntos in self._celdas.values():
+                    mejor_id, mejor = _mas_cercano_en(puntos, p, mejor_id, mejor)
+                break
+            for celda in _capa(centro, r):
+                puntos = self._celdas.get(celda)
+                if puntos:
+                    mejor_id, mejor = _mas_cercano_en(puntos, p, mejor_id, mejor)
+            # Cualquier punto fuera del cubo de radio r está a más de r celdas
+            if mejor_id is not None and mejor <= (r * self.celda_km) ** 2:
+                break
+            r += 1
+        return mejor_id, _cuerda_a_km(math.sqrt(mejor))
+
+    def en_radio(self, lat: float, lon: float, radio_km: float) -> List[Tuple[str, float]]:
+        """
+        Puntos a lo sumo a `radio_km` de (lat, lon) sobre la superficie.
+
+        Retorna:
+            list: Pares (id, distancia en km) ordenados por distancia
+        """
+        if radio_km < 0 or not self._ubicacion:
+            return []
+        p = _a_3d(lat, lon)
+        limite = _km_a_cuerda(radio_km)
+        limite2 = limite * limite
+        centro = self._celda(p)
+        alcance = int(limite // self.celda_km) + 1
+
+        if (2 * alcance + 1) ** 3 >= len(self._celdas):
+            candidatas = [puntos for celda, puntos in self._celdas.items()
+                          if all(abs(a - b) <= alcance for a, b in zip(celda, centro))]
+        else:
+            cx, cy, cz = centro
+            candidatas = [self._celdas[c] for c in
+                          ((x, y, z) for x in range(cx - alcance, cx + alcance + 1)
+                           for y in range(cy - alcance, cy + alcance + 1)
+                           for z in range(cz - alcance, cz + alcance + 1))
+                          if c in self._celdas]
+
+        encontrados = []
+        px, py, pz = p
+        for puntos in candidatas:
+            for node_id, (x, y, z) in puntos.items():
+                d2 = (x - px) ** 2 + (y - py) ** 2 + (z - pz) ** 2
+                if d2 <= limite2:
+                    encontrados.append((_cuerda_a_km(math.sqrt(d2)), node_id))
+        encontrados.sort()
+        return [(node_id, d) for d, node_id in encontrados]
+
+    def _celda(self, p: Punto) -> Celda:
+        c = self.celda_km
+        return (math.floor(p[0] / c), math.floor(p[1] / c), math.floor(p[2] / c))
+
+
+# Funciones auxiliares
+
+def _a_3d(lat: float, lon: float) -> Punto:
+    """Coordenadas 3D (km) del punto sobre la esfera terrestre."""
+    fi, la = math.radians(lat), math.radians(lon)
+    return (RADIO_TIERRA_KM * math.cos(fi) * math.cos(la),
+            RADIO_TIERRA_KM * math.cos(fi) * math.sin(la),
+            RADIO_TIERRA_KM * math.sin(fi))
+
+
+def _cuerda_a_km(cuerda: float) -> float:
+    """Distancia sobre la superficie que corresponde a una cuerda."""
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, cuerda / (2 * RADIO_TIERRA_KM)))
+
+
+def _km_a_cuerda(km: float) -> float:
+    """Cuerda que corresponde a una distancia sobre la superficie."""
+    return 2 * RADIO_TIERRA_KM * math.sin(min(math.pi / 2, km / (2 * RADIO_TIERRA_KM)))
+
+
+def _mas_cercano_en(puntos: Dict[str, Punto], p: Punto, mejor_id, mejor: float):
+    """Actualiza (mejor_id, cuerda²) con los puntos de una celda."""
+    px, py, pz = p
+    for node_id, (x, y, z) in puntos.items():
+        d2 = (x - px) ** 2 + (y - py) ** 2 + (z - pz) ** 2
+        if d2 < mejor:
+            mejor_id, mejor = node_id, d2
+    return mejor_id, mejor
+
+
+def _capa(centro: Celda, r: int):
+    """Celdas a distancia de Chebyshev exactamente r del centro."""
+    cx, cy, cz = centro
+    if r == 0:
+        yield centro
+        return
+    for dx in range(-r, r + 1):
+        for dy in range(-r, r + 1):
+            if abs(dx) == r or abs(dy) == r:
+                for dz in range(-r, r + 1):
+                    yield (cx + dx, cy + dy, cz + dz)
+            else:
+                yield (cx + dx, cy + dy, cz - r)
+                yield (cx + dx, cy + dy, cz + r)
@@ -12,8 +12,272 @@ Contiene la estructura de datos de GRAFO que permite tratar las
 relaciones entre lugares (nodos) y las distancias/conexiones entre ellos (aristas).
 """
 
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Callable, Iterable, Set
+from collections import OrderedDict, deque
+from types import MappingProxyType
+import bisect
+import csv
+import gc
 import heapq
+import math
+
+RADIO_TIERRA_KM = 6371.0088  # Radio medio de la Tierra
+
+
+class _MetaVacia(dict):
+    """
+    Dict vacío de solo lectura para compartir entre aristas y nodos sin metadatos.
+
+    Es un dict (se serializa con json como `{}`) y se copia o se guarda con
+    pickle como una referencia a `META_VACIA`, así que sigue siendo uno solo.
+    """
+
+    __slots__ = ()
+
+    def _solo_lectura(self, *args, **kwargs):
+        raise TypeError("META_VACIA es de solo lectura; asigne un dict nuevo")
+
+    __setitem__ = __delitem__ = __ior__ = _solo_lectura
+    clear = pop = popitem = setdefault = update = _solo_lectura
+
+    def __reduce__(self):
+        return "META_VACIA"
+
+
+# Metadatos vacíos compartidos por las aristas sin metadatos (inmutable);
+# también los retorna `Nodo.metadatos()` para nodos sin metadatos
+META_VACIA = _MetaVacia()
+
+# Consultas punto a punto sin índice de componentes tras las que se rearma
+# (el rearmado recorre todo el grafo: así lo pagan varias consultas, no una)
+_CONSULTAS_PARA_COMPONENTES = 4
+
+# Máximo de rutas con pesos combinados que `rutas_pareto` calcula de antemano
+_SEMILLAS_PARETO = 8
+
+
+def distancia_haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Distancia en línea recta (gran círculo) entre dos coordenadas.
+
+    Parámetros:
+        lat1, lon1 (float): Coordenadas del primer punto en grados
+        lat2, lon2 (float): Coordenadas del segundo punto en grados
+
+    Retorna:
+        float: Distancia en kilómetros
+    """
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def normalizar_perfil(perfil: Iterable[Tuple[float, float]]) -> Tuple[Tuple[float, float], ...]:
+    """
+    Valida un perfil de tiempo de viaje y lo deja como tupla de pares.
+
+    Un perfil es una lista de puntos (hora de salida, tiempo de viaje)
+    ordenados por hora; entre dos puntos el tiempo se interpola linealmente
+    y fuera del rango se usa el del punto más cercano. Las horas y los
+    tiempos usan la misma unidad (por ejemplo minutos desde medianoche).
+
+    Para que Dijkstra sea correcto el perfil debe ser FIFO: salir más tarde
+    nunca hace llegar antes, o sea que el tiempo de viaje no baja más rápido
+    que el reloj (pendiente >= -1 en cada tramo).
+
+    Parámetros:
+        perfil (iterable): Pares (hora, tiempo_de_viaje)
+
+    Retorna:
+        tuple: ((hora, tiempo), ...) con valores float
+
+    Lanza:
+        ValueError: Si está vacío, las horas no son crecientes, hay tiempos
+                    negativos o no cumple FIFO
+    """
+    puntos = tuple((float(h), float(t)) for h, t in perfil)
+    if not puntos:
+        raise ValueError("El perfil de tiempos debe tener al menos un punto")
+    for h, t in puntos:
+        if t < 0:
+            raise ValueError(f"Tiempo de viaje negativo en la hora {h}")
+    for (h0, t0), (h1, t1) in zip(puntos, puntos[1:]):
+        if h1 <= h0:
+            raise ValueError("Las horas del perfil deben ser estrictamente crecientes")
+        if t1 - t0 < -(h1 - h0):
+            raise ValueError(f"El perfil no es FIFO entre las horas {h0} y {h1}: "
+                             f"salir más tarde haría llegar antes")
+    return puntos
+
+
+def tiempo_viaje(perfil: Tuple[Tuple[float, float], ...], hora: float) -> float:
+    """
+    Tiempo de viaje de un perfil (ver `normalizar_perfil`) saliendo a `hora`.
+    """
+    i = bisect.bisect_right(perfil, (hora, math.inf))
+    if i == 0:
+        return perfil[0][1]
+    if i == len(perfil):
+        return perfil[-1][1]
+    (h0, t0), (h1, t1) = perfil[i - 1], perfil[i]
+    return t0 + (t1 - t0) * (hora - h0) / (h1 - h0)
+
+
+def _preparar_meta(meta):
+    """Metadatos de una arista con su perfil de tiempos (si tiene) validado."""
+    if not meta:
+        return META_VACIA
+    if "perfil" in meta:
+        meta = {**meta, "perfil": normalizar_perfil(meta["perfil"])}
+    return meta
+
+
+def _domina(a: Tuple[float, ...], b: Tuple[float, ...]) -> bool:
+    """True si `a` no es peor que `b` en ningún criterio."""
+    return all(x <= y for x, y in zip(a, b))
+
+
+def _valor_csv(texto: str):
+    """Convierte un valor de CSV a float si es numérico; si no, lo deja como texto."""
+    try:
+        return float(texto)
+    except ValueError:
+        return texto
+
+
+# CLASE: CACHERUTAS
+
+class CacheRutas:
+    """
+    Caché LRU acotada para resultados de búsquedas de caminos.
+
+    Cada entrada se asocia a la versión del grafo con la que se calculó; si
+    el grafo cambió (otra versión), la caché se vacía antes de responder.
+    Cuando se llena, se desaloja la entrada usada hace más tiempo.
+    """
+
+    def __init__(self, capacidad: int=128):
+        """
+        Parámetros:
+            capacidad (int): Máximo de resultados guardados
+
+        Lanza:
+            ValueError: Si la capacidad es menor a 1
+        """
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché debe ser al menos 1")
+        self.capacidad = capacidad
+        self.version = None  # Versión del grafo de las entradas guardadas
+        self._datos: "OrderedDict[tuple, Any]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __getstate__(self):
+        # Al copiar o guardar con pickle la caché viaja vacía: sus resultados
+        # son vistas de solo lectura (que pickle no admite) y se recalculan
+        estado = dict(self.__dict__)
+        estado["_datos"] = OrderedDict()
+        estado["version"] = None
+        return estado
+
+    def obtener(self, clave: tuple, version: int):
+        """
+        Retorna el resultado guardado para `clave` (None si no está).
+
+        Si `version` no coincide con la de las entradas guardadas, primero
+        las descarta todas.
+        """
+        if version != self.version:
+            if self._datos:
+                self._datos.clear()
+                self.invalidaciones += 1
+            self.version = version
+        valor = self._datos.get(clave)
+        if valor is None:
+            self.fallos += 1
+            return None
+        self._datos.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+
+    def guardar(self, clave: tuple, valor: Any):
+        """Guarda un resultado calculado con la versión de la última consulta."""
+        self._datos[clave] = valor
+        self._datos.move_to_end(clave)
+        if len(self._datos) > self.capacidad:
+            self._datos.popitem(last=False)
+            self.desalojos += 1
+
+    def limpiar(self):
+        """Vacía la caché sin reiniciar los contadores."""
+        self._datos.clear()
+
+    def estadisticas(self) -> Dict[str, int]:
+        """Contadores de aciertos, fallos, desalojos e invalidaciones."""
+        return {"aciertos": self.aciertos, "fallos": self.fallos,
+                "desalojos": self.desalojos, "invalidaciones": self.invalidaciones,
+                "entradas": len(self._datos), "capacidad": self.capacidad}
+
+
+# CLASE AUXILIAR: _FRENTE
+
+class _Frente:
+    """
+    Conjunto de vectores de costos que no se dominan entre sí (frente de
+    Pareto), con el índice de la etiqueta de cada uno.
+
+    Con dos criterios los vectores se guardan ordenados por el primero (el
+    segundo queda decreciente) y las consultas usan búsqueda binaria; con más
+    criterios se recorren todos.
+    """
+
+    def __init__(self):
+        self.costos: List[Tuple[float, ...]] = []
+        self.etiquetas: List[int] = []
+
+    def domina(self, c: Tuple[float, ...], holgura: float=1.0) -> bool:
+        """
+        True si algún vector del frente es <= que c en todos los criterios
+        (o <= que c * holgura, con holgura > 1).
+        """
+        if holgura != 1.0:
+            c = tuple(x * holgura for x in c)
+        if len(c) == 2:
+            # El de mayor primer criterio que no pasa de c[0] tiene el menor segundo
+            i = bisect.bisect_right(self.costos, (c[0], math.inf))
+            return i > 0 and self.costos[i - 1][1] <= c[1]
+        return any(_domina(x, c) for x in self.costos)
+
+    def agregar(self, c: Tuple[float, ...], etiqueta: int) -> List[int]:
+        """
+        Agrega c (que no debe estar dominado) y quita los vectores que c
+        domina. Retorna las etiquetas quitadas.
+        """
+        if len(c) == 2:
+            i = bisect.bisect_left(self.costos, c)
+            fin = i
+            while fin < len(self.costos) and self.costos[fin][1] >= c[1]:
+                fin += 1
+            quitadas = self.etiquetas[i:fin]
+            self.costos[i:fin] = [c]
+            self.etiquetas[i:fin] = [etiqueta]
+            return quitadas
+        quitadas = [e for x, e in zip(self.costos, self.etiquetas) if _domina(c, x)]
+        if quitadas:
+            vivos = [(x, e) for x, e in zip(self.costos, self.etiquetas) if not _domina(c, x)]
+            self.costos = [x for x, _e in vivos]
+            self.etiquetas = [e for _x, e in vivos]
+        self.costos.append(c)
+        self.etiquetas.append(etiqueta)
+        return quitadas
+
 
 # CLASE: NODO
 
@@ -23,7 +287,12 @@ class Nodo:
     
     Cada nodo contiene información detallada sobre un lugar, como su nombre,
     ubicación (distancia), tiempo de viaje y categoría (hotel, restaurante, etc.).
+
+    Usa `__slots__` (sin `__dict__` por nodo) y no guarda un dict de
+    metadatos hasta que se usa `meta`: `metadatos()` los lee sin crearlo.
     """
+
+    __slots__ = ("id", "nombre", "distancia_km", "categoria", "_meta")
     
     def __init__(self, node_id: str, nombre: str, distancia_km: float,
                     categoria: str, meta: Optional[Dict[str,Any]]=None):
@@ -41,7 +310,27 @@ class Nodo:
         self.nombre = nombre
         self.distancia_km = distancia_km
         self.categoria = categoria
-        self.meta = meta or {}
+        self._meta = meta or None
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """Metadatos del lugar; se crea un dict propio al primer acceso."""
+        if self._meta is None:
+            self._meta = {}
+        return self._meta
+
+    @meta.setter
+    def meta(self, meta: Dict[str, Any]):
+        self._meta = meta
+
+    def metadatos(self):
+        """
+        Metadatos del lugar para solo lectura, sin crear un dict si no tiene.
+
+        Retorna:
+            dict: `meta`, o `META_VACIA` si el nodo no tiene metadatos
+        """
+        return self._meta or META_VACIA
 
     def to_dict(self):
         """
@@ -55,9 +344,21 @@ class Nodo:
             "nombre": self.nombre,
             "distancia_km": self.distancia_km,
             "categoria": self.categoria,
-            **self.meta  # Incluye metadatos adicionales si existen
+            **self.metadatos()  # Incluye metadatos adicionales si existen
         }
 
+    def coordenadas(self) -> Optional[Tuple[float, float]]:
+        """
+        Coordenadas GPS del lugar, guardadas en `meta["lat"]` y `meta["lon"]`.
+
+        Retorna:
+            tuple: (lat, lon) en grados, o None si el nodo no las tiene
+        """
+        meta = self.metadatos()
+        if "lat" in meta and "lon" in meta:
+            return meta["lat"], meta["lon"]
+        return None
+
     def __repr__(self):
         """
         Representación en texto del nodo (usada para impresión y debugging).
@@ -93,6 +394,161 @@ class Grafo:
         self.dirigido = dirigido
         self.nodos: Dict[str, Nodo] = {}  # Diccionario: id_nodo -> objeto Nodo
         self.ady: Dict[str, List[Tuple[str, float, Dict[str,Any]]]] = {}  # Lista de adyacencia
+        # Índices inversos para no recorrer todo el grafo al eliminar:
+        # - _entrantes[v] = {u: cantidad de aristas u -> v}
+        # - _posiciones[(u, v)] = posiciones (ordenadas) de las aristas u -> v en ady[u]
+        self._entrantes: Dict[str, Dict[str, int]] = {}
+        self._posiciones: Dict[Tuple[str, str], List[int]] = {}
+        # Índices secundarios (claves en minúsculas): clave -> {id: Nodo}
+        self._por_nombre: Dict[str, Dict[str, Nodo]] = {}
+        self._por_categoria: Dict[str, Dict[str, Nodo]] = {}
+        # Contador de cambios: cada insertar_*/eliminar_* lo incrementa y así
+        # invalida los resultados guardados en la caché de rutas
+        self.version = 0
+        self._cache: Optional[CacheRutas] = None
+        self._espacial = None  # IndiceEspacial, se crea en la primera consulta
+        # IndiceComponentes (union-find): se crea en la primera consulta, se
+        # actualiza al insertar y se descarta al eliminar (se rearma después)
+        self._componentes = None
+        self._consultas_sin_componentes = 0  # Ver `_desconectados`
+        self._congelada = None  # (version, GrafoCSR) de `_copia_congelada`
+        # Ids de nodos cuyos datos o aristas cambiaron desde la última
+        # publicación (solo lo usa `GrafoConcurrente`; None = no se registra)
+        self._tocados: Optional[Set[str]] = None
+
+    def __getstate__(self):
+        # La copia CSR de uso interno tiene archivos temporales: no se copia
+        estado = dict(self.__dict__)
+        estado["_congelada"] = None
+        return estado
+
+    @classmethod
+    def desde_aristas(cls, aristas: Iterable[tuple], nodos: Optional[Iterable[Nodo]]=None,
+                      dirigido: bool=False) -> "Grafo":
+        """
+        Construye un grafo completo de una sola vez (carga masiva).
+
+        Es equivalente a llamar `insertar_nodo` por cada nodo e `insertar_arista`
+        por cada arista, en el mismo orden, pero valida todo en un solo paso,
+        reserva cada lista de adyacencia con su tamaño final y comparte un
+        único objeto de metadatos vacío entre todas las aristas sin metadatos.
+
+        Parámetros:
+            aristas (iterable): Tuplas (u, v), (u, v, peso) o (u, v, peso, meta)
+            nodos (iterable, opcional): Objetos Nodo; si no se pasan, se crea un
+                                        nodo básico (nombre = id) por cada extremo
+            dirigido (bool): Si el grafo es dirigido
+
+        Retorna:
+            Grafo: El grafo construido
+
+        Lanza:
+            ValueError: Si hay nodos con id repetido
+            KeyError: Si alguna arista usa un nodo que no existe
+        """
+        g = cls(dirigido=dirigido)
+        # Durante la carga se crean millones de contenedores: pausar el
+        # recolector cíclico evita que recorra el grafo una y otra vez
+        gc_activo = gc.isenabled()
+        gc.disable()
+        try:
+            lista = [tuple(a) for a in aristas]
+            if nodos is None:
+                extremos = dict.fromkeys(x for a in lista for x in a[:2])
+                nodos = (Nodo(node_id, str(node_id), 0.0, "") for node_id in extremos)
+
+            for nodo in nodos:
+                if nodo.id in g.nodos:
+                    raise ValueError(f"Ya existe un nodo con id {nodo.id}")
+                g.nodos[nodo.id] = nodo
+                g._indexar(nodo)
+
+            # Validación en lote de los extremos
+            faltantes = {x for a in lista for x in a[:2] if x not in g.nodos}
+            if faltantes:
+                raise KeyError(f"Ambos nodos deben existir para insertar una arista: "
+                               f"{sorted(map(str, faltantes))[:10]}")
+
+            # Reservar cada lista con su grado final
+            grado = dict.fromkeys(g.nodos, 0)
+            for a in lista:
+                grado[a[0]] += 1
+                if not dirigido:
+                    grado[a[1]] += 1
+            ady = {node_id: [None] * grado[node_id] for node_id in g.nodos}
+            cursor = dict.fromkeys(g.nodos, 0)
+            entrantes: Dict[str, Dict[str, int]] = {node_id: {} for node_id in g.nodos}
+            posiciones = g._posiciones
+
+            for a in lista:
+                peso = a[2] if len(a) > 2 else 1.0
+                meta = _preparar_meta(a[3]) if len(a) > 3 and a[3] else META_VACIA
+                for u, v in (((a[0], a[1]),) if dirigido else ((a[0], a[1]), (a[1], a[0]))):
+                    p = cursor[u]
+                    cursor[u] = p + 1
+                    ady[u][p] = (v, peso, meta)
+                    lst = posiciones.get((u, v))
+                    if lst is None:
+                        posiciones[(u, v)] = [p]
+                    else:
+                        lst.append(p)
+                    ent = entrantes[v]
+                    ent[u] = ent.get(u, 0) + 1
+        finally:
+            if gc_activo:
+                gc.enable()
+
+        g.ady = ady
+        g._entrantes = entrantes
+        return g
+
+    @classmethod
+    def cargar_csv(cls, ruta_aristas: str, ruta_nodos: Optional[str]=None,
+                   dirigido: bool=False, delimitador: str=",") -> "Grafo":
+        """
+        Carga un grafo desde archivos CSV usando `desde_aristas`.
+
+        Formato (con encabezado):
+            aristas: origen,destino,peso[,otras columnas -> meta de la arista]
+            nodos:   id,nombre,distancia_km,categoria[,otras columnas -> meta del nodo]
+
+        Las columnas extra numéricas (ej: lat, lon) se convierten a float y las
+        vacías se omiten.
+
+        Parámetros:
+            ruta_aristas (str): Archivo CSV de aristas
+            ruta_nodos (str, opcional): Archivo CSV de nodos; si no se pasa,
+                                        los nodos se crean a partir de las aristas
+            dirigido (bool): Si el grafo es dirigido
+            delimitador (str): Separador de columnas
+
+        Retorna:
+            Grafo: El grafo cargado
+        """
+        def leer(ruta: str, conocidas: Tuple[str, ...]):
+            """Genera (columnas conocidas, meta con las columnas extra) por fila."""
+            with open(ruta, newline="", encoding="utf-8") as f:
+                lector = csv.reader(f, delimiter=delimitador)
+                encabezado = next(lector)
+                faltan = [c for c in conocidas if c not in encabezado]
+                if faltan:
+                    raise ValueError(f"{ruta}: faltan las columnas {faltan}")
+                posiciones = [encabezado.index(c) for c in conocidas]
+                otras = [(i, c) for i, c in enumerate(encabezado) if c not in conocidas]
+                for fila in lector:
+                    meta = {c: _valor_csv(fila[i]) for i, c in otras if fila[i] != ""}
+                    yield [fila[i] for i in posiciones], meta
+
+        nodos = None
+        if ruta_nodos is not None:
+            nodos = [Nodo(node_id, nombre, float(distancia), categoria, meta or None)
+                     for (node_id, nombre, distancia, categoria), meta
+                     in leer(ruta_nodos, ("id", "nombre", "distancia_km", "categoria"))]
+
+        aristas = ((u, v, float(peso), meta)
+                   for (u, v, peso), meta in leer(ruta_aristas, ("origen", "destino", "peso")))
+
+        return cls.desde_aristas(aristas, nodos, dirigido)
 
     def insertar_nodo(self, nodo: Nodo):
         """
@@ -103,15 +559,28 @@ class Grafo:
             
         Lanza:
             ValueError: Si ya existe un nodo con ese id
+
+        Nota: El nombre y la categoría quedan indexados; para cambiarlos hay
+        que eliminar el nodo y volver a insertarlo.
         """
         if nodo.id in self.nodos:
             raise ValueError(f"Ya existe un nodo con id {nodo.id}")
         self.nodos[nodo.id] = nodo  # Guardar el nodo
         self.ady[nodo.id] = []  # Inicializar lista de adyacencia vacía
+        self._entrantes[nodo.id] = {}
+        self._indexar(nodo)
+        if self._componentes is not None:
+            self._componentes.agregar(nodo.id)
+        if self._tocados is not None:
+            self._tocados.add(nodo.id)
+        self.version += 1
 
     def eliminar_nodo(self, node_id: str):
         """
         Elimina un nodo del grafo junto con todas sus conexiones.
+
+        Gracias al índice de aristas entrantes solo se tocan las listas de
+        los vecinos del nodo, no todo el grafo.
         
         Parámetros:
             node_id (str): ID del nodo a eliminar
@@ -123,12 +592,47 @@ class Grafo:
             raise KeyError(f"No existe el nodo {node_id}")
         
         # Eliminar todas las aristas que apunten a este nodo
-        for u, lst in list(self.ady.items()):
-            self.ady[u] = [t for t in lst if t[0] != node_id]
+        for u in list(self._entrantes[node_id]):
+            if u != node_id:
+                self._quitar_aristas(u, self._posiciones[(u, node_id)])
+        
+        # Descontar las aristas que salen del nodo en los índices de sus vecinos
+        for v in {t[0] for t in self.ady[node_id]}:
+            del self._posiciones[(node_id, v)]
+            if v != node_id:
+                del self._entrantes[v][node_id]
+                if self._tocados is not None:
+                    self._tocados.add(v)
         
         # Eliminar el nodo y sus adyacencias
+        self._desindexar(self.nodos[node_id])
         del self.ady[node_id]
         del self.nodos[node_id]
+        del self._entrantes[node_id]
+        self._componentes = None
+        if self._tocados is not None:
+            self._tocados.add(node_id)
+        self.version += 1
+
+    def _indexar(self, nodo: Nodo):
+        """Registra el nodo en los índices de nombre, categoría y coordenadas."""
+        self._por_nombre.setdefault(nodo.nombre.lower(), {})[nodo.id] = nodo
+        self._por_categoria.setdefault(nodo.categoria.lower(), {})[nodo.id] = nodo
+        if self._espacial is not None:
+            coordenadas = nodo.coordenadas()
+            if coordenadas is not None:
+                self._espacial.insertar(nodo.id, *coordenadas)
+
+    def _desindexar(self, nodo: Nodo):
+        """Quita el nodo de los índices de nombre, categoría y coordenadas."""
+        for indice, clave in ((self._por_nombre, nodo.nombre.lower()),
+                              (self._por_categoria, nodo.categoria.lower())):
+            grupo = indice[clave]
+            del grupo[nodo.id]
+            if not grupo:
+                del indice[clave]
+        if self._espacial is not None:
+            self._espacial.eliminar(nodo.id)
 
     def buscar_nodo_por_id(self, node_id: str):
         """
@@ -145,6 +649,8 @@ class Grafo:
     def buscar_nodo_por_nombre(self, nombre: str):
         """
         Busca nodos por nombre (búsqueda insensible a mayúsculas).
+
+        Usa un índice por nombre: O(1) más el tamaño del resultado.
         
         Parámetros:
             nombre (str): Nombre del lugar a buscar
@@ -152,11 +658,139 @@ class Grafo:
         Retorna:
             list: Lista de nodos que coinciden con el nombre
         """
-        return [n for n in self.nodos.values() if n.nombre.lower() == nombre.lower()]
+        return list(self._por_nombre.get(nombre.lower(), {}).values())
+
+    def conectados(self, u: str, v: str) -> bool:
+        """
+        Indica si hay alguna cadena de aristas entre u y v, sin importar su
+        dirección. (En un grafo dirigido True no garantiza que haya camino
+        de u a v.)
+
+        Usa un índice de componentes (union-find) que se arma con esta
+        consulta o con `componentes()` y se actualiza al insertar. Con él,
+        `ruta`, `rutas_pareto` y `dijkstra` con objetivo entre lugares
+        desconectados responden al instante. Eliminar nodos o aristas lo
+        descarta; se vuelve a armar en la siguiente llamada a `conectados` o
+        `componentes`, o tras unas pocas consultas punto a punto (ver
+        `_desconectados`).
+
+        Lanza:
+            KeyError: Si alguno de los nodos no existe
+        """
+        if u not in self.nodos or v not in self.nodos:
+            raise KeyError("Ambos nodos deben existir")
+        return self._indice_componentes().conectados(u, v)
+
+    def componentes(self, fuertes: bool=False) -> List[int]:
+        """
+        Tamaños de las componentes del grafo, de la más grande a la más chica.
+
+        Parámetros:
+            fuertes (bool): En grafos dirigidos, True cuenta componentes
+                            fuertemente conexas (todos se alcanzan entre sí);
+                            False cuenta las conectadas sin importar dirección
+
+        Retorna:
+            list: Cantidad de nodos de cada componente
+        """
+        if fuertes and self.dirigido:
+            from componentes import componentes_fuertes  # type: ignore
+            return [len(c) for c in componentes_fuertes(self)]
+        return self._indice_componentes().tamanos()
+
+    def _indice_componentes(self):
+        """Arma el índice de componentes (union-find) si no existe."""
+        if self._componentes is None:
+            from componentes import IndiceComponentes  # type: ignore
+            self._componentes = IndiceComponentes.desde_grafo(self)
+            self._consultas_sin_componentes = 0
+        return self._componentes
+
+    def _desconectados(self, u: str, v: str) -> bool:
+        """
+        True si u y v están en componentes distintas, o sea, si seguro no
+        hay ruta entre ellos (atajo de `ruta`, `rutas_pareto` y `dijkstra`).
+
+        Sin índice (recién descartado por una eliminación) responde False y
+        lo rearma recién en la `_CONSULTAS_PARA_COMPONENTES`-ésima consulta,
+        así que cierres seguidos no cuestan un recorrido de todo el grafo
+        por consulta. En grafos dirigidos las componentes ignoran la
+        dirección: dos lugares en la misma componente pueden no tener ruta,
+        y esa consulta no se descarta aquí (la búsqueda da inf).
+        """
+        if self._componentes is None:
+            self._consultas_sin_componentes += 1
+            if self._consultas_sin_componentes < _CONSULTAS_PARA_COMPONENTES:
+                return False
+        return not self._indice_componentes().conectados(u, v)
+
+    def particionar(self, k: int):
+        """
+        Divide el grafo en k celdas compactas de tamaño parecido, para
+        repartirlo entre procesos (ver `particion.RuteadorParticionado`).
+
+        Usa bisección inercial sobre `meta["lat"]`/`meta["lon"]`; los nodos
+        sin coordenadas toman la celda de sus vecinos.
+
+        Parámetros:
+            k (int): Número de celdas
+
+        Retorna:
+            Particion: Celda de cada nodo y nodos frontera de cada celda
+        """
+        from particion import particionar  # type: ignore
+        return particionar(self, k)
+
+    def nodo_mas_cercano(self, lat: float, lon: float) -> Optional[Tuple[str, float]]:
+        """
+        Encuentra el nodo más cercano a unas coordenadas GPS (para "pegar"
+        la ubicación de un usuario a la red antes de calcular rutas).
+
+        Solo se consideran los nodos con `meta["lat"]` y `meta["lon"]`. El
+        índice espacial se arma en la primera consulta y después se mantiene
+        al insertar y eliminar nodos (cambiar las coordenadas de un nodo ya
+        insertado requiere eliminarlo y volver a insertarlo).
+
+        Parámetros:
+            lat, lon (float): Coordenadas en grados
+
+        Retorna:
+            tuple: (id del nodo, distancia en km), o None si ningún nodo
+                   tiene coordenadas
+        """
+        return self._indice_espacial().mas_cercano(lat, lon)
+
+    def nodos_en_radio(self, lat: float, lon: float, radio_km: float) -> List[Tuple[str, float]]:
+        """
+        Encuentra los nodos a lo sumo a `radio_km` (en línea recta) de unas
+        coordenadas GPS. Usa el mismo índice que `nodo_mas_cercano`.
+
+        Parámetros:
+            lat, lon (float): Coordenadas en grados
+            radio_km (float): Radio de búsqueda en km
+
+        Retorna:
+            list: Pares (id del nodo, distancia en km) del más cercano al más lejano
+        """
+        return self._indice_espacial().en_radio(lat, lon, radio_km)
+
+    def _indice_espacial(self):
+        """Arma el índice espacial con los nodos que tienen coordenadas."""
+        if self._espacial is None:
+            from espacial import IndiceEspacial  # type: ignore
+            indice = IndiceEspacial()
+            for nodo in self.nodos.values():
+                coordenadas = nodo.coordenadas()
+                if coordenadas is not None:
+                    indice.insertar(nodo.id, *coordenadas)
+            self._espacial = indice
+        return self._espacial
 
     def buscar_por_categoria(self, categoria: str):
         """
         Busca todos los nodos de una categoría específica.
+
+        Usa un índice por categoría: O(1) más el tamaño del resultado.
         
         Parámetros:
             categoria (str): Tipo de lugar (ej: "Hotel", "Restaurante")
@@ -164,7 +798,7 @@ class Grafo:
         Retorna:
             list: Todos los nodos de esa categoría
         """
-        return [n for n in self.nodos.values() if n.categoria.lower() == categoria.lower()]
+        return list(self._por_categoria.get(categoria.lower(), {}).values())
 
     def insertar_arista(self, u: str, v: str, peso: float=1.0, meta=None):
         """
@@ -174,22 +808,27 @@ class Grafo:
             u (str): ID del nodo origen
             v (str): ID del nodo destino
             peso (float): Distancia/costo de la conexión (por defecto 1.0)
-            meta (dict, opcional): Información adicional sobre la conexión
+            meta (dict, opcional): Información adicional sobre la conexión.
+                                   `meta["perfil"]` puede tener un perfil de
+                                   tiempos por hora (ver `normalizar_perfil`)
+                                   que usa `dijkstra(..., salida=hora)`
             
         Lanza:
             KeyError: Si alguno de los nodos no existe
+            ValueError: Si el perfil de tiempos no es válido
             
         Nota: Si el grafo no es dirigido, la conexión se crea en ambas direcciones.
         """
         if u not in self.nodos or v not in self.nodos:
             raise KeyError("Ambos nodos deben existir para insertar una arista")
+        meta = _preparar_meta(meta)
         
         # Agregar arista u -> v
-        self.ady[u].append((v, peso, meta or {}))
+        self._agregar_arista(u, v, peso, meta)
         
         # Si no es dirigido, agregar también v -> u
         if not self.dirigido:
-            self.ady[v].append((u, peso, meta or {}))
+            self._agregar_arista(v, u, peso, meta)
 
     def eliminar_arista(self, u: str, v: str, eliminar_todas: bool=False):
         """
@@ -205,24 +844,122 @@ class Grafo:
             return
         
         # Eliminar de u -> v
-        if eliminar_todas:
-            self.ady[u] = [t for t in self.ady[u] if t[0] != v]
-        else:
-            for i, t in enumerate(self.ady[u]):
-                if t[0] == v:
-                    del self.ady[u][i]
-                    break
+        posiciones = self._posiciones.get((u, v))
+        if posiciones:
+            self._quitar_aristas(u, posiciones if eliminar_todas else posiciones[:1])
         
         # Si no es dirigido, eliminar también de v -> u
         if not self.dirigido:
-            if v in self.ady:
-                if eliminar_todas:
-                    self.ady[v] = [t for t in self.ady[v] if t[0] != u]
-                else:
-                    for i, t in enumerate(self.ady[v]):
-                        if t[0] == u:
-                            del self.ady[v][i]
-                            break
+            posiciones = self._posiciones.get((v, u))
+            if posiciones:
+                self._quitar_aristas(v, posiciones if eliminar_todas else posiciones[:1])
+
+    def actualizar_pesos(self, lote: Iterable[Tuple[str, str, float]], todas: bool=False) -> int:
+        """
+        Cambia el peso de varias aristas existentes en el lugar (por ejemplo,
+        con los tiempos de un feed de tráfico).
+
+        A diferencia de eliminar e insertar, no recorre ni reordena las
+        listas de adyacencia y conserva los metadatos de cada arista. El lote
+        es atómico: primero se valida completo y, si alguna arista no existe,
+        no se cambia nada. La versión del grafo sube una sola vez por lote.
+
+        Parámetros:
+            lote (iterable): Tríos (u, v, nuevo_peso); si un par se repite,
+                             queda el último peso
+            todas (bool): Si True, cambia todas las aristas paralelas u->v
+                          Si False, solo la primera (como `eliminar_arista`)
+
+        Retorna:
+            int: Número de aristas dirigidas actualizadas
+
+        Lanza:
+            KeyError: Si alguna arista u->v no existe
+
+        Nota: Si el grafo no es dirigido, también se actualiza v -> u.
+        """
+        cambios: Dict[Tuple[str, str], float] = {}
+        for u, v, peso in lote:
+            cambios[(u, v)] = peso
+            if not self.dirigido:
+                cambios[(v, u)] = peso
+
+        posiciones = self._posiciones
+        for par in cambios:
+            if par not in posiciones:
+                raise KeyError(f"No existe la arista {par[0]} -> {par[1]}")
+
+        actualizadas = 0
+        for (u, v), peso in cambios.items():
+            lst = self.ady[u]
+            ps = posiciones[(u, v)]
+            for p in (ps if todas else ps[:1]):
+                lst[p] = (v, peso, lst[p][2])
+            actualizadas += len(ps) if todas else 1
+        if self._tocados is not None:
+            self._tocados.update(x for par in cambios for x in par)
+        if cambios:
+            self.version += 1
+        return actualizadas
+
+    def _agregar_arista(self, u: str, v: str, peso: float, meta: Dict[str, Any]):
+        """Agrega la arista dirigida u -> v al final de ady[u] y a los índices."""
+        lst = self.ady[u]
+        self._posiciones.setdefault((u, v), []).append(len(lst))
+        lst.append((v, peso, meta))
+        entrantes = self._entrantes[v]
+        entrantes[u] = entrantes.get(u, 0) + 1
+        if self._componentes is not None:
+            self._componentes.unir(u, v)
+        if self._tocados is not None:
+            self._tocados.update((u, v))
+        self.version += 1
+
+    def _quitar_aristas(self, u: str, posiciones: List[int]):
+        """
+        Quita de ady[u] las aristas en `posiciones` manteniendo el orden del
+        resto y actualiza los índices. Solo recorre ady[u] desde la primera
+        posición quitada: O(grado de u).
+        """
+        lst = self.ady[u]
+        quitar = set(posiciones)
+        primera = min(quitar)
+        cola = lst[primera:]
+        
+        # Descontar las aristas quitadas en el índice de entrantes
+        for i in quitar:
+            v = lst[i][0]
+            entrantes = self._entrantes[v]
+            entrantes[u] -= 1
+            if not entrantes[u]:
+                del entrantes[u]
+            if self._tocados is not None:
+                self._tocados.add(v)
+        
+        # Rearmar el final de la lista y las posiciones que se corrieron
+        for v in {t[0] for t in cola}:
+            restantes = [p for p in self._posiciones[(u, v)] if p < primera]
+            if restantes:
+                self._posiciones[(u, v)] = restantes
+            else:
+                del self._posiciones[(u, v)]
+        del lst[primera:]
+        for i, t in enumerate(cola, primera):
+            if i not in quitar:
+                self._posiciones.setdefault((u, t[0]), []).append(len(lst))
+                lst.append(t)
+        self._componentes = None  # Quitar aristas puede partir una componente
+        if self._tocados is not None:
+            self._tocados.add(u)
+        self.version += 1
+
+    def _aristas_entrantes(self, v: str):
+        """Genera los tríos (u, peso, meta) de las aristas que llegan a v."""
+        for u in self._entrantes.get(v, ()):
+            lst = self.ady[u]
+            for p in self._posiciones[(u, v)]:
+                _v, peso, meta = lst[p]
+                yield u, peso, meta
 
     def bfs(self, inicio_id: str):
         """
@@ -240,24 +977,42 @@ class Grafo:
         Lanza:
             KeyError: Si el nodo inicio no existe
         """
+        return list(self.bfs_iter(inicio_id))
+
+    def bfs_iter(self, inicio_id: str):
+        """
+        Versión perezosa de `bfs`: entrega los nodos a medida que los visita.
+
+        Permite detener el recorrido en cualquier momento sin armar la lista
+        completa. Usa una cola doble (deque), así cada paso es O(1) y el
+        recorrido completo es O(V + E).
+
+        Parámetros:
+            inicio_id (str): ID del nodo inicial
+
+        Retorna:
+            iterador: IDs de los nodos en el orden de visita
+
+        Lanza:
+            KeyError: Si el nodo inicio no existe (al llamar, no al iterar)
+        """
         if inicio_id not in self.nodos:
             raise KeyError("Nodo inicio no existe")
-        
-        visitados = set([inicio_id])
-        cola = [inicio_id]
-        orden = []
+        return self._bfs_iter(inicio_id)
+
+    def _bfs_iter(self, inicio_id: str):
+        visitados = {inicio_id}
+        cola = deque([inicio_id])
         
         while cola:
-            u = cola.pop(0)  # Tomar el primer elemento (FIFO)
-            orden.append(u)
+            u = cola.popleft()  # Tomar el primer elemento (FIFO)
+            yield u
             
             # Explorar todos los vecinos
             for v, *_ in self.ady.get(u, []):
                 if v not in visitados:
                     visitados.add(v)
                     cola.append(v)
-        
-        return orden
 
     def dfs(self, inicio_id: str):
         """
@@ -275,47 +1030,98 @@ class Grafo:
         Lanza:
             KeyError: Si el nodo inicio no existe
         """
+        return list(self.dfs_iter(inicio_id))
+
+    def dfs_iter(self, inicio_id: str):
+        """
+        Versión perezosa de `dfs`: entrega los nodos a medida que los visita.
+
+        Es iterativa (pila explícita), así no depende del límite de recursión
+        de Python y funciona en caminos de cualquier largo. El orden de visita
+        es el mismo de la versión recursiva.
+
+        Parámetros:
+            inicio_id (str): ID del nodo inicial
+
+        Retorna:
+            iterador: IDs de los nodos en el orden de visita
+
+        Lanza:
+            KeyError: Si el nodo inicio no existe (al llamar, no al iterar)
+        """
         if inicio_id not in self.nodos:
             raise KeyError("Nodo inicio no existe")
+        return self._dfs_iter(inicio_id)
+
+    def _dfs_iter(self, inicio_id: str):
+        visitados = {inicio_id}
+        yield inicio_id
+        # Pila de iteradores: cada nivel recuerda por qué vecino iba
+        pila = [iter(self.ady.get(inicio_id, []))]
         
-        visitados = set()
-        orden = []
-        
-        def _dfs(u):
-            """Función recursiva para DFS"""
-            visitados.add(u)
-            orden.append(u)
-            
-            # Explorar recursivamente todos los vecinos no visitados
-            for v, *_ in self.ady.get(u, []):
+        while pila:
+            for v, *_ in pila[-1]:
                 if v not in visitados:
-                    _dfs(v)
-        
-        _dfs(inicio_id)
-        return orden
+                    visitados.add(v)
+                    yield v
+                    pila.append(iter(self.ady.get(v, [])))
+                    break
+            else:
+                pila.pop()  # Sin vecinos pendientes: retroceder
 
-    def dijkstra(self, inicio_id: str, objetivo_id=None):
+    def dijkstra(self, inicio_id: str, objetivo_id=None, salida: Optional[float]=None):
         """
         Algoritmo de Dijkstra para encontrar caminos más cortos.
         
         Calcula la distancia mínima desde el nodo inicio a todos los otros nodos.
         Utiliza una cola de prioridad (heap) para eficiencia.
+
+        Con `salida`, las aristas con perfil de tiempos (`meta["perfil"]`)
+        cuestan el tiempo de viaje a la hora en que se llega a ellas
+        (salida + tiempo acumulado); las demás cuestan su `peso`. Como los
+        perfiles son FIFO, el resultado sigue siendo óptimo.
         
         Parámetros:
             inicio_id (str): ID del nodo inicial
-            objetivo_id (str, opcional): Si se especifica, detiene al alcanzar este nodo
+            objetivo_id (str, opcional): Si se especifica, detiene al alcanzar este
+                                         nodo (solo su distancia queda garantizada)
+            salida (float, opcional): Hora de salida, en la unidad de los perfiles
             
         Retorna:
             tuple: (distancias, predecesores)
                 - distancias: dict con la distancia mínima a cada nodo
                 - predecesores: dict con el nodo previo en el camino óptimo
+            Con `salida`, las distancias son tiempos de viaje desde esa hora.
+            Con la caché activa (`activar_cache`) ambos son vistas de solo
+            lectura compartidas entre consultas iguales.
                 
         Lanza:
             KeyError: Si el nodo inicio no existe
         """
         if inicio_id not in self.nodos:
             raise KeyError("Nodo inicio no existe")
-        
+        if self._cache is None:
+            return self._dijkstra(inicio_id, objetivo_id, salida)
+
+        clave = ("dijkstra", inicio_id, objetivo_id, salida)
+        resultado = self._cache.obtener(clave, self.version)
+        if resultado is None:
+            dist, prev = self._dijkstra(inicio_id, objetivo_id, salida)
+            resultado = (MappingProxyType(dist), MappingProxyType(prev))
+            self._cache.guardar(clave, resultado)
+        return resultado
+
+    def _dijkstra(self, inicio_id: str, objetivo_id=None, salida: Optional[float]=None):
+        """Dijkstra sin caché (ver `dijkstra`)."""
+        if (objetivo_id is not None and objetivo_id in self.nodos
+                and self._desconectados(inicio_id, objetivo_id)):
+            # Sin ruta al objetivo: no hace falta recorrer la componente del inicio
+            dist = {node_id: float('inf') for node_id in self.nodos}
+            dist[inicio_id] = 0.0
+            return dist, {node_id: None for node_id in self.nodos}
+        if salida is not None:
+            return self._dijkstra_horario(inicio_id, objetivo_id, salida)
+
         # Inicializar distancias como infinito, excepto el nodo inicio
         dist = {node_id: float('inf') for node_id in self.nodos}
         prev = {node_id: None for node_id in self.nodos}
@@ -344,6 +1150,30 @@ class Grafo:
         
         return dist, prev
 
+    def _dijkstra_horario(self, inicio_id: str, objetivo_id, salida: float):
+        """Dijkstra dependiente de la hora: el costo de cada arista se evalúa al llegar a ella."""
+        dist = {node_id: float('inf') for node_id in self.nodos}
+        prev = {node_id: None for node_id in self.nodos}
+        dist[inicio_id] = 0.0
+        heap = [(0.0, inicio_id)]
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if objetivo_id is not None and u == objetivo_id:
+                break
+            hora = salida + d
+            for v, peso, meta in self.ady.get(u, []):
+                perfil = meta.get("perfil")
+                nd = d + (tiempo_viaje(perfil, hora) if perfil is not None else peso)
+                if nd < dist[v]:
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        return dist, prev
+
     def reconstruir_camino(self, prev, objetivo_id):
         """
         Reconstruye el camino óptimo usando los predecesores de Dijkstra.
@@ -366,6 +1196,450 @@ class Grafo:
         camino.reverse()  # Invertir para obtener el orden correcto
         return camino
 
+    def ruta(self, origen: str, destino: str, algoritmo: str="bidireccional",
+             heuristica: Optional[Callable[[str], float]]=None):
+        """
+        Calcula el camino más corto entre dos nodos concretos.
+
+        A diferencia de `dijkstra`, que explora desde un solo lado, estas
+        variantes están pensadas para consultas origen -> destino:
+        - "bidireccional": Dijkstra simultáneo desde el origen y desde el destino
+        - "astar": A* guiado por una heurística admisible
+        - "dijkstra": Dijkstra normal (útil para comparar el trabajo realizado)
+
+        Para "astar", si no se pasa `heuristica` se usa la distancia en línea
+        recta entre las coordenadas `meta["lat"]` y `meta["lon"]` de cada nodo
+        y las del destino (0 si faltan). Solo es admisible si los pesos de las
+        aristas son kilómetros reales (nunca menores a la línea recta). También
+        se puede pasar cualquier cota inferior, por ejemplo una de landmarks.
+
+        "dijkstra" da el mismo camino que `dijkstra` + `reconstruir_camino`.
+        "bidireccional" y "astar" dan el mismo costo (salvo el último decimal
+        por redondeo cuando varios caminos empatan), pero con empates pueden
+        devolver otro de los caminos igual de cortos: reproducir la elección
+        de `dijkstra` exigiría las distancias exactas desde el origen de todos
+        los nodos que empatan, es decir, una búsqueda completa hacia adelante.
+
+        Parámetros:
+            origen (str): ID del nodo de partida
+            destino (str): ID del nodo de llegada
+            algoritmo (str): "bidireccional", "astar" o "dijkstra"
+            heuristica (callable, opcional): función node_id -> cota inferior
+                                             de la distancia hasta `destino`
+
+        Retorna:
+            dict: {"camino": lista de ids (vacía si no hay ruta),
+                   "costo": distancia total (inf si no hay ruta),
+                   "asentados": cantidad de nodos asentados durante la búsqueda}
+
+        Lanza:
+            KeyError: Si el origen o el destino no existen
+            ValueError: Si el algoritmo no es válido
+        """
+        if origen not in self.nodos:
+            raise KeyError("Nodo inicio no existe")
+        if destino not in self.nodos:
+            raise KeyError("Nodo destino no existe")
+        if self._desconectados(origen, destino):
+            return {"camino": [], "costo": float('inf'), "asentados": 0}
+        if self._cache is None or heuristica is not None:
+            return self._ruta(origen, destino, algoritmo, heuristica)
+
+        clave = ("ruta", origen, destino, algoritmo)
+        resultado = self._cache.obtener(clave, self.version)
+        if resultado is None:
+            resultado = self._ruta(origen, destino, algoritmo, heuristica)
+            self._cache.guardar(clave, resultado)
+        # Copia para que quien llama pueda modificar el resultado sin tocar la caché
+        return {**resultado, "camino": list(resultado["camino"])}
+
+    def _ruta(self, origen: str, destino: str, algoritmo: str,
+              heuristica: Optional[Callable[[str], float]]):
+        """Consulta punto a punto sin caché (ver `ruta`)."""
+        if algoritmo == "bidireccional":
+            camino, asentados = self._ruta_bidireccional(origen, destino)
+        elif algoritmo == "astar":
+            if heuristica is None:
+                heuristica = self._heuristica_coordenadas(destino)
+            camino, asentados = self._ruta_astar(origen, destino, heuristica)
+        elif algoritmo == "dijkstra":
+            camino, asentados = self._ruta_astar(origen, destino, lambda _: 0.0)
+        else:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}")
+
+        return {"camino": camino, "costo": self._costo_camino(camino),
+                "asentados": asentados}
+
+    def k_mas_cercanos(self, origen: str, categoria: str, k: int,
+                       radio_max: Optional[float]=None):
+        """
+        Encuentra los k nodos más cercanos de una categoría (ej: 5 clínicas).
+
+        Ejecuta un Dijkstra acotado que se detiene apenas asienta k nodos de
+        la categoría o cuando la distancia supera `radio_max`, sin recorrer
+        todo el grafo.
+
+        Parámetros:
+            origen (str): ID del nodo de partida
+            categoria (str): Categoría buscada (insensible a mayúsculas)
+            k (int): Cantidad máxima de resultados
+            radio_max (float, opcional): Distancia máxima permitida
+
+        Retorna:
+            list: Hasta k diccionarios {"id", "distancia", "camino"} ordenados
+                  de menor a mayor distancia (incluye al origen si es de la categoría)
+
+        Lanza:
+            KeyError: Si el nodo origen no existe
+        """
+        if origen not in self.nodos:
+            raise KeyError("Nodo inicio no existe")
+        objetivos = self._por_categoria.get(categoria.lower(), {})
+        if k <= 0 or not objetivos:
+            return []
+
+        dist = {origen: 0.0}
+        prev: Dict[str, Optional[str]] = {origen: None}
+        heap = [(0.0, origen)]
+        resultados = []
+
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if radio_max is not None and d > radio_max:
+                break
+
+            if u in objetivos:
+                resultados.append({"id": u, "distancia": d,
+                                   "camino": self.reconstruir_camino(prev, u)})
+                if len(resultados) == k:
+                    break
+
+            for v, peso, _meta in self.ady.get(u, []):
+                nd = d + peso
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        return resultados
+
+    def rutas_pareto(self, origen: str, destino: str, criterios: Tuple[str, ...]=("peso", "tiempo"),
+                     tolerancia: float=0.0) -> List[Dict[str, Any]]:
+        """
+        Encuentra todas las rutas no dominadas según varios criterios a la vez
+        (ej: la más corta, la más rápida y los compromisos entre ambas).
+
+        Cada arista aporta un vector de costos: el criterio "peso" es su peso
+        y cualquier otro nombre se lee de sus metadatos (ej: `meta["tiempo"]`).
+        Una ruta domina a otra si no es peor en ningún criterio. La búsqueda
+        es multi-etiqueta (Pareto) en una sola pasada y descarta etiquetas:
+        - dominadas por otra etiqueta del mismo nodo
+        - que, sumando una cota inferior de lo que falta hasta el destino
+          (un Dijkstra hacia atrás por criterio), ya quedan dominadas por
+          una ruta encontrada
+        Para que esa poda actúe desde el principio, antes de la búsqueda se
+        cargan como encontradas la mejor ruta de cada criterio (salen de esos
+        mismos Dijkstra) y, con dos criterios, algunas rutas que minimizan
+        combinaciones de ambos.
+
+        Parámetros:
+            origen (str): ID del nodo de partida
+            destino (str): ID del nodo de llegada
+            criterios (tuple): Nombres de los criterios (no negativos)
+            tolerancia (float): Con 0 el frente es exacto. Con por ejemplo
+                                0.05 se descartan las rutas que no mejoran
+                                en más de un 5% alguna ya encontrada: el
+                                frente es más chico y la búsqueda más rápida,
+                                y toda ruta no dominada queda a menos de un
+                                5% de alguna de las retornadas
+
+        Retorna:
+            list: [{"camino": lista de ids, "costos": {criterio: valor}}, ...]
+                  ordenada por el primer criterio (vacía si no hay ruta). Si
+                  dos rutas empatan en todo, se devuelve solo una.
+
+        Lanza:
+            KeyError: Si el origen o el destino no existen
+            ValueError: Si alguna arista recorrida no tiene un criterio
+        """
+        if origen not in self.nodos:
+            raise KeyError("Nodo inicio no existe")
+        if destino not in self.nodos:
+            raise KeyError("Nodo destino no existe")
+        if self._desconectados(origen, destino):
+            return []
+
+        def costos(u: str, v: str, peso: float, meta) -> Tuple[float, ...]:
+            try:
+                return tuple(peso if c == "peso" else meta[c] for c in criterios)
+            except KeyError as e:
+                raise ValueError(f"La arista {u} -> {v} no tiene el criterio {e}")
+
+        inf = float('inf')
+        holgura = 1.0 + tolerancia
+        # Etiqueta: (costos, nodo, índice de la etiqueta anterior)
+        etiquetas: List[Tuple[Tuple[float, ...], str, int]] = [((0.0,) * len(criterios), origen, -1)]
+        frentes: Dict[str, _Frente] = {origen: _Frente()}  # Etiquetas vivas de cada nodo
+        frentes[origen].agregar(etiquetas[0][0], 0)
+        llegadas = frentes.setdefault(destino, _Frente())
+        descartadas = set()
+
+        def sembrar(pasos: List[Tuple[str, Tuple[float, ...]]]) -> Tuple[float, ...]:
+            """Agrega a las llegadas una ruta ya conocida; retorna su costo."""
+            i, total = 0, etiquetas[0][0]
+            for v, c in pasos:
+                total = tuple(x + y for x, y in zip(total, c))
+                etiquetas.append((total, v, i))
+                i = len(etiquetas) - 1
+            if not llegadas.domina(total):
+                descartadas.update(llegadas.agregar(total, i))
+            return total
+
+        # Cotas inferiores hasta el destino y la mejor ruta de cada criterio
+        cotas = []
+        extremos = []
+        for j in range(len(criterios)):
+            dist, siguiente = self._cotas_hacia(destino, j, costos)
+            if origen not in dist:
+                return []
+            cotas.append(dist)
+            pasos = []
+            u = origen
+            while u != destino:
+                u, c = siguiente[u]
+                pasos.append((u, c))
+            extremos.append(sembrar(pasos))
+
+        # Con dos criterios, rutas intermedias con pesos combinados (método
+        # dicotómico): llenan el frente desde el principio y podan mucho más
+        if len(criterios) == 2:
+            pendientes = [(extremos[0], extremos[1])]
+            for _ in range(_SEMILLAS_PARETO):
+                if not pendientes:
+                    break
+                a, b = pendientes.pop()
+                w = (a[1] - b[1], b[0] - a[0])  # Normal al segmento a-b
+                if w[0] <= 0 or w[1] <= 0:
+                    continue
+                pasos = self._camino_combinado(origen, destino, w, costos)
+                r = sembrar(pasos)
+                if w[0] * r[0] + w[1] * r[1] < (w[0] * a[0] + w[1] * a[1]) * (1 - 1e-9):
+                    pendientes += [(a, r), (r, b)]
+        heap = [(etiquetas[0][0], 0)]  # Orden lexicográfico: cada etiqueta sacada es definitiva
+
+        while heap:
+            c, i = heapq.heappop(heap)
+            if i in descartadas:
+                continue
+            u = etiquetas[i][1]
+            if u == destino:
+                continue
+            for v, peso, meta in self.ady.get(u, []):
+                nc = tuple(x + y for x, y in zip(c, costos(u, v, peso, meta)))
+                optimista = tuple(x + cota.get(v, inf) for x, cota in zip(nc, cotas))
+                if optimista[0] == inf:
+                    continue
+                # Ya hay una ruta mejor que lo mejor que se podría lograr por aquí
+                if llegadas.domina(optimista, holgura):
+                    continue
+                frente = frentes.get(v)
+                if frente is None:
+                    frente = frentes[v] = _Frente()
+                elif frente.domina(nc):
+                    continue
+                # Las etiquetas de v que la nueva domina quedan descartadas
+                descartadas.update(frente.agregar(nc, len(etiquetas)))
+                heapq.heappush(heap, (nc, len(etiquetas)))
+                etiquetas.append((nc, v, i))
+
+        rutas = []
+        for j in sorted(llegadas.etiquetas, key=lambda j: etiquetas[j][0]):
+            camino = []
+            k = j
+            while k >= 0:
+                camino.append(etiquetas[k][1])
+                k = etiquetas[k][2]
+            camino.reverse()
+            rutas.append({"camino": camino, "costos": dict(zip(criterios, etiquetas[j][0]))})
+        return rutas
+
+    def _camino_combinado(self, origen: str, destino: str, w: Tuple[float, ...],
+                          costos: Callable) -> List[Tuple[str, Tuple[float, ...]]]:
+        """
+        Dijkstra con el peso combinado sum(w[j] * criterio j). Retorna el
+        camino como pares (nodo, costos de la arista usada para llegar).
+        """
+        dist = {origen: 0.0}
+        prev: Dict[str, Tuple[str, Tuple[float, ...]]] = {}
+        heap = [(0.0, origen)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if u == destino:
+                break
+            for v, peso, meta in self.ady.get(u, []):
+                c = costos(u, v, peso, meta)
+                nd = d + sum(x * y for x, y in zip(w, c))
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    prev[v] = (u, c)
+                    heapq.heappush(heap, (nd, v))
+        pasos = []
+        v = destino
+        while v != origen:
+            u, c = prev[v]
+            pasos.append((v, c))
+            v = u
+        pasos.reverse()
+        return pasos
+
+    def _cotas_hacia(self, destino: str, j: int, costos: Callable):
+        """
+        Dijkstra hacia atrás desde el destino con el criterio j.
+
+        Retorna:
+            tuple: (dist, siguiente) con la distancia mínima de cada nodo al
+                   destino (solo los que pueden llegar) y, por nodo, el
+                   siguiente nodo de ese camino con el vector de costos de
+                   la arista usada
+        """
+        dist = {destino: 0.0}
+        siguiente: Dict[str, Tuple[str, Tuple[float, ...]]] = {}
+        heap = [(0.0, destino)]
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > dist[v]:
+                continue
+            for u, peso, meta in self._aristas_entrantes(v):
+                c = costos(u, v, peso, meta)
+                nd = d + c[j]
+                if nd < dist.get(u, float('inf')):
+                    dist[u] = nd
+                    siguiente[u] = (v, c)
+                    heapq.heappush(heap, (nd, u))
+        return dist, siguiente
+
+    def _costo_camino(self, camino: List[str]) -> float:
+        """
+        Suma los pesos del camino en el mismo orden en que lo hace `dijkstra`
+        (usando la arista más liviana entre cada par), para que el costo sea
+        idéntico al que reporta `dijkstra`.
+        """
+        if not camino:
+            return float('inf')
+        costo = 0.0
+        for u, v in zip(camino, camino[1:]):
+            costo = costo + min(peso for w, peso, _meta in self.ady[u] if w == v)
+        return costo
+
+    def _heuristica_coordenadas(self, destino: str) -> Callable[[str], float]:
+        """
+        Heurística de línea recta hasta `destino` usando `meta["lat"]`/`meta["lon"]`.
+
+        Retorna 0 para cualquier nodo sin coordenadas (sigue siendo admisible).
+        """
+        coordenadas_destino = self.nodos[destino].coordenadas()
+        if coordenadas_destino is None:
+            return lambda _: 0.0
+        lat_t, lon_t = coordenadas_destino
+        nodos = self.nodos
+
+        def h(node_id: str) -> float:
+            meta = nodos[node_id].metadatos()
+            if "lat" not in meta or "lon" not in meta:
+                return 0.0
+            return distancia_haversine(meta["lat"], meta["lon"], lat_t, lon_t)
+
+        return h
+
+    def _ruta_astar(self, origen: str, destino: str, h: Callable[[str], float]):
+        """
+        Búsqueda A* desde `origen` hasta `destino` (Dijkstra si h es 0).
+
+        Retorna:
+            tuple: (camino, nodos asentados)
+        """
+        dist = {origen: 0.0}
+        prev: Dict[str, Optional[str]] = {origen: None}
+        cotas: Dict[str, float] = {}  # Heurística ya evaluada por nodo
+        heap = [(h(origen), 0.0, origen)]  # (distancia + cota, distancia, nodo)
+        asentados = 0
+
+        while heap:
+            _f, d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            asentados += 1
+            if u == destino:
+                return self.reconstruir_camino(prev, destino), asentados
+
+            for v, peso, _meta in self.ady.get(u, []):
+                nd = d + peso
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    prev[v] = u
+                    if v not in cotas:
+                        cotas[v] = h(v)
+                    heapq.heappush(heap, (nd + cotas[v], nd, v))
+
+        return [], asentados
+
+    def _ruta_bidireccional(self, origen: str, destino: str):
+        """
+        Dijkstra bidireccional: avanza desde ambos extremos y se detiene
+        cuando la suma de los mínimos de ambas colas alcanza el mejor
+        camino conocido.
+
+        Retorna:
+            tuple: (camino, nodos asentados)
+        """
+        dist = ({origen: 0.0}, {destino: 0.0})  # 0: hacia adelante, 1: hacia atrás
+        prev: Tuple[Dict[str, Optional[str]], Dict[str, Optional[str]]] = ({origen: None}, {destino: None})
+        heaps = ([(0.0, origen)], [(0.0, destino)])
+        mejor = 0.0 if origen == destino else float('inf')
+        encuentro = origen if origen == destino else None
+        asentados = 0
+
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= mejor:
+                break
+
+            # Avanzar por el lado con la cola de menor distancia
+            lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            d, u = heapq.heappop(heaps[lado])
+            dist_lado, dist_otro = dist[lado], dist[1 - lado]
+            if d > dist_lado[u]:
+                continue
+            asentados += 1
+
+            if lado == 0 or not self.dirigido:
+                vecinos = self.ady.get(u, [])
+            else:
+                vecinos = self._aristas_entrantes(u)
+            for v, peso, *_ in vecinos:
+                nd = d + peso
+                if nd < dist_lado.get(v, float('inf')):
+                    dist_lado[v] = nd
+                    prev[lado][v] = u
+                    heapq.heappush(heaps[lado], (nd, v))
+                if v in dist_otro and dist_lado[v] + dist_otro[v] < mejor:
+                    mejor = dist_lado[v] + dist_otro[v]
+                    encuentro = v
+
+        if encuentro is None:
+            return [], asentados
+
+        # Unir la mitad hacia adelante con la mitad hacia atrás
+        camino = self.reconstruir_camino(prev[0], encuentro)
+        u = prev[1][encuentro]
+        while u is not None:
+            camino.append(u)
+            u = prev[1][u]
+        return camino, asentados
+
     def listar_nodos(self):
         """
         Obtiene información de todos los nodos en formato diccionario.
@@ -383,3 +1657,143 @@ class Grafo:
             dict: Estructura {nodo_origen: [(nodo_destino, peso, metadatos), ...], ...}
         """
         return self.ady
+
+    # Caché de rutas
+
+    def activar_cache(self, capacidad: int=128):
+        """
+        Activa una caché LRU para `dijkstra` y `ruta`.
+
+        Las consultas repetidas (mismo origen y, si aplica, mismo destino y
+        algoritmo) se responden sin volver a calcular. Cualquier
+        `insertar_*`/`eliminar_*` cambia la versión del grafo e invalida la
+        caché. Los cambios hechos directamente sobre los objetos (por ejemplo
+        editar `ady` a mano) no se detectan: en ese caso llamar `limpiar()` sobre
+        la caché retornada.
+        Las consultas de `ruta` con una heurística propia no se guardan.
+
+        Parámetros:
+            capacidad (int): Máximo de resultados guardados
+
+        Retorna:
+            CacheRutas: La caché creada (con sus contadores)
+        """
+        self._cache = CacheRutas(capacidad)
+        return self._cache
+
+    def desactivar_cache(self):
+        """Desactiva la caché de rutas y libera los resultados guardados."""
+        self._cache = None
+
+    def estadisticas_cache(self) -> Optional[Dict[str, int]]:
+        """
+        Contadores de la caché de rutas (None si no está activa).
+
+        Retorna:
+            dict: {"aciertos", "fallos", "desalojos", "invalidaciones",
+                   "entradas", "capacidad"}
+        """
+        return None if self._cache is None else self._cache.estadisticas()
+
+    def congelar(self):
+        """
+        Crea una copia compacta de solo lectura del grafo (formato CSR).
+
+        La copia usa índices enteros y arreglos contiguos, ocupa mucha menos
+        memoria y ofrece `bfs`, `dfs` y `dijkstra` con los mismos resultados.
+        Los cambios posteriores en el grafo NO se reflejan en la copia.
+
+        Retorna:
+            GrafoCSR: Representación congelada del grafo
+        """
+        from csr import GrafoCSR  # type: ignore
+        return GrafoCSR.desde_grafo(self)
+
+    def preparar_landmarks(self, cantidad: int=8, seleccion: str="lejanos",
+                           workers: Optional[int]=None):
+        """
+        Preprocesamiento ALT: elige landmarks y guarda las distancias desde y
+        hacia cada uno (ver `landmarks.Landmarks`). Sus cotas guían A* sin
+        necesitar coordenadas:
+            lm = g.preparar_landmarks()
+            g.ruta(o, d, algoritmo="astar", heuristica=lm.heuristica(d))
+
+        Parámetros:
+            cantidad (int): Número de landmarks
+            seleccion (str): "lejanos" (tablas en paralelo) o "evitar"
+            workers (int, opcional): Procesos para calcular las tablas
+
+        Retorna:
+            Landmarks: Tablas de distancias (se pueden guardar con `guardar`)
+        """
+        from landmarks import Landmarks  # type: ignore
+        return Landmarks.desde_grafo(self, cantidad, seleccion, workers)
+
+    def matriz_distancias(self, origenes: Iterable[str], destinos: Iterable[str],
+                          workers: Optional[int]=None, pool=None):
+        """
+        Calcula la matriz de distancias mínimas entre orígenes y destinos
+        (ej: 2.000 hoteles x 300 sedes del evento).
+
+        Reparte los Dijkstra de cada origen entre varios procesos, que
+        comparten el grafo en modo solo lectura (ver
+        `GrafoCSR.matriz_distancias`). Cada búsqueda se detiene apenas
+        alcanza todos los destinos. La copia congelada y su archivo se
+        reutilizan entre llamadas mientras el grafo no cambie.
+
+        Parámetros:
+            origenes (iterable): Ids de los nodos de origen (filas)
+            destinos (iterable): Ids de los nodos de destino (columnas)
+            workers (int, opcional): Procesos a usar; por defecto uno por
+                                     núcleo, 1 para no usar procesos
+            pool (multiprocessing.Pool, opcional): Procesos propios para
+                                                   reutilizar entre llamadas
+
+        Retorna:
+            list: Una fila `array('d')` (float64) por origen, con las
+                  distancias a los destinos en el mismo orden (inf si no
+                  hay camino). Con NumPy, `np.array(matriz)` da la matriz 2D.
+
+        Lanza:
+            KeyError: Si algún origen o destino no existe
+        """
+        return self._copia_congelada().matriz_distancias(list(origenes), list(destinos),
+                                                        workers, pool)
+
+    def _copia_congelada(self):
+        """
+        Copia CSR de uso interno, reutilizada mientras `version` no cambie
+        (a diferencia de `congelar`, que siempre crea una copia nueva).
+        """
+        if self._congelada is None or self._congelada[0] != self.version:
+            self._congelada = (self.version, self.congelar())
+        return self._congelada[1]
+
+    def guardar(self, ruta: str, metadatos: bool=True):
+        """
+        Guarda una instantánea binaria del grafo (ver `GrafoCSR.guardar`).
+
+        Parámetros:
+            ruta (str): Archivo de destino
+            metadatos (bool): Si se incluyen los datos de nodos y aristas
+        """
+        self.congelar().guardar(ruta, metadatos)
+
+    @staticmethod
+    def abrir(ruta: str, mmap: bool=True):
+        """
+        Abre una instantánea guardada con `guardar`.
+
+        Con `mmap=True` el archivo se mapea en memoria sin copiarlo: varios
+        procesos que abren el mismo archivo comparten una sola copia física y
+        las consultas de solo lectura pueden empezar casi de inmediato.
+
+        Parámetros:
+            ruta (str): Archivo a abrir
+            mmap (bool): Mapear el archivo (True) o leerlo completo (False)
+
+        Retorna:
+            GrafoCSR: Grafo de solo lectura con `bfs`, `dfs` y `dijkstra`
+        """
+        from csr import GrafoCSR  # type: ignore
+        return GrafoCSR.abrir(ruta, usar_mmap=mmap)
@@ -0,0 +1,444 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Landmarks (ALT: A*, Landmarks y desigualdad Triangular).
+
+Se eligen unos pocos nodos de referencia (landmarks) y se guardan las
+distancias desde y hacia cada uno. Por la desigualdad triangular, para
+cualquier landmark L:
+    d(u, v) >= d(L, v) - d(L, u)    y    d(u, v) >= d(u, L) - d(v, L)
+    d(u, v) <= d(u, L) + d(L, v)
+El máximo de las cotas inferiores es una heurística admisible para A*
+(`heuristica`) que no necesita coordenadas, y ambas cotas sirven para
+estimar distancias al instante (`estimar`, `clasificar`).
+
+El preprocesamiento es mucho más barato que una jerarquía de contracción:
+un Dijkstra completo por landmark (dos en grafos dirigidos).
+
+Ejemplo de uso:
+    lm = g.preparar_landmarks(8)
+    g.ruta("H1", "C3", algoritmo="astar", heuristica=lm.heuristica("C3"))
+    lm.guardar("red.lm")
+    lm = Landmarks.abrir("red.lm")
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+from array import array
+import json
+import mmap
+import random
+import struct
+import sys
+
+# Formato binario (little-endian). Encabezado de 64 bytes:
+#   magic (8s) | versión (I) | banderas (I) | n nodos (Q) | L landmarks (Q) |
+#   largo del JSON de ids (Q) | versión del grafo (q, -1 si no se sabe);
+#   después el JSON (utf-8) alineado a 8 bytes,
+#   los índices de los landmarks ('q', L) y las tablas ('d', L*n cada una):
+#   distancias desde cada landmark y, si es dirigido, hacia cada landmark
+MAGIC = b"SRLANDM\0"
+VERSION_BINARIO = 2
+_ENCABEZADO = struct.Struct("<8sIIQQQq")
+_TAMANO_ENCABEZADO = 64
+_DIRIGIDO = 1
+
+SELECCIONES = ("lejanos", "evitar")
+
+
+# CLASE: LANDMARKS
+
+class Landmarks:
+    """
+    Tablas de distancias desde y hacia un conjunto de landmarks.
+
+    Las tablas son arreglos contiguos de float64 (n por landmark), así
+    pesan 8 bytes por nodo y landmark (el doble en grafos dirigidos).
+    Quedan fijas al momento de calcularlas: si después bajan pesos o se
+    agregan aristas, las cotas pueden dejar de ser admisibles y hay que
+    recalcularlas (`version` guarda la versión del grafo usada).
+    """
+
+    def __init__(self, ids, landmarks: List[int], desde: List, hacia: Optional[List]=None,
+                 dirigido: bool=False, version: Optional[int]=None):
+        """
+        Parámetros:
+            ids (list): Ids de los nodos ordenados (índice -> id)
+            landmarks (list): Índices de los landmarks
+            desde (list): desde[k][v] = d(landmark k, v), un arreglo por landmark
+            hacia (list, opcional): hacia[k][v] = d(v, landmark k); si el grafo
+                                    no es dirigido es igual a `desde`
+            dirigido (bool): Si el grafo original era dirigido
+            version (int, opcional): Versión del grafo con la que se calcularon
+        """
+        self.ids = ids
+        self.landmarks = landmarks
+        self.desde = desde
+        self.hacia = hacia if hacia is not None else desde
+        self.dirigido = dirigido
+        self.version = version
+        self._indices: Optional[Dict[str, int]] = None
+        self._buffer = None  # mmap o bytes del archivo del que se abrió
+
+    def __len__(self):
+        """Cantidad de landmarks."""
+        return len(self.landmarks)
+
+    def indice(self, node_id: str) -> int:
+        """
+        Índice entero de un nodo.
+
+        Lanza:
+            KeyError: Si el nodo no existe
+        """
+        if self._indices is None:
+            self._indices = {node_id: i for i, node_id in enumerate(self.ids)}
+        return self._indices[node_id]
+
+    def ids_landmarks(self) -> List[str]:
+        """Ids de los landmarks elegidos."""
+        return [self.ids[i] for i in self.landmarks]
+
+    # Preprocesamiento
+
+    @classmethod
+    def desde_grafo(cls, grafo, cantidad: int=8, seleccion: str="lejanos",
+                    workers: Optional[int]=None, semilla: int=0) -> "Landmarks":
+        """
+        Elige los landmarks y calcula sus tablas sobre una copia CSR del grafo.
+
+        Selección:
+        - "lejanos": cada landmark es el nodo más lejano (en saltos) de los
+          ya elegidos. Se elige con recorridos en amplitud, que son baratos,
+          y después todas las tablas se calculan en paralelo, un Dijkstra
+          por landmark repartido entre `workers` procesos.
+        - "evitar": cada landmark se elige en el subárbol de caminos más
+          cortos (desde un nodo al azar) donde las cotas actuales son peores.
+          Da mejores cotas con los mismos landmarks, pero cada elección
+          necesita las tablas de los anteriores, así que es secuencial.
+
+        Parámetros:
+            grafo (Grafo o GrafoCSR): Grafo a preprocesar
+            cantidad (int): Número de landmarks (L)
+            seleccion (str): "lejanos" o "evitar"
+            workers (int, opcional): Procesos para las tablas; por defecto
+                                     uno por núcleo, 1 para no usar procesos
+            semilla (int): Semilla del nodo de partida
+
+        Retorna:
+            Landmarks: Tablas listas para consultar
+
+        Lanza:
+            ValueError: Si la cantidad o la selección no son válidas
+        """
+        from csr import GrafoCSR  # type: ignore
+
+        if cantidad < 1:
+            raise ValueError("Se necesita al menos un landmark")
+        if seleccion not in SELECCIONES:
+            raise ValueError(f"Selección desconocida: {seleccion}")
+        csr = grafo if isinstance(grafo, GrafoCSR) else grafo.congelar()
+        n = len(csr)
+        cantidad = min(cantidad, n)
+        inverso = csr.invertido() if csr.dirigido else None
+        rnd = random.Random(semilla)
+
+        if seleccion == "lejanos":
+            elegidos = _mas_lejanos_en_saltos(csr, inverso, cantidad, rnd.randrange(n) if n else 0)
+            todos = [csr.ids[i] for i in range(n)]
+            origenes = [csr.ids[i] for i in elegidos]
+            desde = csr.matriz_distancias(origenes, todos, workers)
+            hacia = inverso.matriz_distancias(origenes, todos, workers) if inverso else None
+            lm = cls(csr.ids, elegidos, desde, hacia, csr.dirigido)
+        else:
+            lm = cls(csr.ids, [], [], [] if inverso else None, csr.dirigido)
+            for _ in range(cantidad):
+                nuevo = lm._evitar(csr, rnd.randrange(n))
+                if nuevo is None:
+                    break
+                lm.landmarks.append(nuevo)
+                lm.desde.append(array('d', csr.dijkstra_indices(nuevo)[0]))
+                if inverso is not None:
+                    lm.hacia.append(array('d', inverso.dijkstra_indices(nuevo)[0]))
+
+        lm.version = getattr(grafo, "version", None)
+        if isinstance(csr.ids, list):
+            lm._indices = csr._indices
+        return lm
+
+    def _evitar(self, csr, raiz: int) -> Optional[int]:
+        """
+        Selección "evitar": en el árbol de caminos más cortos desde `raiz`,
+        cada nodo pesa lo que su distancia supera a la cota actual; se baja
+        por el hijo con el subárbol más pesado (sin landmarks) hasta una hoja.
+        """
+        dist, prev = csr.dijkstra_indices(raiz)
+        hijos: Dict[int, List[int]] = {}
+        for v, u in enumerate(prev):
+            if u >= 0:
+                hijos.setdefault(u, []).append(v)
+        es_landmark = set(self.landmarks)
+
+        # Postorden iterativo: tamaño de cada subárbol (0 si tiene un landmark)
+        tamano: Dict[int, float] = {}
+        con_landmark = set()
+        pila = [(raiz, False)]
+        while pila:
+            u, listo = pila.pop()
+            if not listo:
+                pila.append((u, True))
+                pila.extend((v, False) for v in hijos.get(u, ()))
+                continue
+            if u in es_landmark or any(v in con_landmark for v in hijos.get(u, ())):
+                con_landmark.add(u)
+                tamano[u] = 0.0
+                continue
+            peso = dist[u] - self._cota_indices(raiz, u)
+            tamano[u] = max(peso, 0.0) + sum(tamano[v] for v in hijos.get(u, ()))
+
+        u = raiz
+        while hijos.get(u):
+            siguiente = max(hijos[u], key=lambda v: tamano[v])
+            if tamano[siguiente] <= 0.0:
+                break
+            u = siguiente
+        if u in es_landmark or (u == raiz and tamano.get(raiz, 0.0) <= 0.0):
+            # Nada que mejorar desde esta raíz: el nodo alcanzable más lejano
+            candidatos = [v for v in range(len(dist)) if dist[v] < float('inf') and v not in es_landmark]
+            if not candidatos:
+                candidatos = [v for v in range(len(dist)) if v not in es_landmark]
+            if not candidatos:
+                return None
+            u = max(candidatos, key=lambda v: dist[v])
+        return u
+
+    # Cotas
+
+    def _cota_indices(self, s: int, t: int) -> float:
+        """Cota inferior de d(s, t) sobre índices."""
+        mejor = 0.0
+        inf = float('inf')
+        for desde, hacia in zip(self.desde, self.hacia):
+            d_ls, d_lt = desde[s], desde[t]
+            if d_ls < inf and d_lt - d_ls > mejor:
+                mejor = d_lt - d_ls
+            d_sl, d_tl = hacia[s], hacia[t]
+            if d_tl < inf and d_sl - d_tl > mejor:
+                mejor = d_sl - d_tl
+        return mejor
+
+    def _superior_indices(self, s: int, t: int) -> float:
+        """Cota superior de d(s, t): el mejor camino que pasa por un landmark."""
+        return min((hacia[s] + desde[t] for desde, hacia in zip(self.desde, self.hacia)),
+                   default=float('inf'))
+
+    def estimar(self, origen: str, destino: str) -> Tuple[float, float]:
+        """
+        Cotas de la distancia entre dos nodos, en O(L) y sin buscar.
+
+        Retorna:
+            tuple: (inferior, superior); inferior = inf garantiza que no hay
+                   camino, superior = inf significa que no se sabe
+
+        Lanza:
+            KeyError: Si alguno de los nodos no existe
+        """
+        s, t = self.indice(origen), self.indice(destino)
+        if s == t:
+            return 0.0, 0.0
+        return self._cota_indices(s, t), self._superior_indices(s, t)
+
+    def clasificar(self, origen: str, candidatos) -> List[Dict[str, float]]:
+        """
+        Ordena candidatos (ej: sedes o clínicas) por su cota inferior de
+        distancia desde `origen`, para calcular rutas exactas solo a los
+        primeros.
+
+        Retorna:
+            list: Diccionarios {"id", "inferior", "superior"} de menor a
+                  mayor cota inferior (y superior para desempatar)
+        """
+        resultados = []
+        for node_id in candidatos:
+            inferior, superior = self.estimar(origen, node_id)
+            resultados.append({"id": node_id, "inferior": inferior, "superior": superior})
+        resultados.sort(key=lambda r: (r["inferior"], r["superior"]))
+        return resultados
+
+    def heuristica(self, destino: str) -> Callable[[str], float]:
+        """
+        Heurística admisible hacia `destino` para `Grafo.ruta(...,
+        algoritmo="astar", heuristica=...)`.
+
+        Lanza:
+            KeyError: Si el destino no existe
+        """
+        t = self.indice(destino)
+        indices = self._indices
+        inf = float('inf')
+        # Por landmark: (desde, d(L, t), hacia, d(t, L))
+        terminos = [(desde, desde[t], hacia, hacia[t]) for desde, hacia in zip(self.desde, self.hacia)]
+
+        def h(node_id: str) -> float:
+            u = indices.get(node_id)
+            if u is None:
+                return 0.0
+            mejor = 0.0
+            for desde, d_lt, hacia, d_tl in terminos:
+                d_lu = desde[u]
+                if d_lu < inf and d_lt - d_lu > mejor:
+                    mejor = d_lt - d_lu
+                if d_tl < inf and hacia[u] - d_tl > mejor:
+                    mejor = hacia[u] - d_tl
+            return mejor
+
+        return h
+
+    # Persistencia
+
+    def guardar(self, ruta: str):
+        """
+        Guarda los landmarks y sus tablas en un archivo binario versionado
+        (ver `MAGIC`). Las tablas se escriben tal cual (float64).
+        """
+        n, cantidad = len(self.ids), len(self.landmarks)
+        ids = json.dumps(list(self.ids), separators=(",", ":")).encode("utf-8")
+        banderas = _DIRIGIDO if self.dirigido else 0
+        tablas = list(self.desde) + (list(self.hacia) if self.dirigido else [])
+        with open(ruta, "wb") as f:
+            version = -1 if self.version is None else self.version
+            f.write(_ENCABEZADO.pack(MAGIC, VERSION_BINARIO, banderas, n, cantidad, len(ids), version)
+                    .ljust(_TAMANO_ENCABEZADO, b"\0"))
+            f.write(ids)
+            f.write(b"\0" * (-f.tell() % 8))
+            f.write(_bytes_le(array('q', self.landmarks)))
+            for tabla in tablas:
+                if len(tabla) != n:
+                    raise ValueError("Tabla de landmarks con largo inválido")
+                f.write(_bytes_le(array('d', tabla) if not isinstance(tabla, array) else tabla))
+
+    @classmethod
+    def abrir(cls, ruta: str, usar_mmap: bool=True) -> "Landmarks":
+        """
+        Abre landmarks guardados con `guardar`. Con `usar_mmap=True` las
+        tablas son vistas sobre el archivo mapeado (sin copiar).
+
+        Lanza:
+            ValueError: Si el archivo no tiene el formato o la versión esperada
+        """
+        with open(ruta, "rb") as f:
+            if usar_mmap:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = f.read()
+
+        vista = memoryview(buffer)
+        if len(vista) < _TAMANO_ENCABEZADO:
+            raise ValueError(f"{ruta} no es un archivo de landmarks de SmartRoute")
+        magic, version, banderas, n, cantidad, largo_ids, version_grafo = _ENCABEZADO.unpack_from(vista)
+        if magic != MAGIC:
+            raise ValueError(f"{ruta} no es un archivo de landmarks de SmartRoute")
+        if version != VERSION_BINARIO:
+            raise ValueError(f"{ruta}: versión de formato {version} no soportada")
+        dirigido = bool(banderas & _DIRIGIDO)
+
+        inicio = _TAMANO_ENCABEZADO
+        ids = json.loads(bytes(vista[inicio:inicio + largo_ids]).decode("utf-8"))
+        inicio += largo_ids
+        inicio += -inicio % 8
+        tablas = 2 * cantidad if dirigido else cantidad
+        if inicio + 8 * cantidad + 8 * n * tablas > len(vista) or len(ids) != n:
+            raise ValueError(f"{ruta} está truncado")
+
+        def seccion(largo: int, tipo: str):
+            nonlocal inicio
+            parte = vista[inicio:inicio + 8 * largo]
+            inicio += 8 * largo
+            if sys.byteorder != "little":
+                arreglo = array(tipo, parte.tobytes())
+                arreglo.byteswap()
+                return arreglo
+            return parte.cast(tipo)
+
+        landmarks = list(seccion(cantidad, 'q'))
+        filas = [seccion(n, 'd') for _ in range(tablas)]
+        lm = cls(ids, landmarks, filas[:cantidad], filas[cantidad:] if dirigido else None, dirigido,
+                 None if version_grafo < 0 else version_grafo)
+        lm._buffer = buffer
+        return lm
+
+
+# Funciones auxiliares
+
+def _mas_lejanos_en_saltos(csr, inverso, cantidad: int, inicio: int) -> List[int]:
+    """
+    Elección "lejanos": el primero es el nodo más lejano (en saltos) desde
+    `inicio`; cada siguiente, el que está más lejos del landmark más cercano.
+    Los saltos se cuentan sin importar la dirección de las aristas.
+    Los nodos que ningún landmark alcanza cuentan como infinitamente lejos,
+    así cada componente recibe al menos uno (los nodos sin aristas no se
+    eligen: sus tablas no darían ninguna cota).
+    """
+    n = len(csr)
+    offsets = csr.offsets
+    con_aristas = bytearray(n)
+    for v in csr.destinos:
+        con_aristas[v] = 1
+    for u in range(n):
+        if offsets[u + 1] > offsets[u]:
+            con_aristas[u] = 1
+    if not any(con_aristas):
+        con_aristas = bytearray(b"\1") * n
+
+    cercania = _saltos_desde(csr, inverso, inicio)
+    cercania = [(c if c >= 0 else n) if con_aristas[v] else -1 for v, c in enumerate(cercania)]
+    elegidos: List[int] = []
+    minimo = [float('inf') if con_aristas[v] else -1 for v in range(n)]
+    siguiente = max(range(n), key=lambda v: cercania[v])
+    while len(elegidos) < cantidad:
+        elegidos.append(siguiente)
+        for v, saltos in enumerate(_saltos_desde(csr, inverso, siguiente)):
+            if 0 <= saltos < minimo[v]:
+                minimo[v] = saltos
+        minimo[siguiente] = -1  # Ya es landmark
+        siguiente = max(range(n), key=lambda v: minimo[v])
+        if minimo[siguiente] < 0:
+            break
+    return elegidos
+
+
+def _saltos_desde(csr, inverso, s: int) -> List[int]:
+    """
+    Distancia en saltos desde s a cada nodo (-1 si no se alcanza), usando
+    también las aristas de `inverso` si no es None.
+    """
+    grafos = [(g.offsets, g.destinos) for g in (csr, inverso) if g is not None]
+    saltos = [-1] * len(csr)
+    saltos[s] = 0
+    frente = [s]
+    nivel = 0
+    while frente:
+        nivel += 1
+        nuevo = []
+        for u in frente:
+            for offsets, destinos in grafos:
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = destinos[e]
+                    if saltos[v] < 0:
+                        saltos[v] = nivel
+                        nuevo.append(v)
+        frente = nuevo
+    return saltos
+
+
+def _bytes_le(arreglo: array) -> bytes:
+    """Bytes little-endian de un arreglo."""
+    if sys.byteorder == "little":
+        return arreglo.tobytes()
+    copia = array(arreglo.typecode, arreglo)
+    copia.byteswap()
+    return copia.tobytes()
@@ -0,0 +1,538 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Partición del grafo en celdas y rutas repartidas entre procesos (shards).
+
+- `particionar`: divide los nodos en k celdas por bisección inercial sobre
+  las coordenadas (`meta["lat"]`/`meta["lon"]`): cada corte es
+  perpendicular al eje principal de los puntos, así las celdas quedan
+  compactas y se cortan pocas calles. Los nodos sin coordenadas toman la
+  celda de sus vecinos. Se registran los nodos frontera de cada celda
+  (los que tienen aristas hacia o desde otra celda).
+- `RuteadorParticionado`: cada celda vive en su propio proceso, que abre
+  con mmap solo su parte del grafo y atiende pedidos por un Pipe. El
+  proceso principal guarda un grafo superpuesto (overlay) pequeño: los
+  nodos frontera, las aristas cortadas y, dentro de cada celda, la
+  distancia entre cada par de nodos frontera. Una ruta origen -> destino
+  se arma con un Dijkstra en la celda del origen, otro (hacia atrás) en la
+  celda del destino y una búsqueda sobre el overlay que los une.
+
+Ejemplo de uso:
+    particion = g.particionar(8)
+    with RuteadorParticionado(g, particion) as rp:
+        rp.ruta("H1", "C3")   # {"camino": [...], "costo": ..., "celdas": [...]}
+"""
+
+from typing import Dict, Any, List, Optional, Set, Tuple
+from array import array
+from collections import deque
+import heapq
+import math
+import multiprocessing
+import os
+import tempfile
+
+from grafo import Grafo  # type: ignore
+from csr import GrafoCSR  # type: ignore
+
+
+# CLASE: PARTICION
+
+class Particion:
+    """
+    Asignación de cada nodo a una celda, con los nodos frontera.
+
+    Atributos:
+        k (int): Número de celdas
+        celda (dict): id de nodo -> celda (0 .. k-1)
+        frontera (list): Por celda, el conjunto de nodos frontera
+        aristas_cortadas (int): Aristas dirigidas entre celdas distintas
+    """
+
+    def __init__(self, grafo: Grafo, celda: Dict[str, int], k: int):
+        self.k = k
+        self.celda = celda
+        self.frontera: List[Set[str]] = [set() for _ in range(k)]
+        self.aristas_cortadas = 0
+        for u, lst in grafo.ady.items():
+            cu = celda[u]
+            for v, _peso, _meta in lst:
+                cv = celda[v]
+                if cu != cv:
+                    self.frontera[cu].add(u)
+                    self.frontera[cv].add(v)
+                    self.aristas_cortadas += 1
+
+    def miembros(self, c: int) -> List[str]:
+        """Ids de los nodos de la celda c."""
+        return [node_id for node_id, x in self.celda.items() if x == c]
+
+    def tamanos(self) -> List[int]:
+        """Cantidad de nodos de cada celda."""
+        tamanos = [0] * self.k
+        for c in self.celda.values():
+            tamanos[c] += 1
+        return tamanos
+
+
+def particionar(grafo: Grafo, k: int) -> Particion:
+    """
+    Divide el grafo en k celdas de tamaño parecido (bisección inercial).
+
+    Parámetros:
+        grafo (Grafo): Grafo a dividir
+        k (int): Número de celdas
+
+    Retorna:
+        Particion: Celda de cada nodo y nodos frontera
+
+    Lanza:
+        ValueError: Si k no es positivo
+    """
+    if k < 1:
+        raise ValueError("k debe ser al menos 1")
+
+    # Proyección plana (km) alrededor de la latitud media: basta para cortar
+    puntos: Dict[str, Tuple[float, float]] = {}
+    coordenadas = {node_id: nodo.coordenadas() for node_id, nodo in grafo.nodos.items()}
+    coordenadas = {node_id: c for node_id, c in coordenadas.items() if c is not None}
+    if coordenadas:
+        lat_media = sum(lat for lat, _lon in coordenadas.values()) / len(coordenadas)
+        escala = math.cos(math.radians(lat_media))
+        puntos = {node_id: (lon * escala * 111.32, lat * 110.57)
+                  for node_id, (lat, lon) in coordenadas.items()}
+
+    celda: Dict[str, int] = {}
+    if puntos:
+        _biseccion(list(puntos), puntos, k, 0, celda)
+        _completar_por_vecinos(grafo, celda, k)
+    else:
+        # Sin coordenadas: trozos consecutivos de un recorrido en amplitud
+        orden = _orden_bfs(grafo)
+        for i, node_id in enumerate(orden):
+            celda[node_id] = i * k // len(orden)
+    return Particion(grafo, celda, k)
+
+
+def _biseccion(ids: List[str], puntos: Dict[str, Tuple[float, float]], k: int,
+               primera: int, celda: Dict[str, int]):
+    """Corta `ids` perpendicular a su eje principal hasta tener k celdas."""
+    if k == 1 or len(ids) <= 1:
+        for node_id in ids:
+            celda[node_id] = primera
+        return
+    n = len(ids)
+    mx = sum(puntos[i][0] for i in ids) / n
+    my = sum(puntos[i][1] for i in ids) / n
+    sxx = sum((puntos[i][0] - mx) ** 2 for i in ids)
+    syy = sum((puntos[i][1] - my) ** 2 for i in ids)
+    sxy = sum((puntos[i][0] - mx) * (puntos[i][1] - my) for i in ids)
+    angulo = 0.5 * math.atan2(2 * sxy, sxx - syy)  # Dirección de mayor dispersión
+    ux, uy = math.cos(angulo), math.sin(angulo)
+    ids = sorted(ids, key=lambda i: (puntos[i][0] - mx) * ux + (puntos[i][1] - my) * uy)
+
+    k_izq = k // 2
+    corte = round(n * k_izq / k)  # Celdas de tamaño parecido aunque k sea impar
+    _biseccion(ids[:corte], puntos, k_izq, primera, celda)
+    _biseccion(ids[corte:], puntos, k - k_izq, primera + k_izq, celda)
+
+
+def _completar_por_vecinos(grafo: Grafo, celda: Dict[str, int], k: int):
+    """
+    Asigna los nodos sin coordenadas a la celda del nodo asignado más
+    cercano en saltos; los que no alcanzan ninguno van a la celda más chica.
+    """
+    cola = deque(celda)
+    while cola:
+        u = cola.popleft()
+        for v, _peso, _meta in grafo.ady.get(u, ()):
+            if v not in celda:
+                celda[v] = celda[u]
+                cola.append(v)
+        for v, _peso, _meta in grafo._aristas_entrantes(u):
+            if v not in celda:
+                celda[v] = celda[u]
+                cola.append(v)
+    tamanos = [0] * k
+    for c in celda.values():
+        tamanos[c] += 1
+    for node_id in grafo.nodos:
+        if node_id not in celda:
+            c = tamanos.index(min(tamanos))
+            celda[node_id] = c
+            tamanos[c] += 1
+
+
+def _orden_bfs(grafo: Grafo) -> List[str]:
+    """Todos los nodos en orden de recorrido en amplitud, componente por componente."""
+    vistos: Set[str] = set()
+    orden: List[str] = []
+    for inicio in grafo.nodos:
+        if inicio in vistos:
+            continue
+        vistos.add(inicio)
+        cola = deque([inicio])
+        while cola:
+            u = cola.popleft()
+            orden.append(u)
+            for v, _peso, _meta in grafo.ady.get(u, ()):
+                if v not in vistos:
+                    vistos.add(v)
+                    cola.append(v)
+    return orden
+
+
+# CLASE: RUTEADORPARTICIONADO
+
+class RuteadorParticionado:
+    """
+    Rutas sobre un grafo repartido en celdas, una por proceso.
+
+    Las aristas se guardan solo en la celda de sus dos extremos (aristas
+    internas) o en el overlay (aristas cortadas), así ningún proceso tiene
+    el grafo completo. Los costos coinciden con los de `Grafo.ruta`
+    (pueden diferir en el último decimal por el orden de las sumas). Los
+    perfiles de tiempos de las aristas no se usan: se rutea por `peso`.
+
+    Al crearlo se calcula, en paralelo en cada celda, la distancia interna
+    entre sus nodos frontera. Los cambios posteriores en el grafo no se
+    reflejan: hay que crear otro ruteador.
+    """
+
+    def __init__(self, grafo: Grafo, particion: Particion, procesos: bool=True):
+        """
+        Parámetros:
+            grafo (Grafo): Grafo completo (solo se lee al crear el ruteador)
+            particion (Particion): Celdas del grafo (ver `particionar`)
+            procesos (bool): Si False, las celdas se atienden en este mismo
+                             proceso (mismo protocolo, útil para pruebas)
+        """
+        self.particion = particion
+        self.dirigido = grafo.dirigido
+        self._carpeta: Optional[tempfile.TemporaryDirectory] = tempfile.TemporaryDirectory()
+        self._celdas: List[_Celda] = []
+        try:
+            for c in range(particion.k):
+                self._celdas.append(self._crear_celda(grafo, particion.miembros(c), c, procesos))
+
+            # Overlay: u -> [(v, costo, celda interna o None si es arista cortada)]
+            self._overlay: Dict[str, List[Tuple[str, float, Optional[int]]]] = {
+                b: [] for frontera in particion.frontera for b in frontera}
+            for u, lst in grafo.ady.items():
+                cu = particion.celda[u]
+                for v, peso, _meta in lst:
+                    if particion.celda[v] != cu:
+                        self._overlay[u].append((v, peso, None))
+            for c, celda in enumerate(self._celdas):
+                celda.enviar(("clique", sorted(particion.frontera[c])))
+            for c, celda in enumerate(self._celdas):
+                for b, costos in celda.recibir().items():
+                    self._overlay[b].extend((b2, d, c) for b2, d in costos.items() if b2 != b)
+        except Exception:
+            self.cerrar()
+            raise
+
+    def _crear_celda(self, grafo: Grafo, miembros: List[str], c: int, procesos: bool) -> "_Celda":
+        """Guarda el subgrafo interno de la celda (e invertido si es dirigido) y la arranca."""
+        rutas = []
+        sentidos = (False, True) if grafo.dirigido else (False,)
+        for invertido in sentidos:
+            csr = _subgrafo(grafo, miembros, self.particion.celda, c, invertido)
+            ruta = os.path.join(self._carpeta.name, f"celda-{c}{'-inv' if invertido else ''}.srg")
+            csr.guardar(ruta, metadatos=False)
+            rutas.append(ruta)
+        return _Celda(rutas[0], rutas[-1], procesos)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        """Termina los procesos de las celdas y borra sus archivos."""
+        for celda in self._celdas:
+            celda.cerrar()
+        self._celdas = []
+        if self._carpeta is not None:
+            self._carpeta.cleanup()
+            self._carpeta = None
+
+    def tamano_overlay(self) -> Tuple[int, int]:
+        """(nodos, aristas) del grafo superpuesto que guarda este proceso."""
+        return len(self._overlay), sum(len(lst) for lst in self._overlay.values())
+
+    # Consultas
+
+    def ruta(self, origen: str, destino: str) -> Dict[str, Any]:
+        """
+        Camino más corto entre dos nodos aunque estén en celdas distintas.
+
+        Retorna:
+            dict: {"camino": lista de ids (vacía si no hay ruta),
+                   "costo": distancia total (inf si no hay ruta),
+                   "celdas": celdas que atraviesa el camino, en orden}
+
+        Lanza:
+            KeyError: Si el origen o el destino no existen
+        """
+        if origen not in self.particion.celda:
+            raise KeyError("Nodo inicio no existe")
+        if destino not in self.particion.celda:
+            raise KeyError("Nodo destino no existe")
+        co, cd = self.particion.celda[origen], self.particion.celda[destino]
+        frontera_o, frontera_d = self.particion.frontera[co], self.particion.frontera[cd]
+
+        # Las dos búsquedas locales corren a la vez en sus procesos (si es la
+        # misma celda, las respuestas llegan en el orden de los pedidos)
+        objetivos = sorted(frontera_o | {destino}) if co == cd else sorted(frontera_o)
+        self._celdas[co].enviar(("caminos", origen, objetivos, False))
+        if frontera_d:
+            self._celdas[cd].enviar(("caminos", destino, sorted(frontera_d), True))
+        desde_o = self._celdas[co].recibir()  # b -> (camino origen..b, costo)
+        hacia_d = self._celdas[cd].recibir() if frontera_d else {}  # b -> (camino b..destino, costo)
+
+        mejor, tramo = float('inf'), None
+        if co == cd:
+            mejor = desde_o[destino][1]  # Sin salir de la celda
+        inicios = {b: r[1] for b, r in desde_o.items() if b in frontera_o and r[1] < float('inf')}
+        finales = {b: r[1] for b, r in hacia_d.items() if r[1] < float('inf')}
+        costo, pasos = self._buscar_overlay(inicios, finales)
+        if costo < mejor:
+            mejor, tramo = costo, pasos
+        if mejor == float('inf'):
+            return {"camino": [], "costo": mejor, "celdas": []}
+        if tramo is None:
+            camino = desde_o[destino][0]
+        else:
+            camino = self._expandir(desde_o[tramo[0][0]][0], tramo, hacia_d[tramo[-1][0]][0])
+        return {"camino": camino, "costo": mejor,
+                "celdas": _sin_repetidos([self.particion.celda[x] for x in camino])}
+
+    def _buscar_overlay(self, inicios: Dict[str, float], finales: Dict[str, float]):
+        """
+        Dijkstra en el overlay con varios orígenes (costo desde el origen
+        real) que termina sumando el costo hasta el destino real.
+
+        Retorna:
+            tuple: (costo, pasos) con pasos = [(nodo frontera, celda interna
+                   usada para llegar o None)] desde el primero hasta el último
+        """
+        dist = dict(inicios)
+        prev: Dict[str, Tuple[Optional[str], Optional[int]]] = {b: (None, None) for b in inicios}
+        heap = [(d, b) for b, d in inicios.items()]
+        heapq.heapify(heap)
+        mejor, llegada = float('inf'), None
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d >= mejor:
+                break
+            if d > dist[u]:
+                continue
+            if u in finales and d + finales[u] < mejor:
+                mejor, llegada = d + finales[u], u
+            for v, costo, c in self._overlay[u]:
+                nd = d + costo
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    prev[v] = (u, c)
+                    heapq.heappush(heap, (nd, v))
+        if llegada is None:
+            return mejor, None
+        pasos = []
+        u: Optional[str] = llegada
+        while u is not None:
+            anterior, c_llegada = prev[u]
+            pasos.append((u, c_llegada))
+            u = anterior
+        pasos.reverse()
+        return mejor, pasos
+
+    def _expandir(self, inicio: List[str], pasos, final: List[str]) -> List[str]:
+        """Une los tramos: origen..b1, b1..bk por el overlay y bk..destino."""
+        internos = [(i, pasos[i - 1][0], pasos[i][0], c)
+                    for i, (_b, c) in enumerate(pasos) if c is not None]
+        for _i, u, v, c in internos:
+            self._celdas[c].enviar(("caminos", u, [v], False))
+        tramos = {i: self._celdas[c].recibir()[v][0] for i, _u, v, c in internos}
+
+        camino = list(inicio)
+        for i in range(1, len(pasos)):
+            camino.extend(tramos[i][1:] if i in tramos else [pasos[i][0]])
+        camino.extend(final[1:])
+        return camino
+
+
+def _sin_repetidos(celdas: List[int]) -> List[int]:
+    """Celdas en orden de paso, sin repeticiones consecutivas."""
+    return [c for i, c in enumerate(celdas) if i == 0 or celdas[i - 1] != c]
+
+
+def _subgrafo(grafo: Grafo, miembros: List[str], celda: Dict[str, int], c: int,
+              invertido: bool) -> GrafoCSR:
+    """CSR dirigido con las aristas internas de la celda c (invertidas si se pide)."""
+    ids = sorted(miembros)
+    indices = {node_id: i for i, node_id in enumerate(ids)}
+    offsets = array('q', [0]) * (len(ids) + 1)
+    destinos = array('i')
+    pesos = array('d')
+    for i, u in enumerate(ids):
+        aristas = grafo._aristas_entrantes(u) if invertido else grafo.ady.get(u, ())
+        for v, peso, _meta in aristas:
+            if celda[v] == c:
+                destinos.append(indices[v])
+                pesos.append(peso)
+        offsets[i + 1] = len(destinos)
+    return GrafoCSR(ids, offsets, destinos, pesos, dirigido=True)
+
+
+# Procesos de las celdas
+
+class _Celda:
+    """Extremo del proceso principal para hablar con una celda."""
+
+    def __init__(self, ruta: str, ruta_inversa: str, procesos: bool):
+        self._proceso = None
+        if procesos:
+            self._conexion, otra = multiprocessing.Pipe()
+            self._proceso = multiprocessing.Process(target=_servir_celda,
+                                                    args=(otra, ruta, ruta_inversa), daemon=True)
+            self._proceso.start()
+            otra.close()
+        else:
+            self._local = _ServidorCelda(ruta, ruta_inversa)
+            self._respuestas: deque = deque()
+
+    def enviar(self, mensaje: tuple):
+        if self._proceso is not None:
+            self._conexion.send(mensaje)
+        else:
+            self._respuestas.append(self._local.atender(mensaje))
+
+    def recibir(self):
+        if self._proceso is not None:
+            respuesta = self._conexion.recv()
+        else:
+            respuesta = self._respuestas.popleft()
+        if isinstance(respuesta, Exception):
+            raise respuesta
+        return respuesta
+
+    def cerrar(self):
+        if self._proceso is not None:
+            try:
+                self._conexion.send(("fin",))
+            except (BrokenPipeError, OSError):
+                pass
+            self._proceso.join(timeout=5)
+            if self._proceso.is_alive():
+                self._proceso.terminate()
+            self._conexion.close()
+            self._proceso = None
+        else:
+            self._local = None
+
+
+class _ServidorCelda:
+    """Atiende los pedidos de una celda sobre su subgrafo abierto con mmap."""
+
+    def __init__(self, ruta: str, ruta_inversa: str):
+        self.csr = GrafoCSR.abrir(ruta)
+        self.inversa = GrafoCSR.abrir(ruta_inversa) if ruta_inversa != ruta else self.csr
+
+    def atender(self, mensaje: tuple):
+        """
+        Pedidos:
+            ("caminos", origen, objetivos, invertido): {objetivo: (camino, costo)};
+                con invertido=True el Dijkstra va hacia atrás y cada camino
+                va de objetivo a origen
+            ("clique", frontera): {b: {b2: costo}} entre los nodos frontera
+        """
+        try:
+            if mensaje[0] == "caminos":
+                _, origen, objetivos, invertido = mensaje
+                return self._caminos(origen, objetivos, invertido)
+            if mensaje[0] == "clique":
+                return self._clique(mensaje[1])
+            raise ValueError(f"Pedido desconocido: {mensaje[0]}")
+        except Exception as e:  # Se devuelve al proceso principal
+            return e
+
+    def _clique(self, frontera: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Distancias internas entre los nodos frontera, con un Dijkstra desde
+        cada uno que se detiene al asentarlos a todos.
+
+        Si todos los pesos son positivos se omite b -> b2 cuando el camino
+        más corto pasa por otro nodo frontera b3: el overlay ya lo tiene
+        como b -> b3 -> b2 (cada tramo es estrictamente más corto, así que
+        por inducción siempre queda una cadena de aristas con el mismo
+        costo). En mallas esto deja el overlay casi lineal en vez de
+        cuadrático en los nodos frontera.
+        """
+        csr = self.csr
+        offsets, destinos, pesos = csr.offsets, csr.destinos, csr.pesos
+        n = len(csr)
+        indices = [csr.indice(b) for b in frontera]
+        es_frontera = bytearray(n)
+        for i in indices:
+            es_frontera[i] = 1
+        podar = all(p > 0 for p in pesos)
+
+        resultado = {}
+        for b, s in zip(frontera, indices):
+            dist = [float('inf')] * n
+            via = bytearray(n)  # 1 si el camino pasa por otro nodo frontera
+            dist[s] = 0.0
+            heap = [(0.0, s)]
+            pendientes = len(indices) - 1
+            costos = {}
+            while heap and pendientes:
+                d, u = heapq.heappop(heap)
+                if d > dist[u]:
+                    continue
+                paso = via[u]
+                if u != s and es_frontera[u]:
+                    pendientes -= 1
+                    if not (podar and paso):
+                        costos[csr.ids[u]] = d
+                    paso = 1
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = destinos[e]
+                    nd = d + pesos[e]
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        via[v] = paso
+                        heapq.heappush(heap, (nd, v))
+            resultado[b] = costos
+        return resultado
+
+    def _caminos(self, origen: str, objetivos: List[str], invertido: bool):
+        csr = self.inversa if invertido else self.csr
+        s = csr.indice(origen)
+        indices = [csr.indice(t) for t in objetivos]
+        resultados = csr.caminos_desde(s, indices)
+        salida = {}
+        for t, i in zip(objetivos, indices):
+            camino, costo = resultados[i]
+            salida[t] = (camino[::-1] if invertido else camino, costo)
+        return salida
+
+
+def _servir_celda(conexion, ruta: str, ruta_inversa: str):
+    """Bucle de cada proceso de celda: recibe pedidos y responde por el Pipe."""
+    servidor = _ServidorCelda(ruta, ruta_inversa)
+    while True:
+        try:
+            mensaje = conexion.recv()
+        except EOFError:
+            break
+        if mensaje[0] == "fin":
+            break
+        conexion.send(servidor.atender(mensaje))
+    conexion.close()
@@ -0,0 +1,348 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""
+Servicio asíncrono de consultas de rutas sobre un `Grafo`.
+
+`Grafo.dijkstra` es síncrono y usa CPU: llamarlo desde un servidor asyncio
+bloquea el bucle de eventos. `ServicioRutas` ofrece `await ruta(origen,
+destino)` y:
+1. Agrupa las consultas que comparten origen: las que llegan dentro de una
+   ventana corta se responden con una sola búsqueda desde ese origen, que
+   se detiene apenas alcanza todos los destinos pedidos.
+2. Ejecuta las búsquedas fuera del bucle de eventos (hilos o procesos), y
+   también el armado de la copia congelada cuando el grafo cambia.
+3. Limita las consultas en curso (contrapresión) y aplica un tiempo máximo
+   por consulta.
+
+Ejemplo de uso:
+    async with ServicioRutas(g) as servicio:
+        r = await servicio.ruta("H1", "C3")   # {"camino": [...], "costo": ...}
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import functools
+import os
+import tempfile
+
+from csr import GrafoCSR  # type: ignore
+
+
+# CLASE: SERVICIORUTAS
+
+class ServicioRutas:
+    """
+    Fachada asyncio para responder rutas de forma concurrente.
+
+    Trabaja sobre una copia congelada (CSR) del grafo. Si el grafo es un
+    `Grafo` y cambia su `version`, la copia se rehace en un hilo aparte y,
+    mientras tanto, las consultas se siguen respondiendo con la copia
+    anterior (salvo las que piden un lugar que esa copia no tiene, que
+    esperan a la nueva; `actualizar()` espera a la copia nueva). También acepta directamente un `GrafoCSR` (por
+    ejemplo uno abierto con `Grafo.abrir`).
+    """
+
+    def __init__(self, grafo, max_pendientes: int=1000, timeout: Optional[float]=5.0,
+                 ventana: float=0.002, hilos: int=1, procesos: int=0):
+        """
+        Parámetros:
+            grafo (Grafo o GrafoCSR): Red sobre la que se consultan rutas
+            max_pendientes (int): Máximo de consultas en curso; las demás
+                                  esperan turno (contrapresión)
+            timeout (float, opcional): Segundos máximos por consulta, incluida
+                                       la espera de turno (None = sin límite)
+            ventana (float): Segundos que se espera para agrupar consultas del
+                             mismo origen antes de lanzar la búsqueda
+            hilos (int): Hilos para las búsquedas (si procesos == 0)
+            procesos (int): Si > 0, las búsquedas corren en ese número de
+                            procesos, que abren el grafo con mmap
+        """
+        if max_pendientes < 1:
+            raise ValueError("max_pendientes debe ser al menos 1")
+        self.grafo = grafo
+        self.timeout = timeout
+        self.ventana = ventana
+        self.procesos = procesos
+        self._hilos = hilos
+        self._cupos = asyncio.Semaphore(max_pendientes)
+        self._lotes: Dict[Tuple[Any, int], _Lote] = {}  # (versión, origen) -> lote abierto
+        self._tareas = set()
+        self._csr: Optional[GrafoCSR] = None
+        self._version = None
+        self._executor: Optional[Executor] = None
+        self._usos: Dict[Executor, int] = {}  # Lotes pendientes en cada executor
+        self._carpeta: Optional[tempfile.TemporaryDirectory] = None
+        self._rehaciendo: Optional[asyncio.Task] = None  # Copia nueva en preparación
+        self._copias = 0  # Archivos de copia guardados (para nombrarlos)
+        self._cerrado = False
+        self.consultas = 0
+        self.busquedas = 0
+        self.vencidas = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        """Libera los hilos o procesos y los archivos temporales."""
+        self._cerrado = True
+        for executor in set(self._usos) | {self._executor}:
+            if executor is not None:
+                executor.shutdown(wait=False)
+        self._usos.clear()
+        self._executor = None
+        if self._carpeta is not None:
+            self._carpeta.cleanup()
+            self._carpeta = None
+
+    # Consultas
+
+    async def ruta(self, origen: str, destino: str, timeout: Optional[float]=None) -> Dict[str, Any]:
+        """
+        Camino más corto entre dos nodos sin bloquear el bucle de eventos.
+
+        Parámetros:
+            origen (str): ID del nodo de partida
+            destino (str): ID del nodo de llegada
+            timeout (float, opcional): Reemplaza el tiempo máximo del servicio
+
+        Retorna:
+            dict: {"camino": lista de ids (vacía si no hay ruta),
+                   "costo": distancia total (inf si no hay ruta)}
+
+        Lanza:
+            KeyError: Si el origen o el destino no existen
+            asyncio.TimeoutError: Si no se responde a tiempo
+        """
+        self.consultas += 1
+        try:
+            return await asyncio.wait_for(self._atender(origen, destino),
+                                          self.timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            self.vencidas += 1
+            raise
+
+    async def actualizar(self):
+        """
+        Espera a que la copia de trabajo refleje la versión actual del grafo
+        (para que las consultas siguientes vean los últimos cambios).
+        """
+        while self._csr is None or getattr(self.grafo, "version", None) != self._version:
+            await self._preparar()
+            if self._rehaciendo is not None:
+                await asyncio.shield(self._rehaciendo)
+
+    async def _atender(self, origen: str, destino: str) -> Dict[str, Any]:
+        """
+        Espera turno, se suma al lote de su origen y espera el resultado.
+
+        Cada lote queda atado a la copia del grafo (y a sus trabajadores) con
+        la que se calcularon sus índices: si el grafo cambia mientras el lote
+        espera, las consultas nuevas abren otro lote sobre la copia nueva.
+        """
+        async with self._cupos:
+            await self._preparar()
+            try:
+                s, t = _indices(self._csr, origen, destino)
+            except KeyError:
+                if self._rehaciendo is None:
+                    raise
+                # Puede ser un lugar nuevo: esperar la copia que se está armando
+                await asyncio.shield(self._rehaciendo)
+                s, t = _indices(self._csr, origen, destino)
+
+            loop = asyncio.get_running_loop()
+            futuro = loop.create_future()
+            clave = (self._version, s)
+            lote = self._lotes.get(clave)
+            if lote is None:
+                lote = self._lotes[clave] = _Lote(s, self._csr, self._executor)
+                self._usos[self._executor] = self._usos.get(self._executor, 0) + 1
+                loop.call_later(self.ventana, self._lanzar, clave)
+            lote.destinos.setdefault(t, []).append(futuro)
+            return await futuro
+
+    def _lanzar(self, clave: Tuple[Any, int]):
+        """Cierra el lote de la clave (versión, origen) y lanza su búsqueda."""
+        lote = self._lotes.pop(clave)
+        tarea = asyncio.get_running_loop().create_task(self._resolver(lote))
+        self._tareas.add(tarea)  # Mantener una referencia hasta que termine
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _resolver(self, lote: "_Lote"):
+        """Ejecuta una búsqueda para todo el lote y reparte los resultados."""
+        try:
+            await self._buscar(lote)
+        finally:
+            self._soltar(lote.executor)
+
+    async def _buscar(self, lote: "_Lote"):
+        """Búsqueda del lote en su executor; completa los futuros pendientes."""
+        objetivos = [t for t, futuros in lote.destinos.items()
+                     if not all(f.done() for f in futuros)]
+        if not objetivos:
+            return  # Todas las consultas del lote vencieron
+
+        self.busquedas += 1
+        loop = asyncio.get_running_loop()
+        if isinstance(lote.executor, ProcessPoolExecutor):
+            # Los procesos de este executor ya abrieron el archivo de lote.csr
+            trabajo = functools.partial(_caminos_trabajador, lote.origen, objetivos)
+        else:
+            trabajo = functools.partial(lote.csr.caminos_desde, lote.origen, objetivos)
+        try:
+            resultados = await loop.run_in_executor(lote.executor, trabajo)
+        except Exception as e:
+            for futuros in lote.destinos.values():
+                for f in futuros:
+                    if not f.done():
+                        f.set_exception(e)
+            return
+
+        for t, futuros in lote.destinos.items():
+            if t not in resultados:
+                continue
+            camino, costo = resultados[t]
+            for f in futuros:
+                if not f.done():
+                    f.set_result({"camino": list(camino), "costo": costo})
+
+    async def _preparar(self):
+        """
+        Lanza el armado de una copia nueva si el grafo cambió; solo la
+        espera si todavía no hay ninguna copia con la cual responder.
+        """
+        version = getattr(self.grafo, "version", None)
+        if self._csr is not None and version == self._version:
+            return
+        if self._rehaciendo is None:
+            if self.procesos and self._carpeta is None:
+                self._carpeta = tempfile.TemporaryDirectory()
+            self._rehaciendo = asyncio.ensure_future(self._rehacer())
+        if self._csr is None:
+            await asyncio.shield(self._rehaciendo)
+
+    async def _rehacer(self):
+        """
+        Congela el grafo (y con procesos, guarda el archivo y arranca los
+        trabajadores) en un hilo aparte, y luego reemplaza la copia vigente.
+
+        Si el grafo cambia mientras se congela, la copia puede haber quedado
+        a medias (o el recorrido fallar): se descarta y se vuelve a armar.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                version = getattr(self.grafo, "version", None)
+                try:
+                    csr, executor = await loop.run_in_executor(None, self._congelar, version)
+                except Exception:
+                    if self._cerrado:
+                        return
+                    if getattr(self.grafo, "version", None) != version:
+                        continue  # El grafo cambió a mitad del recorrido
+                    raise
+                if self._cerrado or getattr(self.grafo, "version", None) == version:
+                    break
+                if executor is not self._executor:
+                    executor.shutdown(wait=False)
+
+            if self._cerrado:
+                if executor is not None:
+                    executor.shutdown(wait=False)
+                return
+            anterior = self._executor
+            self._csr, self._version, self._executor = csr, version, executor
+            if anterior is not None and anterior is not executor and anterior not in self._usos:
+                anterior.shutdown(wait=False)
+        finally:
+            self._rehaciendo = None
+
+    def _congelar(self, version):
+        """Arma la copia y su executor (se ejecuta fuera del bucle de eventos)."""
+        csr = self.grafo if isinstance(self.grafo, GrafoCSR) else self.grafo.congelar()
+        if not self.procesos:
+            if self._executor is not None:
+                return csr, self._executor
+            return csr, ThreadPoolExecutor(self._hilos, thread_name_prefix="rutas")
+
+        # Los procesos abren el grafo desde un archivo con mmap; al cambiar
+        # el grafo se guarda otro archivo y se arrancan procesos nuevos
+        # (los anteriores se cierran cuando terminan sus lotes pendientes)
+        self._copias += 1
+        ruta = os.path.join(self._carpeta.name, f"grafo-{self._copias}-{version}.srg")
+        csr.guardar(ruta, metadatos=False)
+        executor = ProcessPoolExecutor(self.procesos, initializer=_abrir_en_trabajador,
+                                       initargs=(ruta,))
+        for arranque in [executor.submit(int) for _ in range(self.procesos)]:
+            arranque.result()  # Arrancar los procesos aquí y no en la primera búsqueda
+        return csr, executor
+
+    def _soltar(self, executor: Executor):
+        """Descuenta un lote del executor y lo cierra si ya fue reemplazado."""
+        if executor not in self._usos:
+            return  # El servicio ya se cerró
+        self._usos[executor] -= 1
+        if self._usos[executor] == 0:
+            del self._usos[executor]
+            if executor is not self._executor:
+                executor.shutdown(wait=False)
+
+    def estadisticas(self) -> Dict[str, int]:
+        """
+        Contadores del servicio.
+
+        Retorna:
+            dict: {"consultas", "busquedas", "vencidas"}; la diferencia entre
+                  consultas y búsquedas es lo que se ahorró agrupando
+        """
+        return {"consultas": self.consultas, "busquedas": self.busquedas,
+                "vencidas": self.vencidas}
+
+
+class _Lote:
+    """Consultas agrupadas de un mismo origen sobre una misma copia del grafo."""
+
+    __slots__ = ("origen", "csr", "executor", "destinos")
+
+    def __init__(self, origen: int, csr: GrafoCSR, executor: Executor):
+        self.origen = origen
+        self.csr = csr
+        self.executor = executor
+        self.destinos: Dict[int, List[asyncio.Future]] = {}  # destino -> futuros
+
+
+def _indices(csr: GrafoCSR, origen: str, destino: str) -> Tuple[int, int]:
+    """Índices de origen y destino en la copia (KeyError si falta alguno)."""
+    try:
+        s = csr.indice(origen)
+    except KeyError:
+        raise KeyError("Nodo inicio no existe")
+    try:
+        t = csr.indice(destino)
+    except KeyError:
+        raise KeyError("Nodo destino no existe")
+    return s, t
+
+
+# Procesos de búsqueda: cada uno abre el grafo una sola vez
+
+_grafo_trabajador: Optional[GrafoCSR] = None
+
+
+def _abrir_en_trabajador(ruta: str):
+    """Abre con mmap el grafo compartido al arrancar cada proceso."""
+    global _grafo_trabajador
+    _grafo_trabajador = GrafoCSR.abrir(ruta)
+
+
+def _caminos_trabajador(s: int, objetivos: List[int]):
+    return _grafo_trabajador.caminos_desde(s, objetivos)
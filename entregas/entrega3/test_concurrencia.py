@@ -0,0 +1,79 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Pruebas de `GrafoConcurrente` e `Instantanea` (python -m pytest entregas)."""
+
+import math
+import threading
+
+import pytest
+
+from concurrencia import GrafoConcurrente  # type: ignore
+from grafo import Grafo, Nodo  # type: ignore
+
+
+def test_instantaneas_aisladas_de_cambios_posteriores(malla):
+    g = malla(lado=6)
+    compartido = GrafoConcurrente(g)
+    antes = compartido.instantanea()
+    dist_antes = antes.dijkstra("N0_0")
+
+    compartido.eliminar_nodo("N2_2")
+    compartido.actualizar_pesos([("N0_0", "N0_1", 9.0)])
+    with compartido.escritura() as escritura:
+        escritura.insertar_nodo(Nodo("X", "Nuevo", 0.0, "Hotel"))
+        escritura.insertar_arista("N5_5", "X", 1.0)
+    despues = compartido.instantanea()
+
+    assert antes.dijkstra("N0_0") == dist_antes
+    assert "N2_2" in antes.nodos and "X" not in antes.nodos
+    assert despues.dijkstra("N0_0") == g.dijkstra("N0_0")
+    assert [n.id for n in despues.buscar_por_categoria("hotel") if n.id == "X"] == ["X"]
+    assert despues.version == g.version > antes.version
+    with pytest.raises(TypeError):
+        despues.insertar_arista("N0_0", "N5_5")
+
+
+def test_componentes_propias_de_cada_instantanea():
+    g = Grafo.desde_aristas([("A", "B"), ("C", "D")])
+    compartido = GrafoConcurrente(g)
+    vieja = compartido.instantanea()
+    assert not vieja.conectados("A", "D")
+
+    compartido.insertar_arista("B", "C", 1.0)
+    nueva = compartido.instantanea()
+    assert not vieja.conectados("A", "D")  # No ve uniones posteriores
+    assert vieja.ruta("A", "D")["costo"] == math.inf
+    assert nueva.conectados("A", "D") and nueva.ruta("A", "D")["costo"] == 3.0
+
+    compartido.eliminar_arista("B", "C")
+    assert compartido.instantanea().ruta("A", "D")["costo"] == math.inf
+
+
+def test_lectores_en_paralelo_con_un_escritor(malla):
+    g = malla(lado=6)
+    compartido = GrafoConcurrente(g)
+    errores = []
+
+    def leer():
+        try:
+            for _ in range(30):
+                foto = compartido.instantanea()
+                dist = foto.dijkstra("N0_0")[0]
+                assert all(v in foto.nodos for v in dist)
+        except Exception as e:
+            errores.append(e)
+
+    lectores = [threading.Thread(target=leer) for _ in range(3)]
+    for t in lectores:
+        t.start()
+    for i in range(30):
+        compartido.actualizar_pesos([("N0_0", "N0_1", 0.1 + i / 100)])
+    for t in lectores:
+        t.join()
+    assert not errores
+    assert compartido.instantanea().dijkstra("N0_0") == g.dijkstra("N0_0")
@@ -0,0 +1,55 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Pruebas de `JerarquiaContraccion` (python -m pytest entregas)."""
+
+import json
+import math
+import os
+import random
+
+import pytest
+
+from contraccion import JerarquiaContraccion  # type: ignore
+
+
+def _costo(g, camino):
+    return sum(min(p for w, p, _m in g.ady[u] if w == v) for u, v in zip(camino, camino[1:]))
+
+
+@pytest.mark.parametrize("dirigido", [False, True])
+def test_mismo_costo_que_dijkstra(malla, dirigido):
+    g = malla(dirigido=dirigido)
+    ch = JerarquiaContraccion.desde_grafo(g)
+    rnd = random.Random(3)
+    ids = sorted(g.nodos)
+    for _ in range(60):
+        o, d = rnd.choice(ids), rnd.choice(ids)
+        esperado = g.dijkstra(o, d)[0][d]
+        r = ch.ruta(o, d)
+        assert math.isclose(r["costo"], esperado, rel_tol=1e-12, abs_tol=1e-12)
+        assert ch.distancia(o, d) == r["costo"]
+        if r["camino"]:  # Camino desempacado sobre aristas originales
+            assert r["camino"][0] == o and r["camino"][-1] == d
+            assert math.isclose(_costo(g, r["camino"]), esperado, rel_tol=1e-12)
+        else:
+            assert esperado == math.inf
+
+
+def test_guardar_y_cargar(malla, tmp_path):
+    g = malla()
+    ch = JerarquiaContraccion.desde_grafo(g)
+    ruta = os.path.join(tmp_path, "red.ch.json")
+    ch.guardar(ruta)
+    cargada = JerarquiaContraccion.cargar(ruta)
+    for o, d in (("N0_0", "N7_7"), ("N3_1", "N6_4")):
+        assert cargada.ruta(o, d) == ch.ruta(o, d)
+
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump({"formato": "otro"}, f)
+    with pytest.raises(ValueError):
+        JerarquiaContraccion.cargar(ruta)
@@ -0,0 +1,44 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Pruebas de `CaminosDinamicos` (python -m pytest entregas)."""
+
+import random
+
+import pytest
+
+from dinamico import CaminosDinamicos  # type: ignore
+
+
+@pytest.mark.parametrize("dirigido", [False, True])
+def test_reparar_coincide_con_dijkstra_nuevo(malla, dirigido):
+    g = malla(dirigido=dirigido)
+    caminos = CaminosDinamicos(g, "N0_0")
+    rnd = random.Random(16)
+    ids = sorted(g.nodos)
+    for _ in range(60):
+        if rnd.random() < 0.5:
+            u = rnd.choice(ids)
+            if g.ady[u]:
+                caminos.eliminar_arista(u, rnd.choice(g.ady[u])[0])  # Cierre de una calle
+        else:
+            caminos.insertar_arista(rnd.choice(ids), rnd.choice(ids), rnd.uniform(0.05, 0.5))
+        assert caminos.vigente()
+        assert caminos.dist == g.dijkstra("N0_0")[0]
+        for v, d in caminos.dist.items():
+            u = caminos.prev[v]
+            if u is not None:  # El predecesor está en un camino óptimo
+                assert d == caminos.dist[u] + min(p for w, p, _m in g.ady[u] if w == v)
+
+
+def test_cambio_de_peso_fuera_de_la_clase(malla):
+    g = malla()
+    caminos = CaminosDinamicos(g, "N0_0")
+    g.actualizar_pesos([("N0_0", "N0_1", 3.0)])
+    assert not caminos.vigente()
+    caminos.arista_cambiada("N0_0", "N0_1")
+    assert caminos.vigente() and caminos.dist == g.dijkstra("N0_0")[0]
@@ -0,0 +1,347 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Pruebas de `Grafo` y de su copia CSR (python -m pytest entregas)."""
+
+import copy
+import json
+import math
+import multiprocessing
+import os
+import pickle
+import random
+
+import pytest
+
+from grafo import META_VACIA, Grafo, Nodo  # type: ignore
+
+
+def _pares(g: Grafo, cantidad: int, semilla: int=1):
+    rnd = random.Random(semilla)
+    ids = sorted(g.nodos)
+    return [(rnd.choice(ids), rnd.choice(ids)) for _ in range(cantidad)]
+
+
+# Copia CSR e instantáneas binarias
+
+@pytest.mark.parametrize("dirigido", [False, True])
+def test_csr_mismos_resultados_que_dict(malla, dirigido):
+    g = malla(dirigido=dirigido)
+    g.insertar_nodo(Nodo("solo", "Aislado", 0.0, "Calle"))
+    csr = g.congelar()
+    for inicio in ("N0_0", "N3_5", "solo"):
+        assert csr.bfs(inicio) == g.bfs(inicio)
+        assert csr.dfs(inicio) == g.dfs(inicio)
+        assert csr.dijkstra(inicio) == g.dijkstra(inicio)
+    assert csr.dijkstra("N0_0", "N7_7") == g.dijkstra("N0_0", "N7_7")
+    with pytest.raises(KeyError):
+        csr.dijkstra("no existe")
+
+
+@pytest.mark.parametrize("usar_mmap", [True, False])
+def test_instantanea_binaria_ida_y_vuelta(malla, tmp_path, usar_mmap):
+    g = malla()
+    g.insertar_arista("N0_0", "N7_7", 5.0, meta={"tipo": "autopista"})
+    ruta = os.path.join(tmp_path, "red.srg")
+    g.guardar(ruta)
+
+    abierto = Grafo.abrir(ruta, mmap=usar_mmap)
+    assert abierto.dijkstra("N0_0") == g.dijkstra("N0_0")
+    assert abierto.bfs("N2_2") == g.bfs("N2_2")
+    nodos = {n.id: n for n in abierto.nodos}
+    assert nodos["N1_1"].to_dict() == g.nodos["N1_1"].to_dict()
+    metas = [m for m in abierto.meta_aristas.values() if m]
+    assert {"tipo": "autopista"} in metas
+
+
+def test_csr_caminos_desde_varios_objetivos(malla):
+    g = malla(dirigido=True)
+    g.insertar_nodo(Nodo("solo", "Aislado", 0.0, "Calle"))
+    csr = g.congelar()
+    dist, prev = g.dijkstra("N2_2")
+    objetivos = [csr.indice(v) for v in ("N0_0", "N7_7", "N2_2", "solo")]
+    for t, (camino, costo) in csr.caminos_desde(csr.indice("N2_2"), objetivos).items():
+        destino = csr.ids[t]
+        assert costo == dist[destino]
+        assert camino == (g.reconstruir_camino(prev, destino) if costo < math.inf else [])
+
+
+# Consultas punto a punto
+
+def test_ruta_mismo_costo_que_dijkstra(malla):
+    g = malla(lado=10)
+    for o, d in _pares(g, 40):
+        esperado = g.dijkstra(o, d)[0][d]
+        for algoritmo in ("dijkstra", "bidireccional", "astar"):
+            r = g.ruta(o, d, algoritmo)
+            assert math.isclose(r["costo"], esperado, rel_tol=1e-12, abs_tol=1e-12)
+            assert r["camino"][0] == o and r["camino"][-1] == d
+        # "dijkstra" da exactamente el camino de reconstruir_camino
+        assert g.ruta(o, d, "dijkstra")["camino"] == g.reconstruir_camino(g.dijkstra(o, d)[1], d)
+
+
+def test_k_mas_cercanos_coincide_con_dijkstra_completo(malla):
+    g = malla()
+    dist, _prev = g.dijkstra("N4_4")
+    hoteles = sorted((d, v) for v, d in dist.items() if g.nodos[v].categoria == "Hotel")
+    r = g.k_mas_cercanos("N4_4", "hotel", 3)
+    assert [x["distancia"] for x in r] == [d for d, _v in hoteles[:3]]
+    assert all(x["camino"][-1] == x["id"] for x in r)
+    assert g.k_mas_cercanos("N4_4", "hotel", 10, radio_max=0.0) == []
+
+
+def test_recorridos_iterativos(malla):
+    g = malla()
+    assert list(g.bfs_iter("N0_0")) == g.bfs("N0_0")
+    assert list(g.dfs_iter("N0_0")) == g.dfs("N0_0")
+    largo = Grafo()
+    for i in range(5001):
+        largo.insertar_nodo(Nodo(f"C{i}", f"C{i}", 0.0, "Calle"))
+    for i in range(5000):
+        largo.insertar_arista(f"C{i}", f"C{i + 1}")
+    assert len(largo.dfs("C0")) == 5001  # Sin límite de recursión
+
+
+# Índices y modificaciones
+
+def test_eliminar_nodo_quita_aristas_entrantes(malla):
+    g = malla(dirigido=True)
+    g.eliminar_nodo("N3_3")
+    assert all(v != "N3_3" for lst in g.ady.values() for v, _p, _m in lst)
+    assert "N3_3" not in g.dijkstra("N0_0")[0]
+
+
+def test_indices_por_nombre_y_categoria(malla):
+    g = malla()
+    assert [n.id for n in g.buscar_nodo_por_nombre("LUGAR 2-3")] == ["N2_3"]
+    hoteles = {n.id for n in g.buscar_por_categoria("hotel")}
+    assert hoteles == {v for v, n in g.nodos.items() if n.categoria == "Hotel"}
+    g.eliminar_nodo("N2_3")
+    assert g.buscar_nodo_por_nombre("Lugar 2-3") == []
+
+
+class _SinRecorrer(dict):
+    """Diccionario de nodos que falla si alguien lo recorre completo."""
+
+    def __iter__(self):
+        raise AssertionError("la búsqueda recorrió todos los nodos")
+
+    values = items = keys = __iter__
+
+
+def test_busquedas_por_indice_no_recorren_los_nodos(malla):
+    g = malla()
+    g.nodos = _SinRecorrer(g.nodos)
+    assert [n.id for n in g.buscar_nodo_por_nombre("lugar 5-1")] == ["N5_1"]
+    assert g.buscar_por_categoria("Museo") == []
+    assert len(g.buscar_por_categoria("calle")) > 0
+
+
+def test_desde_aristas_equivale_a_insertar(tmp_path):
+    aristas = [("A", "B", 2.0), ("B", "C", 1.5, {"tiempo": 3}), ("A", "C")]
+    masivo = Grafo.desde_aristas(aristas, dirigido=True)
+    uno_a_uno = Grafo(dirigido=True)
+    for x in "ABC":
+        uno_a_uno.insertar_nodo(Nodo(x, x, 0.0, "General"))
+    for arista in aristas:
+        uno_a_uno.insertar_arista(*arista)
+    assert masivo.ady == uno_a_uno.ady
+
+    csv = os.path.join(tmp_path, "aristas.csv")
+    with open(csv, "w", encoding="utf-8") as f:
+        f.write("origen,destino,peso,tiempo\nA,B,2,4\nB,C,1.5,\n")
+    cargado = Grafo.cargar_csv(csv)
+    assert cargado.dijkstra("A")[0]["C"] == 3.5
+    assert cargado.ady["A"][0][2] == {"tiempo": 4.0}
+
+
+def test_cache_se_invalida_con_la_version(malla):
+    g = malla()
+    g.activar_cache(capacidad=4)
+    antes = g.dijkstra("N0_0")
+    assert g.dijkstra("N0_0") is antes
+    g.insertar_arista("N0_0", "N7_7", 0.01)
+    despues = g.dijkstra("N0_0")
+    assert despues is not antes and despues[0]["N7_7"] == 0.01
+    stats = g.estadisticas_cache()
+    assert stats["aciertos"] == 1 and stats["invalidaciones"] == 1
+    with pytest.raises(TypeError):
+        despues[0]["N7_7"] = 0.0  # Vista de solo lectura compartida
+
+
+def test_cache_desaloja_la_menos_usada(malla):
+    g = malla()
+    g.activar_cache(capacidad=2)
+    a, _b = g.dijkstra("N0_0"), g.dijkstra("N1_1")
+    assert g.dijkstra("N0_0") is a  # N1_1 queda como la menos usada
+    g.dijkstra("N2_2")
+    stats = g.estadisticas_cache()
+    assert stats["desalojos"] == 1 and stats["entradas"] == 2
+    assert g.dijkstra("N0_0") is a
+    assert g.estadisticas_cache()["fallos"] == 3
+    g.dijkstra("N1_1")  # Ya no estaba: vuelve a calcularse y desaloja otra
+    assert g.estadisticas_cache()["desalojos"] == 2
+
+
+def test_matriz_distancias(malla):
+    g = malla()
+    origenes, destinos = ["N0_0", "N7_7"], ["N3_3", "N0_0", "N7_0"]
+    matriz = g.matriz_distancias(origenes, destinos, workers=1)
+    for fila, o in zip(matriz, origenes):
+        dist = g.dijkstra(o)[0]
+        assert list(fila) == [dist[d] for d in destinos]
+
+
+def test_matriz_distancias_reutiliza_copia_y_procesos(malla):
+    g = malla()
+    origenes, destinos = ["N0_0", "N7_7", "N2_5"], ["N3_3", "N0_0"]
+
+    def esperada():
+        return [[g.dijkstra(o)[0][d] for d in destinos] for o in origenes]
+
+    with multiprocessing.Pool(2) as pool:
+        assert [list(f) for f in g.matriz_distancias(origenes, destinos, pool=pool)] == esperada()
+        copia = g._copia_congelada()
+        archivo = copia._compartido
+        g.matriz_distancias(origenes, destinos, workers=2)  # Sin cambios: mismo archivo
+        assert g._copia_congelada() is copia and copia._compartido == archivo
+
+        g.insertar_arista("N0_0", "N3_3", 0.01)
+        matriz = g.matriz_distancias(origenes, destinos, pool=pool)  # Los procesos abren la copia nueva
+        assert [list(f) for f in matriz] == esperada() and matriz[0][0] == 0.01
+        assert g._copia_congelada() is not copia
+    assert pickle.loads(pickle.dumps(g)).ady == g.ady
+
+
+def test_nodos_con_slots_y_metadatos_vacios_compartidos(malla):
+    g = malla()
+    assert not hasattr(g.nodos["N0_0"], "__dict__")
+    sin_meta = Nodo("x", "X", 0.0, "Calle")
+    # Todas las aristas sin metadatos comparten un único mapeo vacío
+    assert {id(m) for lst in g.ady.values() for _v, _p, m in lst} == {id(sin_meta.metadatos())}
+    with pytest.raises(TypeError):
+        g.ady["N0_0"][0][2]["tiempo"] = 1
+    sin_meta.meta["piso"] = 2  # El nodo recibe su propio dict al usarlo
+    assert sin_meta.to_dict()["piso"] == 2
+    assert Nodo("y", "Y", 0.0, "Calle").metadatos() == {}
+
+
+def test_grafo_se_copia_y_serializa(malla):
+    g = malla(lado=4)
+    g.insertar_arista("N0_0", "N3_3", 2.0, meta={"tipo": "autopista"})
+    g.activar_cache()
+    g.conectados("N0_0", "N3_3")
+    esperado = g.dijkstra("N0_0")
+    for copia in (pickle.loads(pickle.dumps(g)), copy.deepcopy(g)):
+        assert copia.ady == g.ady and copia.dijkstra("N0_0") == esperado
+        assert copia.ady["N0_1"][0][2] is META_VACIA  # Sigue siendo uno solo
+        assert copia.nodos["N1_1"].to_dict() == g.nodos["N1_1"].to_dict()
+        copia.nodos["N1_1"].meta["piso"] = 2
+    assert "piso" not in g.nodos["N1_1"].meta
+    adyacencias = json.loads(json.dumps(g.listar_adyacencias()))
+    assert adyacencias["N0_1"][0][2] == {}
+
+
+def test_actualizar_pesos_es_atomico_y_coincide_con_csr(malla):
+    g = malla()
+    csr = g.congelar()
+    version = g.version
+    with pytest.raises(KeyError):
+        g.actualizar_pesos([("N0_0", "N0_1", 9.0), ("N0_0", "N5_5", 1.0)])
+    assert g.version == version and g.ady["N0_0"][0][1] != 9.0
+
+    lote = [("N0_0", "N0_1", 9.0), ("N4_4", "N4_5", 0.5)]
+    assert g.actualizar_pesos(lote) == 4  # Ambos sentidos
+    assert g.version == version + 1
+    csr.actualizar_pesos(lote + [(v, u, p) for u, v, p in lote])
+    assert csr.dijkstra("N0_0") == g.congelar().dijkstra("N0_0")
+
+
+
+# Pesos por hora y rutas multicriterio
+
+def test_dijkstra_con_perfil_de_horario():
+    g = Grafo.desde_aristas([("A", "B", 10.0), ("A", "C", 4.0), ("C", "B", 4.0)], dirigido=True)
+    g.eliminar_arista("A", "B")
+    g.insertar_arista("A", "B", 10.0, meta={"perfil": [(0, 5), (60, 5), (61, 20)]})
+    assert g.dijkstra("A", salida=0)[0]["B"] == 5.0      # Antes de la hora pico
+    assert g.dijkstra("A", salida=120)[0]["B"] == 8.0    # En hora pico conviene por C
+    assert g.dijkstra("A")[0]["B"] == 8.0                # Sin hora se usa el peso
+    with pytest.raises(ValueError):
+        g.insertar_arista("A", "C", meta={"perfil": [(0, 30), (10, 0)]})  # No es FIFO
+
+
+def test_rutas_pareto_frente_exacto():
+    g = Grafo.desde_aristas([
+        ("A", "B", 1, {"tiempo": 10}), ("B", "D", 1, {"tiempo": 10}),   # Corta y lenta
+        ("A", "C", 5, {"tiempo": 1}), ("C", "D", 5, {"tiempo": 1}),     # Larga y rápida
+        ("A", "E", 3, {"tiempo": 5}), ("E", "D", 3, {"tiempo": 5}),     # Compromiso
+        ("A", "F", 6, {"tiempo": 12}), ("F", "D", 6, {"tiempo": 12}),   # Dominada
+    ], dirigido=True)
+    frente = g.rutas_pareto("A", "D")
+    assert [(r["camino"], r["costos"]) for r in frente] == [
+        (["A", "B", "D"], {"peso": 2, "tiempo": 20}),
+        (["A", "E", "D"], {"peso": 6, "tiempo": 10}),
+        (["A", "C", "D"], {"peso": 10, "tiempo": 2}),
+    ]
+    with pytest.raises(ValueError):
+        g.rutas_pareto("A", "D", criterios=("peso", "costo"))
+
+
+# Índice espacial y componentes
+
+def test_nodo_mas_cercano_y_en_radio(malla):
+    from grafo import distancia_haversine  # type: ignore
+
+    g = malla()
+    lat, lon = 4.6031, -74.0952
+    distancias = sorted((distancia_haversine(lat, lon, n.meta["lat"], n.meta["lon"]), v)
+                        for v, n in g.nodos.items())
+    node_id, km = g.nodo_mas_cercano(lat, lon)
+    assert node_id == distancias[0][1] and math.isclose(km, distancias[0][0])
+    assert [v for v, _km in g.nodos_en_radio(lat, lon, 0.25)] == \
+        [v for km, v in distancias if km <= 0.25]
+    g.eliminar_nodo(node_id)
+    assert g.nodo_mas_cercano(lat, lon)[0] == distancias[1][1]
+
+
+def test_componentes_y_consultas_desconectadas(malla):
+    g = malla(lado=4)
+    g.insertar_nodo(Nodo("isla", "Isla", 0.0, "Calle"))
+    assert not g.conectados("N0_0", "isla")
+    assert g.componentes() == [16, 1]
+    assert g.ruta("N0_0", "isla") == {"camino": [], "costo": math.inf, "asentados": 0}
+    dist, _prev = g.dijkstra("N0_0", "isla")  # Atajo: no recorre la componente
+    assert dist["isla"] == math.inf and dist["N0_1"] == math.inf
+    g.insertar_arista("N3_3", "isla", 1.0)  # Insertar mantiene el índice
+    assert g.conectados("N0_0", "isla") and g.componentes() == [17]
+
+
+def test_componentes_se_rearman_tras_eliminar(malla):
+    from grafo import _CONSULTAS_PARA_COMPONENTES  # type: ignore
+
+    g = malla(lado=4)
+    g.insertar_nodo(Nodo("isla", "Isla", 0.0, "Calle"))
+    g.insertar_arista("N3_3", "isla", 1.0)
+    assert g.conectados("N0_0", "isla")
+    g.eliminar_arista("N3_3", "isla")  # El cierre descarta el índice
+    for _ in range(_CONSULTAS_PARA_COMPONENTES - 1):
+        # Las primeras consultas buscan de verdad, sin pagar el rearmado
+        assert g.ruta("N0_0", "isla")["asentados"] > 0
+        assert g._componentes is None
+    assert g.ruta("N0_0", "isla") == {"camino": [], "costo": math.inf, "asentados": 0}
+    assert g.rutas_pareto("N0_0", "isla") == []
+    assert g.ruta("N0_0", "N3_3")["costo"] < math.inf
+
+
+def test_componentes_en_grafo_dirigido():
+    g = Grafo.desde_aristas([("A", "B"), ("C", "D")], dirigido=True)
+    assert g.componentes() == [2, 2]
+    assert g.ruta("A", "D")["asentados"] == 0  # Otra componente: se descarta
+    # Misma componente sin ruta en ese sentido: se busca y da inf
+    r = g.ruta("B", "A")
+    assert r["costo"] == math.inf and r["asentados"] > 0
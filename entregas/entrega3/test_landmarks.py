@@ -0,0 +1,61 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Pruebas de las cotas ALT de `Landmarks` (python -m pytest entregas)."""
+
+import math
+import os
+import random
+
+import pytest
+
+from grafo import Nodo  # type: ignore
+from landmarks import Landmarks  # type: ignore
+
+
+@pytest.mark.parametrize("dirigido", [False, True])
+@pytest.mark.parametrize("seleccion", ["lejanos", "evitar"])
+def test_cotas_admisibles_y_astar_exacto(malla, dirigido, seleccion):
+    g = malla(dirigido=dirigido)
+    g.insertar_nodo(Nodo("isla", "Isla", 0.0, "Calle"))
+    lm = g.preparar_landmarks(4, seleccion, workers=1)
+    assert len(lm) == 4 and "isla" not in lm.ids_landmarks()
+    rnd = random.Random(25)
+    ids = sorted(g.nodos)
+    for _ in range(40):
+        o, d = rnd.choice(ids), rnd.choice(ids)
+        real = g.dijkstra(o)[0][d]
+        inferior, superior = lm.estimar(o, d)
+        assert inferior <= real + 1e-12 and real <= superior + 1e-12
+        r = g.ruta(o, d, "astar", heuristica=lm.heuristica(d))
+        assert math.isclose(r["costo"], real, rel_tol=1e-12) or r["costo"] == real
+
+
+def test_clasificar_ordena_por_cota_inferior(malla):
+    g = malla()
+    lm = g.preparar_landmarks(4, workers=1)
+    orden = lm.clasificar("N0_0", ["N7_7", "N0_1", "N4_4"])
+    assert [r["id"] for r in orden][0] == "N0_1"
+    assert [r["inferior"] for r in orden] == sorted(r["inferior"] for r in orden)
+
+
+@pytest.mark.parametrize("usar_mmap", [True, False])
+def test_guardar_y_abrir(malla, tmp_path, usar_mmap):
+    g = malla(dirigido=True)
+    lm = g.preparar_landmarks(3, workers=1)
+    ruta = os.path.join(tmp_path, "red.lm")
+    lm.guardar(ruta)
+    abierto = Landmarks.abrir(ruta, usar_mmap=usar_mmap)
+    assert abierto.ids_landmarks() == lm.ids_landmarks()
+    assert abierto.version == lm.version and abierto.dirigido
+    for o, d in (("N0_0", "N7_7"), ("N5_2", "N1_6")):
+        assert abierto.estimar(o, d) == lm.estimar(o, d)
+
+    with open(ruta, "r+b") as f:
+        f.write(b"OTRO")
+    with pytest.raises(ValueError):
+        Landmarks.abrir(ruta, usar_mmap=usar_mmap)
@@ -0,0 +1,47 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Pruebas de la partición en celdas y `RuteadorParticionado` (python -m pytest entregas)."""
+
+import math
+import random
+
+import pytest
+
+from particion import RuteadorParticionado  # type: ignore
+
+
+def test_particion_cubre_todos_los_nodos(malla):
+    g = malla()
+    particion = g.particionar(4)
+    assert sorted(particion.tamanos()) == [16, 16, 16, 16]
+    assert sorted(v for c in range(4) for v in particion.miembros(c)) == sorted(g.nodos)
+    for u, lst in g.ady.items():
+        for v, _p, _m in lst:
+            if particion.celda[u] != particion.celda[v]:
+                assert u in particion.frontera[particion.celda[u]]
+    with pytest.raises(ValueError):
+        g.particionar(0)
+
+
+@pytest.mark.parametrize("dirigido,procesos", [(False, False), (True, False), (False, True)])
+def test_rutas_entre_celdas(malla, dirigido, procesos):
+    g = malla(dirigido=dirigido)
+    rnd = random.Random(24)
+    ids = sorted(g.nodos)
+    with RuteadorParticionado(g, g.particionar(4), procesos=procesos) as rp:
+        for _ in range(25):
+            o, d = rnd.choice(ids), rnd.choice(ids)
+            esperado = g.ruta(o, d)["costo"]
+            r = rp.ruta(o, d)
+            assert math.isclose(r["costo"], esperado, rel_tol=1e-12, abs_tol=1e-12)
+            if r["camino"]:
+                assert r["camino"][0] == o and r["camino"][-1] == d
+                assert all(b in {v for v, _p, _m in g.ady[a]}
+                           for a, b in zip(r["camino"], r["camino"][1:]))
+        with pytest.raises(KeyError):
+            rp.ruta("N0_0", "no existe")
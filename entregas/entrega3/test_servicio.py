@@ -0,0 +1,116 @@
+# Proyecto: SmartRoute Event (Versión 3 - Grafos)
+# Integrantes:
+# Sergio Andres Martinez Cifuentes 2242039
+# Andres Felipe Guaqueta Rojas 2242034
+# Andres Sebastian Pinzon Gutierrez 2221887
+# Daniel Eduardo Rincon Arias 2202316
+
+"""Pruebas de `ServicioRutas` (python -m pytest entregas)."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from grafo import Grafo, Nodo  # type: ignore
+from servicio import ServicioRutas  # type: ignore
+
+
+def _grafo_bcd() -> Grafo:
+    g = Grafo()
+    for node_id in ("B", "C", "D"):
+        g.insertar_nodo(Nodo(node_id, node_id, 0.0, "Lugar"))
+    g.insertar_arista("B", "C", 1.0)
+    g.insertar_arista("C", "D", 2.0)
+    return g
+
+
+def test_agrupa_consultas_del_mismo_origen():
+    async def consultar():
+        async with ServicioRutas(_grafo_bcd(), ventana=0.05) as srv:
+            r = await asyncio.gather(srv.ruta("B", "C"), srv.ruta("B", "D"))
+            return r, srv.estadisticas()
+
+    (bc, bd), stats = asyncio.run(consultar())
+    assert bc == {"camino": ["B", "C"], "costo": 1.0}
+    assert bd == {"camino": ["B", "C", "D"], "costo": 3.0}
+    assert stats["consultas"] == 2 and stats["busquedas"] == 1
+
+
+def test_contrapresion_hace_esperar_y_vencer():
+    async def consultar():
+        async with ServicioRutas(_grafo_bcd(), max_pendientes=1, ventana=0.05) as srv:
+            primera = asyncio.ensure_future(srv.ruta("B", "C"))
+            segunda = asyncio.ensure_future(srv.ruta("B", "D", timeout=1.0))
+            with pytest.raises(asyncio.TimeoutError):
+                await srv.ruta("C", "D", timeout=0.01)  # Vence esperando turno
+            return await primera, await segunda, srv.estadisticas()
+
+    bc, bd, stats = asyncio.run(consultar())
+    assert bc["costo"] == 1.0 and bd["costo"] == 3.0
+    # La segunda no alcanzó a sumarse al lote de la primera: esperó su turno
+    assert stats == {"consultas": 3, "busquedas": 2, "vencidas": 1}
+
+
+def test_consulta_vencida_no_lanza_busqueda():
+    async def consultar():
+        async with ServicioRutas(_grafo_bcd(), ventana=0.05, timeout=0.01) as srv:
+            with pytest.raises(asyncio.TimeoutError):
+                await srv.ruta("B", "D")
+            await asyncio.sleep(0.08)  # Se cierra el lote, ya sin consultas vivas
+            return srv.estadisticas()
+
+    assert asyncio.run(consultar()) == {"consultas": 1, "busquedas": 0, "vencidas": 1}
+
+
+def test_cambio_de_version_con_lote_pendiente():
+    # Insertar "A" corre los índices de la copia CSR mientras el lote de "B"
+    # espera: cada lote debe resolverse sobre la copia con la que se armó
+    for procesos in (0, 1):
+        g = _grafo_bcd()
+
+        async def consultar():
+            async with ServicioRutas(g, ventana=0.05, procesos=procesos, timeout=30) as srv:
+                primera = asyncio.ensure_future(srv.ruta("B", "C"))
+                await asyncio.sleep(0.01)  # Menos que la ventana
+                g.insertar_nodo(Nodo("A", "A", 0.0, "Lugar"))
+                segunda = await srv.ruta("C", "D")
+                return await primera, segunda
+
+        bc, cd = asyncio.run(consultar())
+        assert bc == {"camino": ["B", "C"], "costo": 1.0}
+        assert cd == {"camino": ["C", "D"], "costo": 2.0}
+
+
+def test_responde_con_la_copia_anterior_mientras_congela():
+    g = _grafo_bcd()
+    congelar, hilos = g.congelar, []
+
+    def congelar_lento():
+        hilos.append(threading.current_thread())
+        time.sleep(0.3)
+        return congelar()
+
+    async def consultar():
+        loop = asyncio.get_running_loop()
+        async with ServicioRutas(g, ventana=0.001) as srv:
+            await srv.ruta("B", "D")
+            g.congelar = congelar_lento
+            g.insertar_arista("B", "D", 1.0)
+            g.insertar_nodo(Nodo("E", "E", 0.0, "Lugar"))
+            g.insertar_arista("D", "E", 1.0)
+            inicio = loop.time()
+            vieja = await srv.ruta("B", "D")  # La copia nueva todavía se arma
+            demora = loop.time() - inicio
+            nueva = await srv.ruta("B", "E")  # "E" solo está en la copia nueva
+            despues = await srv.ruta("B", "D")
+            g.eliminar_arista("B", "D")
+            await srv.actualizar()
+            return vieja, demora, nueva, despues, await srv.ruta("B", "D")
+
+    vieja, demora, nueva, despues, actualizada = asyncio.run(consultar())
+    assert vieja["costo"] == 3.0 and demora < 0.2
+    assert nueva == {"camino": ["B", "D", "E"], "costo": 2.0}
+    assert despues["costo"] == 1.0 and actualizada["costo"] == 3.0
+    assert hilos and threading.main_thread() not in hilos  # Fuera del bucle de eventos